@@ -0,0 +1,171 @@
+"""Benchmarks for the generation, validation and layout hot paths.
+
+Every case runs on fixed seeds and is reported in operations per second.
+The results are compared with baseline.json and the run fails when any
+case drops more than the threshold below its baseline.
+
+    python benchmarks/bench.py            # compare with the baseline
+    python benchmarks/bench.py --update   # record a new baseline
+"""
+import argparse
+import json
+import logging
+import sys
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+
+from sudoku.grid import Grid, cage_positions
+
+BASELINE_PATH = Path(Path(__file__).parent, 'baseline.json')
+THRESHOLD = 0.3
+REPEAT = 7
+SEED = 20250101
+
+
+def _grids(count: int = 20, block_qty: int = 1) -> list[Grid]:
+    return [Grid(block_qty, seed=SEED + index) for index in range(count)]
+
+
+def bench_create():
+    grid = Grid(1, seed=SEED)
+    return grid._create
+
+
+def bench_get_block():
+    grid = Grid(1, seed=SEED)
+    return grid._get_block
+
+
+def bench_possible_cells():
+    grid = Grid(1, seed=SEED)
+    queries = []
+    for item in _grids():
+        for frame in item.blocks[0].frames:
+            cells = list(frame.cells)
+            queries.append((frame.total, len(cells), cells[:1],
+                            [cell for cell in range(1, 10)
+                             if cell not in cells[:1]]))
+
+    def run():
+        for total, cells, suggestions, numbers in queries:
+            grid._possible_cells(total, cells, suggestions, numbers)
+    return run
+
+
+def bench_generate_suggestion():
+    grid = Grid(1, seed=SEED)
+    frames = [frame for item in _grids() for frame in item.blocks[0].frames]
+
+    def run():
+        for frame in frames:
+            grid._generate_suggestion(frame, list(range(1, 10)))
+    return run
+
+
+def bench_correct_complete():
+    # pylint: disable=import-outside-toplevel
+    from sudoku.game import Game
+    game = Game.__new__(Game)
+    block = Grid(1, seed=SEED).blocks[0]
+    indexes = iter(range(9))
+    game.frame_cells = {
+        frame: [SimpleNamespace(index=next(indexes), solution=0, suggestion=0)
+                for _ in frame.cells]
+        for frame in block.frames
+    }
+    game.validation = game._create_validation(9)
+    entries = [(cell.index, digit)
+               for frame, cells in game.frame_cells.items()
+               for cell, digit in zip(cells, frame.cells)]
+
+    def run():
+        # One key press per cell, each followed by the completion check
+        for index, digit in entries:
+            game.validation.set(index, digit)
+            _ = game.correct, game.complete
+        for index, _ in entries:
+            game.validation.set(index, 0)
+    return run
+
+
+def bench_cell_positions():
+    shapes = [tuple(len(frame.digits) for frame in grid.blocks[0].frames)
+              for grid in _grids()]
+    # The uncached walk, as the board used to run it for every grid
+    walk = cage_positions.__wrapped__
+
+    def run():
+        for shape in shapes:
+            walk(shape)
+    return run
+
+
+CASES = {
+    'grid_create': bench_create,
+    'get_block': bench_get_block,
+    'possible_cells': bench_possible_cells,
+    'generate_suggestion': bench_generate_suggestion,
+    'correct_complete': bench_correct_complete,
+    'cell_positions': bench_cell_positions,
+}
+
+
+def measure(name: str) -> float:
+    """Return the best rate of a case in operations per second."""
+    func = CASES[name]()
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=REPEAT, number=number))
+    return number / best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('cases', nargs='*',
+                        help=f'cases to run (default all): {", ".join(CASES)}')
+    parser.add_argument('--update', action='store_true',
+                        help='write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='allowed fractional drop (default 0.3)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error(f'unknown cases: {", ".join(sorted(unknown))}')
+
+    # Keep the per-grid log lines out of the results
+    logging.getLogger('sudoku').setLevel(logging.WARNING)
+
+    baseline = {}
+    if args.baseline.is_file():
+        baseline = json.loads(args.baseline.read_text())
+
+    results, failures = {}, []
+    for name in args.cases or CASES:
+        rate = measure(name)
+        results[name] = round(rate, 1)
+        expected = baseline.get(name)
+        status = ''
+        if expected:
+            change = rate / expected - 1
+            status = f'{change:+.1%}'
+            if change < -args.threshold:
+                status += '  REGRESSION'
+                failures.append(name)
+        print(f'{name:<22}{rate:>14,.1f} ops/s  {status}')
+
+    if args.update:
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=4) + '\n')
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    if failures:
+        print(f'*** Throughput regression: {", ".join(failures)} ***')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
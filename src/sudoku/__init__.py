@@ -1,8 +1,18 @@
 
-from psiutils.utilities import psi_logger
 from sudoku.constants import APP_NAME
 from sudoku._version import __version__
 
-logger = psi_logger(APP_NAME)
-
 version = __version__
+
+
+def __getattr__(name: str):
+    # The application logger comes from psiutils, which loads tkinter, so
+    # it is only set up when the GUI first asks for it. The model layer
+    # logs through the standard logging module instead.
+    if name == 'logger':
+        # pylint: disable=global-statement, import-outside-toplevel
+        global logger
+        from psiutils.utilities import psi_logger
+        logger = psi_logger(APP_NAME)
+        return logger
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
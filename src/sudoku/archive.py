@@ -0,0 +1,175 @@
+"""Fixed-width binary encoding of puzzles and a memory-mapped archive.
+
+A block packs into one 32-bit word:
+
+    bits 28-31  the frame shape, an index into SHAPES
+    bits 9-27   the digits in frame order, as a permutation of 1-9 in
+                Lehmer code (9! < 2**19)
+    bits 0-8    which of those nine cells show their digit as a clue
+
+A grid is its blocks' words, little-endian. An archive is a header
+followed by grids that all have the same number of blocks, so puzzle n
+is at a fixed offset and is read straight out of the mapped file.
+
+Clues are shown in place, so in a grid of independent blocks the digits
+of each frame are reordered to put every clue on its own cell. The
+masks, totals and clues round-trip exactly; linked grids, whose clues
+are already in place, round-trip exactly.
+"""
+import math
+import mmap
+import random
+import struct
+from collections.abc import Iterable
+from pathlib import Path
+
+from sudoku.grid import (
+    GENERATOR_VERSION, SHAPE_INDEX, SHAPES, Block, Frame, Grid)
+
+MAGIC = b'SDKA'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHHQ')
+HEADER_SIZE = 32
+BLOCK = struct.Struct('<I')
+
+FACTORIALS = tuple(math.factorial(8 - index) for index in range(9))
+PERMUTATIONS = math.factorial(9)
+
+
+def _lehmer(digits: list[int]) -> int:
+    code, remaining = 0, 0x1FF
+    for index, digit in enumerate(digits):
+        bit = 1 << (digit - 1)
+        code += (remaining & (bit - 1)).bit_count() * FACTORIALS[index]
+        remaining &= ~bit
+    return code
+
+
+def _permutation(code: int) -> list[int]:
+    remaining = list(range(1, 10))
+    digits = []
+    for factorial in FACTORIALS:
+        rank, code = divmod(code, factorial)
+        digits.append(remaining.pop(rank))
+    return digits
+
+
+def encode_block(block: Block) -> int:
+    """Return a block packed into a 32-bit word."""
+    shape = tuple(len(frame.digits) for frame in block.frames)
+    if shape not in SHAPE_INDEX:
+        raise ValueError(f'No encoding for frames of sizes {shape}')
+
+    digits, clues = [], 0
+    for frame in block.frames:
+        # Clues on their own cells, then the other digits in order
+        order = list(frame.suggestions)
+        rest = iter(digit for digit in frame.digits
+                    if digit not in frame.suggestions)
+        for index, clue in enumerate(frame.suggestions):
+            if clue:
+                clues |= 1 << (len(digits) + index)
+            else:
+                order[index] = next(rest)
+        digits.extend(order)
+    return SHAPE_INDEX[shape] << 28 | _lehmer(digits) << 9 | clues
+
+
+def decode_block(value: int) -> Block:
+    """Return the block packed in a 32-bit word."""
+    shape, code, clues = value >> 28, value >> 9 & 0x7FFFF, value & 0x1FF
+    if shape >= len(SHAPES) or code >= PERMUTATIONS:
+        raise ValueError(f'Not an encoded block: {value:#010x}')
+
+    digits = _permutation(code)
+    frames, start = [], 0
+    for index, size in enumerate(SHAPES[shape]):
+        frame = Frame(tuple(digits[start:start + size]), index)
+        frame.suggestions = tuple(
+            digit if clues >> (start + cell) & 1 else 0
+            for cell, digit in enumerate(frame.digits))
+        frames.append(frame)
+        start += size
+    return Block(frames)
+
+
+def encode_grid(grid: Grid) -> bytes:
+    """Return a grid as BLOCK.size bytes per block."""
+    return b''.join(BLOCK.pack(encode_block(block)) for block in grid.blocks)
+
+
+def decode_grid(data: bytes | memoryview, offset: int = 0,
+                block_qty: int | None = None) -> Grid:
+    """Return the grid encoded in data at offset."""
+    if block_qty is None:
+        block_qty = (len(data) - offset) // BLOCK.size
+    return Grid.from_blocks(tuple(
+        decode_block(BLOCK.unpack_from(data, offset + index * BLOCK.size)[0])
+        for index in range(block_qty)))
+
+
+def write_archive(
+        path: str | Path, grids: Iterable[Grid], block_qty: int) -> int:
+    """Write grids of block_qty blocks to an archive and return how many
+    were written."""
+    count = 0
+    with open(path, 'wb') as f_archive:
+        f_archive.write(bytes(HEADER_SIZE))
+        for grid in grids:
+            if grid.block_qty != block_qty:
+                raise ValueError(
+                    f'Grid of {grid.block_qty} blocks in an archive of '
+                    f'{block_qty}')
+            f_archive.write(encode_grid(grid))
+            count += 1
+        f_archive.seek(0)
+        f_archive.write(HEADER.pack(
+            MAGIC, FORMAT_VERSION, GENERATOR_VERSION, block_qty, count))
+    return count
+
+
+class PuzzleArchive():
+    """Read-only, memory-mapped access to the grids in an archive.
+
+    Use as a context manager, or call close when done.
+    """
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, 'rb') as f_archive:
+            self._map = mmap.mmap(
+                f_archive.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, generator, block_qty, count = HEADER.unpack_from(
+            self._map)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f'{self.path} is not a puzzle archive')
+        self.generator_version = generator
+        self.block_qty = block_qty
+        self.count = count
+        self.record_size = block_qty * BLOCK.size
+
+    def __enter__(self) -> 'PuzzleArchive':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Grid:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('puzzle index out of range')
+        return decode_grid(
+            self._map, HEADER_SIZE + index * self.record_size,
+            self.block_qty)
+
+    def random(self, rng: random.Random | None = None) -> Grid:
+        """Return a puzzle chosen at random."""
+        return self[(rng or random).randrange(self.count)]
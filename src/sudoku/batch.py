@@ -0,0 +1,81 @@
+"""Generate sudoku grids in bulk across worker processes."""
+import hashlib
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator
+
+from sudoku.grid import Grid
+
+CHUNK_SIZE = 32
+
+
+def puzzle_seed(seed: int, index: int) -> int:
+    """Return the seed of puzzle number index in a run seeded with seed.
+
+    Each puzzle gets its own random stream, so the output does not depend
+    on how the work is split between processes.
+    """
+    digest = hashlib.blake2b(
+        f'{seed}:{index}'.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _generate_chunk(
+        start: int,
+        stop: int,
+        block_qty: int,
+        seed: int) -> list[tuple[int, Grid]]:
+    return [
+        (index, Grid(block_qty, seed=puzzle_seed(seed, index)))
+        for index in range(start, stop)
+    ]
+
+
+def generate_many(
+        count: int,
+        block_qty: int = 0,
+        seed: int | None = None,
+        workers: int | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        ) -> Iterator[tuple[int, Grid]]:
+    """Yield (index, grid) pairs for count grids as they are finished.
+
+    Work is spread over a pool of worker processes (all cores when
+    workers is None); with a single worker the grids are built in this
+    process. Results arrive in completion order, not index order, and
+    only a few chunks are held in flight at a time.
+    """
+    # pylint: disable=no-member)
+    if not block_qty:
+        # pylint: disable=import-outside-toplevel
+        from sudoku.config import read_config
+        block_qty = read_config().default_blocks
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    chunks = (
+        (start, min(start + chunk_size, count))
+        for start in range(0, count, chunk_size))
+
+    if workers <= 1:
+        for start, stop in chunks:
+            yield from _generate_chunk(start, stop, block_qty, seed)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for start, stop in chunks:
+            pending.add(executor.submit(
+                _generate_chunk, start, stop, block_qty, seed))
+            if len(pending) < workers * 2:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
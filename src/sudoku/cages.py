@@ -0,0 +1,107 @@
+"""Precomputed index of the digit combinations that can fill a cage.
+
+Digit sets are held as 9-bit masks: bit ``d - 1`` is set when digit ``d``
+is in the set. Every one of the 511 non-empty subsets of 1-9 is grouped
+once, at import, by (total, size). Queries then only filter that small
+group against the allowed and forced digits and are memoised, so the
+generator, the checker and any hint feature can share them freely.
+"""
+from functools import lru_cache
+
+from sudoku import instrumentation
+
+ALL_DIGITS = 0x1FF
+MAX_TOTAL = 45
+
+# Digits (ascending) and sum for each mask
+MASK_DIGITS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(digit for digit in range(1, 10) if mask & (1 << (digit - 1)))
+    for mask in range(ALL_DIGITS + 1))
+MASK_TOTAL: tuple[int, ...] = tuple(sum(digits) for digits in MASK_DIGITS)
+MASK_SIZE: tuple[int, ...] = tuple(len(digits) for digits in MASK_DIGITS)
+
+
+def _build_index() -> dict[tuple[int, int], tuple[int, ...]]:
+    index = {}
+    for mask in range(1, ALL_DIGITS + 1):
+        key = (MASK_TOTAL[mask], MASK_SIZE[mask])
+        index.setdefault(key, []).append(mask)
+    return {
+        key: tuple(sorted(masks, key=MASK_DIGITS.__getitem__))
+        for key, masks in index.items()}
+
+
+_INDEX = _build_index()
+
+
+def digits_mask(digits) -> int:
+    """Return the mask for an iterable of digits."""
+    mask = 0
+    for digit in digits:
+        mask |= 1 << (digit - 1)
+    return mask
+
+
+def mask_digits(mask: int) -> tuple[int, ...]:
+    """Return the ascending digits in a mask."""
+    return MASK_DIGITS[mask]
+
+
+@lru_cache(maxsize=None)
+def cage_masks(
+        total: int,
+        size: int,
+        allowed: int = ALL_DIGITS,
+        forced: int = 0) -> tuple[int, ...]:
+    """Return the digit masks of the given size that sum to total.
+
+    Only digits in allowed may be used and every digit in forced must be
+    present.
+    """
+    group = _INDEX.get((total, size), ())
+    if instrumentation.current is not None:
+        instrumentation.current.count('combinations', len(group))
+    return tuple(
+        mask for mask in group
+        if not mask & ~allowed and mask & forced == forced)
+
+
+def cage_combinations(
+        total: int,
+        size: int,
+        allowed: int = ALL_DIGITS,
+        forced: int = 0) -> tuple[tuple[int, ...], ...]:
+    """Return the digit combinations that can fill a cage."""
+    return tuple(
+        MASK_DIGITS[mask]
+        for mask in cage_masks(total, size, allowed, forced))
+
+
+def combination_count(
+        total: int,
+        size: int,
+        allowed: int = ALL_DIGITS,
+        forced: int = 0) -> int:
+    """Return the number of combinations that can fill a cage."""
+    return len(cage_masks(total, size, allowed, forced))
+
+
+def is_unique(
+        total: int,
+        size: int,
+        allowed: int = ALL_DIGITS,
+        forced: int = 0) -> bool:
+    """Return True if exactly one combination can fill the cage."""
+    return len(cage_masks(total, size, allowed, forced)) == 1
+
+
+def cage_candidates(
+        total: int,
+        size: int,
+        allowed: int = ALL_DIGITS,
+        forced: int = 0) -> int:
+    """Return the mask of digits that appear in any valid combination."""
+    candidates = 0
+    for mask in cage_masks(total, size, allowed, forced):
+        candidates |= mask
+    return candidates
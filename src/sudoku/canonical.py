@@ -0,0 +1,141 @@
+"""Canonical forms and hashes of puzzles, and duplicate filtering.
+
+Two puzzles are the same if they have the same cages and the same clues,
+whatever order the frames are held in and whatever order the cells of a
+frame are in. In a block of independent frames a frame is its digits and
+the digits shown as clues; in a linked grid it is its cells and total,
+and the clues are the givens. Blocks keep their order, as that is where
+they are on the board.
+
+Large runs can be passed through unique to drop repeats. Up to
+EXACT_LIMIT puzzles the hashes seen are held in a set; beyond that a
+Bloom filter of fixed size is used, which may drop the odd puzzle that
+was not a repeat but never lets one through.
+"""
+import hashlib
+import math
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from typing import TypeVar
+
+from sudoku.cages import digits_mask
+from sudoku.grid import Block, Grid
+
+DIGEST_SIZE = 16
+EXACT_LIMIT = 100_000
+ERROR_RATE = 0.001
+
+T = TypeVar('T')
+
+
+def canonical_block(block: Block) -> tuple[tuple[int, int], ...]:
+    """Return the (digit mask, clue mask) of every frame, sorted."""
+    return tuple(sorted(
+        (frame.mask, digits_mask(clue for clue in frame.suggestions if clue))
+        for frame in block.frames))
+
+
+def canonical_grid(grid: Grid) -> tuple:
+    """Return a form of the grid that is the same for the same puzzle."""
+    if grid.linked:
+        cages = tuple(sorted(
+            (tuple(sorted(cells)), total) for cells, total in grid.cages()))
+        return ('linked', cages, tuple(grid.givens()))
+    return ('blocks',) + tuple(
+        canonical_block(block) for block in grid.blocks)
+
+
+def fingerprint(puzzle: Grid | Block) -> bytes:
+    """Return a stable hash of the canonical form of a grid or block."""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    if isinstance(puzzle, Block):
+        puzzle = Grid.from_blocks((puzzle,))
+    if puzzle.linked:
+        _, cages, givens = canonical_grid(puzzle)
+        digest.update(b'L')
+        for cells, total in cages:
+            digest.update(bytes((len(cells), *cells, total)))
+        digest.update(bytes(givens))
+    else:
+        digest.update(b'B')
+        for block in puzzle.blocks:
+            for mask, clues in canonical_block(block):
+                digest.update(mask.to_bytes(2, 'little'))
+                digest.update(clues.to_bytes(2, 'little'))
+            digest.update(b'|')
+    return digest.digest()
+
+
+class ExactFilter():
+    """The keys seen so far, held in a set."""
+    def __init__(self) -> None:
+        self._seen: set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._seen
+
+    def add(self, key: Hashable) -> bool:
+        """Add a key and return True if it had not been seen."""
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+
+class BloomFilter():
+    """A Bloom filter over byte-string keys, sized for capacity keys at
+    error_rate false positives."""
+    def __init__(self, capacity: int, error_rate: float = ERROR_RATE) -> None:
+        capacity = max(capacity, 1)
+        self.size = math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _positions(self, key: bytes) -> Iterator[int]:
+        if len(key) < DIGEST_SIZE:
+            key = hashlib.blake2b(key, digest_size=DIGEST_SIZE).digest()
+        first = int.from_bytes(key[:8], 'little')
+        second = int.from_bytes(key[8:16], 'little') | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self._bits[position >> 3] & 1 << (position & 7)
+                   for position in self._positions(key))
+
+    def add(self, key: bytes) -> bool:
+        """Add a key and return True if it had not been seen."""
+        new = False
+        for position in self._positions(key):
+            bit = 1 << (position & 7)
+            if not self._bits[position >> 3] & bit:
+                self._bits[position >> 3] |= bit
+                new = True
+        self._count += new
+        return new
+
+
+def seen_filter(expected: int) -> ExactFilter | BloomFilter:
+    """Return a filter suited to a run of expected puzzles."""
+    if expected <= EXACT_LIMIT:
+        return ExactFilter()
+    return BloomFilter(expected)
+
+
+def unique(
+        items: Iterable[T],
+        key: Callable[[T], bytes] = fingerprint,
+        seen: ExactFilter | BloomFilter | None = None) -> Iterator[T]:
+    """Yield the items whose key has not been seen before."""
+    if seen is None:
+        seen = ExactFilter()
+    for item in items:
+        if seen.add(key(item)):
+            yield item
@@ -0,0 +1,176 @@
+"""Precomputed catalogue of every block a grid can be built from.
+
+A block is an ordered split of the digits 1-9 into frames of one of the
+shapes in sudoku.grid.SHAPES, which gives 42,840 blocks in all. The
+build step enumerates them once and records, for each, the first
+smallest set of clues (see sudoku.clues) and a difficulty score (see
+sudoku.rating). The table ships with the package as catalogue.bin:
+
+    header    magic, format version, entry count, then the first entry
+              and the entry count of every shape
+    layouts   uint32 per entry: the shape in bits 28-31 and the frame
+              of digit d in bits 3(d-1) to 3(d-1)+2
+    clues     uint16 per entry: the digits shown as clues, as a mask
+    scores    uint16 per entry: the rating score with those clues
+
+Entries are grouped by shape, so a uniformly random block of a shape is
+one random index. Rebuild the table with:
+
+    python -m sudoku.catalogue
+"""
+import random
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+
+from sudoku.cages import ALL_DIGITS, MASK_DIGITS, digits_mask
+from sudoku.clues import minimum_clues
+
+CATALOGUE_PATH = Path(Path(__file__).parent, 'data', 'catalogue.bin')
+MAGIC = b'SDKC'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHI')
+RANGE = struct.Struct('<II')
+
+
+class Catalogue():
+    """The catalogue table, held as typed arrays."""
+    __slots__ = ('layouts', 'clues', 'scores', 'ranges')
+
+    def __init__(
+            self,
+            layouts: array,
+            clues: array,
+            scores: array,
+            ranges: list[tuple[int, int]]) -> None:
+        self.layouts = layouts
+        self.clues = clues
+        self.scores = scores
+        self.ranges = ranges  # (first entry, entry count) per shape
+
+    def __len__(self) -> int:
+        return len(self.layouts)
+
+    def sample(self, shape: int, rng: random.Random) -> int:
+        """Return the index of a random entry of a shape."""
+        start, count = self.ranges[shape]
+        return start + rng.randrange(count)
+
+    def masks(self, index: int) -> tuple[int, ...]:
+        """Return the digit mask of every frame of an entry."""
+        layout = self.layouts[index]
+        masks = [0] * 5
+        last = 0
+        for digit in range(9):
+            frame = layout >> (3 * digit) & 7
+            masks[frame] |= 1 << digit
+            last = max(last, frame)
+        return tuple(masks[:last + 1])
+
+    def to_bytes(self) -> bytes:
+        """Return the table in the catalogue.bin format."""
+        parts = [HEADER.pack(MAGIC, FORMAT_VERSION, len(self))]
+        parts.extend(RANGE.pack(*item) for item in self.ranges)
+        for table in (self.layouts, self.clues, self.scores):
+            if sys.byteorder != 'little':
+                table = array(table.typecode, table)
+                table.byteswap()
+            parts.append(table.tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, shapes: int) -> 'Catalogue':
+        """Return the table held in data, which has entries for shapes
+        shapes."""
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError('Not a block catalogue')
+        offset = HEADER.size
+        ranges = []
+        for _ in range(shapes):
+            ranges.append(RANGE.unpack_from(data, offset))
+            offset += RANGE.size
+        tables = []
+        for typecode in ('I', 'H', 'H'):
+            table = array(typecode)
+            size = count * table.itemsize
+            table.frombytes(data[offset:offset + size])
+            if sys.byteorder != 'little':
+                table.byteswap()
+            tables.append(table)
+            offset += size
+        return cls(*tables, ranges)
+
+
+def _splits(sizes: tuple[int, ...], digits: int) -> list[tuple[int, ...]]:
+    """Return every way to split the digits in a mask into frames of the
+    given sizes, in order."""
+    if not sizes:
+        return [()]
+    splits = []
+    for combination in combinations(MASK_DIGITS[digits], sizes[0]):
+        mask = digits_mask(combination)
+        splits.extend(
+            (mask,) + rest for rest in _splits(sizes[1:], digits & ~mask))
+    return splits
+
+
+def build(shapes: tuple[tuple[int, ...], ...]) -> Catalogue:
+    """Return the catalogue of blocks of the given shapes."""
+    # pylint: disable=import-outside-toplevel
+    from sudoku.grid import Block, Frame
+    from sudoku.rating import _BlockSolver
+
+    layouts, clues, scores = array('I'), array('H'), array('H')
+    ranges = []
+    for shape_index, shape in enumerate(shapes):
+        ranges.append((len(layouts), 0))
+        for masks in _splits(shape, ALL_DIGITS):
+            layout, shown, available = shape_index << 28, 0, ALL_DIGITS
+            frames = []
+            for frame_index, mask in enumerate(masks):
+                for digit in MASK_DIGITS[mask]:
+                    layout |= frame_index << (3 * (digit - 1))
+                frame_clues = minimum_clues(mask, available)
+                shown |= frame_clues
+                available &= ~mask
+
+                frame = Frame(MASK_DIGITS[mask], frame_index)
+                frame.suggestions = tuple(
+                    digit if frame_clues >> (digit - 1) & 1 else 0
+                    for digit in frame.digits)
+                frames.append(frame)
+            layouts.append(layout)
+            clues.append(shown)
+            scores.append(_BlockSolver(Block(frames)).solve().score)
+        ranges[-1] = (ranges[-1][0], len(layouts) - ranges[-1][0])
+    return Catalogue(layouts, clues, scores, ranges)
+
+
+@lru_cache(maxsize=None)
+def load() -> Catalogue:
+    """Return the catalogue shipped with the package, building it if the
+    file is missing."""
+    # pylint: disable=import-outside-toplevel
+    from sudoku.grid import SHAPES
+    try:
+        return Catalogue.from_bytes(CATALOGUE_PATH.read_bytes(), len(SHAPES))
+    except (FileNotFoundError, ValueError):
+        return build(SHAPES)
+
+
+def main() -> None:
+    """Build catalogue.bin."""
+    # pylint: disable=import-outside-toplevel
+    from sudoku.grid import SHAPES
+    catalogue = build(SHAPES)
+    CATALOGUE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    CATALOGUE_PATH.write_bytes(catalogue.to_bytes())
+    print(f'{len(catalogue)} blocks written to {CATALOGUE_PATH}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+"""Headless command line for Sudoku.
+
+Only the model layer is imported here, so puzzles can be generated on
+machines with no display:
+
+    sudoku generate --count 1000 --blocks 1 --seed 7 --jobs 4
+    sudoku rate library.sqlite
+    sudoku serve --port 8080
+    sudoku convert puzzles.jsonl puzzles.csv
+"""
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable, Iterator
+from typing import TextIO
+
+from sudoku._version import __version__
+from sudoku.batch import generate_many
+from sudoku.canonical import fingerprint, seen_filter
+from sudoku.formats import (
+    MAX_COMPACT_BLOCKS, format_for, read_grids, write_grids)
+from sudoku.grid import Grid
+from sudoku.library import PuzzleLibrary
+from sudoku.rating import TIERS, rate_many
+from sudoku.solver import is_unique
+
+FORMATS = ('jsonl', 'csv', 'compact', 'text')
+LIBRARY_PAGE = 5000
+LIBRARY_SUFFIX = '.sqlite'
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command line and return the exit status."""
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if not hasattr(args, 'command'):
+        parser.print_help()
+        return 2
+    return args.command(args)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='sudoku', description='Sudoku puzzle tools.')
+    parser.add_argument(
+        '--version', action='version', version=f'%(prog)s {__version__}')
+    subparsers = parser.add_subparsers()
+
+    generate = subparsers.add_parser(
+        'generate', help='generate puzzles without the GUI')
+    generate.add_argument(
+        '-n', '--count', type=int, default=1,
+        help='number of puzzles (default 1)')
+    generate.add_argument(
+        '-b', '--blocks', type=int, default=0,
+        help='blocks per puzzle (default from config)')
+    generate.add_argument(
+        '-s', '--seed', type=int, default=None,
+        help='run seed; the same seed gives the same puzzles')
+    generate.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help='worker processes (default all cores)')
+    generate.add_argument(
+        '-f', '--format', choices=FORMATS, default='jsonl',
+        help='output format (default jsonl)')
+    generate.add_argument(
+        '-o', '--output', default='-',
+        help='output file (default stdout)')
+    generate.add_argument(
+        '-l', '--library', default=None,
+        help='add the puzzles to this SQLite library instead of writing them')
+    generate.add_argument(
+        '--verify', action='store_true',
+        help='check every puzzle has exactly one solution')
+    generate.add_argument(
+        '-u', '--unique', action='store_true',
+        help='drop puzzles that repeat one already written')
+    generate.set_defaults(command=_generate)
+
+    rate = subparsers.add_parser(
+        'rate', help='rate the puzzles in a library by difficulty')
+    rate.add_argument('library', help='SQLite puzzle library')
+    rate.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help='worker processes (default all cores)')
+    rate.add_argument(
+        '--all', action='store_true',
+        help='rate every puzzle, not only those without a difficulty')
+    rate.set_defaults(command=_rate)
+
+    serve = subparsers.add_parser(
+        'serve', help='serve puzzles and checks over HTTP/JSON')
+    serve.add_argument(
+        '--host', default='127.0.0.1', help='address (default 127.0.0.1)')
+    serve.add_argument(
+        '-p', '--port', type=int, default=8080, help='port (default 8080)')
+    serve.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help='worker processes (default all cores)')
+    serve.add_argument(
+        '-b', '--blocks', type=int, default=1,
+        help='blocks per puzzle when a request does not say (default 1)')
+    serve.add_argument(
+        '--buffer', type=int, default=8,
+        help='puzzles kept ready per block count (default 8)')
+    serve.add_argument(
+        '--concurrency', type=int, default=64,
+        help='requests handled at once (default 64)')
+    serve.set_defaults(command=_serve)
+
+    convert = subparsers.add_parser(
+        'convert', help='convert puzzles between formats and libraries')
+    convert.add_argument(
+        'input', help=f'puzzle file, library ({LIBRARY_SUFFIX}) or - for '
+        'stdin')
+    convert.add_argument(
+        'output', help=f'puzzle file, library ({LIBRARY_SUFFIX}) or - for '
+        'stdout')
+    convert.add_argument(
+        '-f', '--from', dest='source', choices=FORMATS[:3], default=None,
+        help='input format (default from the suffix, else jsonl)')
+    convert.add_argument(
+        '-t', '--to', dest='target', choices=FORMATS[:3], default=None,
+        help='output format (default from the suffix, else jsonl)')
+    convert.set_defaults(command=_convert)
+    return parser
+
+
+def _generate(args: argparse.Namespace) -> int:
+    if args.count < 0:
+        print('*** Count must not be negative ***', file=sys.stderr)
+        return 2
+    if args.format == 'compact' and not args.blocks:
+        # pylint: disable=import-outside-toplevel
+        from sudoku.config import read_config
+        args.blocks = read_config().default_blocks
+    if args.format == 'compact' and args.blocks > MAX_COMPACT_BLOCKS:
+        print(f'*** Compact notation holds at most {MAX_COMPACT_BLOCKS} '
+              'blocks ***', file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    if args.library:
+        written = _store_grids(args)
+    elif args.output == '-':
+        written = _write_grids(args, sys.stdout)
+    else:
+        with open(args.output, 'w', encoding='utf8') as f_out:
+            written = _write_grids(args, f_out)
+    elapsed = time.perf_counter() - start
+
+    rate = written / elapsed if elapsed else 0.0
+    print(f'{written} puzzles in {elapsed:.2f}s ({rate:.1f} puzzles/s)',
+          file=sys.stderr)
+    return 0
+
+
+def _rate(args: argparse.Namespace) -> int:
+    start = time.perf_counter()
+    tiers = dict.fromkeys((name for _, name in TIERS), 0)
+    with PuzzleLibrary(args.library) as library:
+        after_id = 0
+        while page := library.page(
+                after_id=after_id, limit=LIBRARY_PAGE,
+                unrated=not args.all):
+            ratings = list(rate_many(
+                (grid for _, grid in page), workers=args.jobs))
+            library.set_difficulties(
+                (puzzle_id, rating.score)
+                for (puzzle_id, _), rating in zip(page, ratings))
+            for rating in ratings:
+                tiers[rating.tier] += 1
+            after_id = page[-1][0]
+    elapsed = time.perf_counter() - start
+
+    rated = sum(tiers.values())
+    rate = rated / elapsed if elapsed else 0.0
+    summary = ', '.join(f'{name} {count}' for name, count in tiers.items())
+    print(f'{rated} puzzles rated in {elapsed:.2f}s ({rate:.1f} puzzles/s): '
+          f'{summary}', file=sys.stderr)
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    # The service is only loaded when it is run
+    # pylint: disable=import-outside-toplevel
+    import asyncio
+    import logging
+    from sudoku.service import serve
+    logging.basicConfig(format='%(message)s')
+    logging.getLogger('sudoku.service').setLevel(logging.INFO)
+    try:
+        asyncio.run(serve(
+            args.host, args.port, workers=args.jobs, block_qty=args.blocks,
+            buffer_size=args.buffer, max_concurrency=args.concurrency))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _convert(args: argparse.Namespace) -> int:
+    start = time.perf_counter()
+    bad = 0
+
+    def report(line: int, record: str, message: str) -> None:
+        nonlocal bad
+        bad += 1
+        print(f'*** Line {line}: {message}: {record[:60]} ***',
+              file=sys.stderr)
+
+    def report_unwritten(number: int, record: str, message: str) -> None:
+        nonlocal bad
+        bad += 1
+        print(f'*** Puzzle {number} not written: {message}: {record} ***',
+              file=sys.stderr)
+
+    grids = _read_input(
+        args.input, args.source or format_for(args.input), report)
+    if args.output.endswith(LIBRARY_SUFFIX):
+        with PuzzleLibrary(args.output) as library:
+            written = library.add_many(grids)
+    elif args.output == '-':
+        written = write_grids(
+            grids, sys.stdout, args.target or 'jsonl', report_unwritten)
+    else:
+        with open(args.output, 'w', encoding='utf8', newline='') as f_out:
+            written = write_grids(
+                grids, f_out, args.target or format_for(args.output),
+                report_unwritten)
+    elapsed = time.perf_counter() - start
+
+    print(f'{written} puzzles converted in {elapsed:.2f}s, '
+          f'{bad} bad records', file=sys.stderr)
+    return 1 if bad else 0
+
+
+def _read_input(
+        path: str, fmt: str, report: Callable) -> Iterator[Grid]:
+    if path.endswith(LIBRARY_SUFFIX):
+        with PuzzleLibrary(path) as library:
+            after_id = 0
+            while page := library.page(
+                    after_id=after_id, limit=LIBRARY_PAGE):
+                yield from (grid for _, grid in page)
+                after_id = page[-1][0]
+    elif path == '-':
+        yield from read_grids(sys.stdin, fmt, report)
+    else:
+        with open(path, 'r', encoding='utf8', newline='') as f_in:
+            yield from read_grids(f_in, fmt, report)
+
+
+def _grids(args: argparse.Namespace) -> Iterator[tuple[int, Grid]]:
+    grids = generate_many(
+        args.count, block_qty=args.blocks, seed=args.seed, workers=args.jobs)
+    seen = seen_filter(args.count) if args.unique else None
+    repeats = 0
+    for index, grid in grids:
+        if args.verify and not is_unique(grid):
+            raise SystemExit(f'*** Puzzle {index} is not unique ***')
+        if seen is not None and not seen.add(fingerprint(grid)):
+            repeats += 1
+            continue
+        yield index, grid
+    if repeats:
+        print(f'{repeats} repeated puzzles dropped', file=sys.stderr)
+
+
+def _store_grids(args: argparse.Namespace) -> int:
+    with PuzzleLibrary(args.library) as library:
+        return library.add_many(grid for _, grid in _grids(args))
+
+
+def _write_grids(args: argparse.Namespace, output: TextIO) -> int:
+    if args.format in ('csv', 'compact'):
+        return write_grids(
+            (grid for _, grid in _grids(args)), output, args.format)
+    written = 0
+    for index, grid in _grids(args):
+        if args.format == 'jsonl':
+            record = {'index': index, **grid.to_dict()}
+            output.write(json.dumps(record, separators=(',', ':')))
+        else:
+            output.write(f'{index} {grid.blocks}')
+        output.write('\n')
+        written += 1
+    return written
+
+
+if __name__ == '__main__':
+    sys.exit(main())
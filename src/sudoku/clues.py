@@ -0,0 +1,60 @@
+"""Choose the clues that make a cage's digits unique.
+
+A cage and the digits still available to it are 9-bit masks (see
+sudoku.cages). Clue sets are searched smallest first, in the same order
+as itertools.combinations over the cage's sorted digits, and any set
+that contains a set already known to work is skipped. Results are
+memoised per (cage, available), of which there are at most 3**9.
+"""
+from functools import lru_cache
+from itertools import combinations
+
+from sudoku import instrumentation
+from sudoku.cages import (
+    MASK_DIGITS, MASK_SIZE, MASK_TOTAL, digits_mask, is_unique)
+
+
+@lru_cache(maxsize=None)
+def clue_subsets(cage: int) -> tuple[int, ...]:
+    """Return every subset of the cage, smallest first, the empty set first."""
+    digits = MASK_DIGITS[cage]
+    return tuple(
+        digits_mask(combination)
+        for size in range(len(digits) + 1)
+        for combination in combinations(digits, size))
+
+
+def is_sufficient(cage: int, available: int, clues: int) -> bool:
+    """Return True if giving clues leaves only one way to fill the cage."""
+    if instrumentation.current is not None:
+        instrumentation.current.count('uniqueness_checks')
+    return is_unique(MASK_TOTAL[cage], MASK_SIZE[cage], available, clues)
+
+
+@lru_cache(maxsize=None)
+def minimal_clue_sets(cage: int, available: int) -> tuple[int, ...]:
+    """Return every minimal clue mask that makes the cage unique.
+
+    available holds the digits the cage may still use, its own included.
+    The sets are in search order, so the first one is a smallest set.
+    """
+    found = []
+    for clues in clue_subsets(cage):
+        if instrumentation.current is not None:
+            instrumentation.current.count('clue_subsets')
+        if any(clues & known == known for known in found):
+            continue
+        if is_sufficient(cage, available, clues):
+            found.append(clues)
+    return tuple(found)
+
+
+@lru_cache(maxsize=None)
+def minimum_clues(cage: int, available: int) -> int:
+    """Return the first smallest clue mask that makes the cage unique."""
+    for clues in clue_subsets(cage):
+        if instrumentation.current is not None:
+            instrumentation.current.count('clue_subsets')
+        if is_sufficient(cage, available, clues):
+            return clues
+    return cage
@@ -1,12 +1,14 @@
 """Config for Sudoku."""
+import os
 
 from psiconfig import TomlConfig
 
-from sudoku.constants import CONFIG_PATH, USER_DATA_DIR
+from sudoku.constants import CONFIG_PATH, USER_DATA_DIR, PREFETCH_DEPTH
 
 DEFAULT_CONFIG = {
     'data_directory': USER_DATA_DIR,
     'default_blocks': 1,
+    'prefetch_depth': PREFETCH_DEPTH,
     'my_bool': True,
     'geometry': {
         'frm_main': '500x600',
@@ -14,13 +16,46 @@ DEFAULT_CONFIG = {
     },
 }
 
+# Config objects already read, keyed by path, with the file's signature
+_cache: dict = {}
+
+
+def _signature(path) -> tuple | None:
+    """Return what identifies a version of the file on disk."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
 
 def read_config(restore_defaults: bool = False) -> TomlConfig:
-    """Return the config file."""
-    return TomlConfig(
-        path=CONFIG_PATH,
-        defaults=DEFAULT_CONFIG,
-        restore_defaults=restore_defaults)
+    """Return the config file.
+
+    The parsed config is shared across the process and only read again
+    when config.toml changes on disk.
+    """
+    if restore_defaults:
+        _cache.pop(CONFIG_PATH, None)
+        return TomlConfig(
+            path=CONFIG_PATH,
+            defaults=DEFAULT_CONFIG,
+            restore_defaults=restore_defaults)
+
+    signature = _signature(CONFIG_PATH)
+    cached = _cache.get(CONFIG_PATH)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    config = TomlConfig(path=CONFIG_PATH, defaults=DEFAULT_CONFIG)
+    _cache[CONFIG_PATH] = (signature, config)
+    return config
+
+
+def refresh_config() -> TomlConfig:
+    """Drop the cached config and return it read afresh."""
+    _cache.pop(CONFIG_PATH, None)
+    return read_config()
 
 
 def save_config(updated_config: TomlConfig) -> TomlConfig | None:
@@ -29,7 +64,7 @@ def save_config(updated_config: TomlConfig) -> TomlConfig | None:
     result = updated_config.save()
     if result != updated_config.STATUS_OK:
         return None
-    return TomlConfig(CONFIG_PATH)
+    return refresh_config()
 
 
 config = read_config()
@@ -1,20 +1,21 @@
 """Constants for Sudoku."""
+import sys
 from pathlib import Path
 from appdirs import user_config_dir, user_data_dir
 
-from psiutils.known_paths import resolve_path
-
 # General
 AUTHOR = 'Jeff Watkins'
 APP_NAME = 'sudoku'
 APP_AUTHOR = 'psionman'
-HTML_DIR = resolve_path('html', __file__)
+HTML_DIR = str(Path(
+    getattr(sys, '_MEIPASS', Path(__file__).parent.parent), 'html').resolve())
 HELP_URI = ''
 
 # Paths
 CONFIG_PATH = Path(user_config_dir(APP_NAME, APP_AUTHOR), 'config.toml')
 USER_DATA_DIR = user_data_dir(APP_NAME, APP_AUTHOR)
 USER_DATA_FILE = 'data.json'
+LIBRARY_FILE = 'library.sqlite'
 HOME = str(Path.home())
 
 # GUI
@@ -22,3 +23,4 @@ APP_TITLE = 'Sudoku'
 ICON_FILE = Path(Path(__file__).parent, 'images', 'icon.png')
 
 DEFAULT_BLOCKS: int = 1
+PREFETCH_DEPTH: int = 3
@@ -0,0 +1,335 @@
+"""Read and write puzzles as JSON Lines, CSV or compact killer notation.
+
+One puzzle per line in every format, so files of any size are streamed:
+writers take an iterable of grids and readers yield them one at a time.
+
+    jsonl    Grid.to_dict as JSON
+    csv      seed, block_qty, then three fields in frame order: the
+             frame sizes of each block ("22221/441"), every frame's
+             digits and every frame's clues (0 for none)
+    compact  a cage map, one character per cell naming its cage (A-Z,
+             a-z, 0-9), the cage totals in label order and the givens
+             (. for none), separated by colons:
+             AABBC...:10,12,7,...:2..5.....
+
+A linked 9-block grid is a killer sudoku, so its compact cage map and
+givens are the usual 81 characters, row by row, as other tools read and
+write them. Cages are matched to frames by their cells, so any labels
+will do, though cages must keep within a box and be laid out as the
+generator lays out frames. Independent blocks have no standard form:
+their cells go block by block, each block's 9 row by row, with labels in
+frame order. Elsewhere board cells are numbered block * 9 + position, as
+on the board.
+JSON Lines and CSV round-trip a grid exactly. Compact notation holds the
+puzzle but not its solution, so the digits are solved for on import; an
+independent frame gets its digits in ascending order, as the generator
+makes them, and the seed is lost.
+
+Readers check every record and pass the bad ones to on_error (by
+default they are logged) rather than stop.
+"""
+import csv
+import json
+import logging
+from collections.abc import Callable, Iterable, Iterator
+from typing import TextIO
+
+from sudoku import killer
+from sudoku.cages import ALL_DIGITS, MASK_DIGITS, MASK_TOTAL, digits_mask
+from sudoku.grid import (
+    LINKED_BLOCKS, SHAPE_INDEX, SHAPES, Block, Frame, Grid, cage_positions)
+from sudoku.solver import cage_solutions
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('jsonl', 'csv', 'compact')
+CSV_HEADER = ('seed', 'block_qty', 'sizes', 'digits', 'clues')
+CAGE_LABELS = (
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')
+# Enough labels for any grid of this many blocks
+MAX_COMPACT_BLOCKS = len(CAGE_LABELS) // max(len(shape) for shape in SHAPES)
+# The row-major index (row * 9 + column) of every cell of a linked grid
+ROW_MAJOR = tuple(
+    killer.ROW_OF[cell] * 9 + killer.COL_OF[cell]
+    for cell in range(killer.SIZE))
+# The frame sizes of a block, by the positions of its cages
+_LAYOUTS = {
+    frozenset(frozenset(cage) for cage in cage_positions(shape)): shape
+    for shape in SHAPES}
+SUFFIXES = {'.jsonl': 'jsonl', '.csv': 'csv', '.txt': 'compact'}
+
+# Errors a malformed record can raise while it is parsed
+RECORD_ERRORS = (
+    ValueError, KeyError, TypeError, IndexError, AttributeError)
+
+
+def format_for(path: str, default: str = 'jsonl') -> str:
+    """Return the format that a file's suffix suggests."""
+    for suffix, name in SUFFIXES.items():
+        if path.endswith(suffix):
+            return name
+    return default
+
+
+def validate(grid: Grid) -> None:
+    """Raise ValueError unless the grid is well formed.
+
+    Only the structure and the solution are checked, not that the
+    puzzle has one solution (see sudoku.solver.is_unique).
+    """
+    if not grid.blocks:
+        raise ValueError('A grid needs at least one block')
+    for index, block in enumerate(grid.blocks):
+        sizes = tuple(len(frame.digits) for frame in block.frames)
+        if sizes not in SHAPE_INDEX:
+            raise ValueError(f'Block {index}: no layout for sizes {sizes}')
+        used = 0
+        for frame in block.frames:
+            # Frame has already turned digits outside 1-9 away
+            if frame.mask & used or frame.mask.bit_count() != len(
+                    frame.digits):
+                raise ValueError(f'Block {index}: digits repeat')
+            used |= frame.mask
+            if len(frame.suggestions) != len(frame.digits):
+                raise ValueError(f'Block {index}: clues do not fit frame')
+            for clue, digit in zip(frame.suggestions, frame.digits):
+                if clue and (clue != digit if grid.linked
+                             else clue not in frame.digits):
+                    raise ValueError(
+                        f'Block {index}: clue {clue} is not in its frame')
+        if used != ALL_DIGITS:
+            raise ValueError(f'Block {index}: digits 1-9 are not all used')
+    if grid.linked:
+        _validate_lines(grid)
+
+
+def _validate_lines(grid: Grid) -> None:
+    """Raise ValueError if a digit repeats in a row or column."""
+    board = [0] * killer.SIZE
+    frames = (frame for block in grid.blocks for frame in block.frames)
+    for (cells, _), frame in zip(grid.cages(), frames):
+        for cell, digit in zip(cells, frame.digits):
+            board[cell] = digit
+    for lines, name in ((killer.ROW_OF, 'row'), (killer.COL_OF, 'column')):
+        seen = [0] * 9
+        for cell, digit in enumerate(board):
+            bit = 1 << (digit - 1)
+            if seen[lines[cell]] & bit:
+                raise ValueError(
+                    f'Digit {digit} repeats in {name} {lines[cell] + 1}')
+            seen[lines[cell]] |= bit
+
+
+def to_jsonl(grid: Grid) -> str:
+    """Return a grid as a line of JSON."""
+    return json.dumps(grid.to_dict(), separators=(',', ':'))
+
+
+def from_jsonl(line: str) -> Grid:
+    """Return the grid in a line of JSON."""
+    return Grid.from_dict(json.loads(line))
+
+
+def to_csv_row(grid: Grid) -> tuple:
+    """Return a grid as the fields of a CSV row."""
+    frames = [frame for block in grid.blocks for frame in block.frames]
+    return (
+        '' if grid.seed is None else grid.seed,
+        grid.block_qty,
+        '/'.join(''.join(str(len(frame.digits)) for frame in block.frames)
+                 for block in grid.blocks),
+        ''.join(str(digit) for frame in frames for digit in frame.digits),
+        ''.join(str(clue) for frame in frames for clue in frame.suggestions),
+    )
+
+
+def from_csv_row(row: list[str]) -> Grid:
+    """Return the grid in the fields of a CSV row."""
+    seed, block_qty, sizes, digits, clues = row
+    if len(digits) != len(clues):
+        raise ValueError('Digits and clues differ in length')
+    blocks, start = [], 0
+    for block_sizes in sizes.split('/'):
+        frames = []
+        for index, size in enumerate(int(size) for size in block_sizes):
+            frame = Frame(
+                tuple(int(digit) for digit in digits[start:start + size]),
+                index)
+            frame.suggestions = tuple(
+                int(clue) for clue in clues[start:start + size])
+            frames.append(frame)
+            start += size
+        blocks.append(Block(frames))
+    if start != len(digits) or len(blocks) != int(block_qty):
+        raise ValueError('Sizes do not match the digits or block count')
+    return Grid.from_blocks(tuple(blocks), int(seed) if seed else None)
+
+
+def to_compact(grid: Grid) -> str:
+    """Return a grid in compact killer notation."""
+    cages = grid.cages()
+    if len(cages) > len(CAGE_LABELS):
+        raise ValueError(f'More than {len(CAGE_LABELS)} cages')
+    labels = ['.'] * (grid.block_qty * 9)
+    givens = ['.'] * (grid.block_qty * 9)
+    order = ROW_MAJOR if grid.linked else range(len(labels))
+    frames = (frame for block in grid.blocks for frame in block.frames)
+    for label, (cells, _), frame in zip(CAGE_LABELS, cages, frames):
+        for cell, clue in zip(cells, frame.suggestions):
+            labels[order[cell]] = label
+            if clue:
+                givens[order[cell]] = str(clue)
+    totals = ','.join(str(total) for _, total in cages)
+    return f'{"".join(labels)}:{totals}:{"".join(givens)}'
+
+
+def from_compact(line: str) -> Grid:
+    """Return the grid in a line of compact killer notation."""
+    parts = line.strip().split(':')
+    if len(parts) == 2:
+        parts.append('')
+    cage_map, totals, given_text = parts
+    if not cage_map or len(cage_map) % 9:
+        raise ValueError('The cage map is not whole blocks')
+    block_qty = len(cage_map) // 9
+    givens = [0 if char == '.' else int(char)
+              for char in given_text or '.' * len(cage_map)]
+    if len(givens) != len(cage_map):
+        raise ValueError('The givens do not match the cage map')
+
+    if block_qty == LINKED_BLOCKS:
+        # Written row by row: put it back in board order
+        cage_map = ''.join(cage_map[index] for index in ROW_MAJOR)
+        givens = [givens[index] for index in ROW_MAJOR]
+
+    totals = [int(total) for total in totals.split(',')]
+    cage_cells: list[list[int]] = [[] for _ in totals]
+    for cell, label in enumerate(cage_map):
+        cage_cells[CAGE_LABELS.index(label)].append(cell)
+
+    # The cages of each block, by their positions, whatever their labels
+    layout: list[dict[frozenset, int]] = [{} for _ in range(block_qty)]
+    for label, cells in enumerate(cage_cells):
+        if not cells:
+            raise ValueError('A cage has no cells')
+        block = cells[0] // 9
+        if cells[-1] // 9 != block:
+            raise ValueError('A cage crosses blocks')
+        layout[block][frozenset(cell - block * 9 for cell in cells)] = label
+    cages, cage_totals, frame_qtys = [], [], []
+    for block, block_cages in enumerate(layout):
+        sizes = _LAYOUTS.get(frozenset(block_cages))
+        if sizes is None:
+            raise ValueError(f'Block {block}: cages are not laid out')
+        for positions in cage_positions(sizes):
+            cages.append(
+                tuple(block * 9 + position for position in positions))
+            cage_totals.append(totals[block_cages[frozenset(positions)]])
+        frame_qtys.append(len(sizes))
+    totals = cage_totals
+
+    if block_qty == LINKED_BLOCKS:
+        solutions = killer.solutions(
+            tuple(zip(cages, totals)), givens, 1)
+        if not solutions:
+            raise ValueError('The puzzle has no solution')
+        cage_digits = [tuple(solutions[0][cell] for cell in cells)
+                       for cells in cages]
+    else:
+        cage_digits = _solve_blocks(cages, totals, givens)
+
+    blocks, index = [], 0
+    for frame_qty in frame_qtys:
+        frames = []
+        for frame_index in range(frame_qty):
+            frame = Frame(cage_digits[index], frame_index)
+            frame.suggestions = tuple(givens[cell] for cell in cages[index])
+            frames.append(frame)
+            index += 1
+        blocks.append(Block(frames))
+    return Grid.from_blocks(tuple(blocks))
+
+
+def _solve_blocks(
+        cages: list[tuple[int, ...]],
+        totals: list[int],
+        givens: list[int]) -> list[tuple[int, ...]]:
+    cage_digits = []
+    for block in range(len(givens) // 9):
+        indexes = [index for index, cells in enumerate(cages)
+                   if cells[0] // 9 == block]
+        solutions = cage_solutions([
+            (totals[index], len(cages[index]),
+             digits_mask(givens[cell] for cell in cages[index]
+                         if givens[cell]))
+            for index in indexes], 1)
+        if not solutions:
+            raise ValueError(f'Block {block} has no solution')
+        cage_digits.extend(MASK_DIGITS[mask] for mask in solutions[0])
+    if any(MASK_TOTAL[digits_mask(digits)] != total
+           for digits, total in zip(cage_digits, totals)):
+        raise ValueError('The totals do not match the digits')
+    return cage_digits
+
+
+def _log_error(line: int, record: str, message: str) -> None:
+    logger.warning('Line %d: %s: %.60s', line, message, record)
+
+
+def write_grids(
+        grids: Iterable[Grid],
+        output: TextIO,
+        fmt: str,
+        on_error: Callable[[int, str, str], None] = _log_error) -> int:
+    """Write grids to output in a format and return how many were
+    written, passing the number, a summary and the reason for each grid
+    the format cannot hold to on_error."""
+    if fmt == 'csv':
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(CSV_HEADER)
+    encode = {'jsonl': to_jsonl, 'csv': to_csv_row, 'compact': to_compact}[fmt]
+
+    written = 0
+    for number, grid in enumerate(grids, 1):
+        try:
+            record = encode(grid)
+        except ValueError as error:
+            on_error(number, f'grid of {grid.block_qty} blocks', str(error))
+            continue
+        if fmt == 'csv':
+            writer.writerow(record)
+        else:
+            output.write(record)
+            output.write('\n')
+        written += 1
+    return written
+
+
+def read_grids(
+        lines: Iterable[str],
+        fmt: str,
+        on_error: Callable[[int, str, str], None] = _log_error,
+        ) -> Iterator[Grid]:
+    """Yield the grids in lines of a format, passing the line number,
+    text and reason for each bad record to on_error."""
+    if fmt == 'csv':
+        reader = csv.reader(lines)
+        records = (
+            (reader.line_num, row) for row in reader
+            if row and tuple(row) != CSV_HEADER)
+        parse = from_csv_row
+    else:
+        records = (
+            (number, line) for number, line in enumerate(lines, 1)
+            if line.strip())
+        parse = from_jsonl if fmt == 'jsonl' else from_compact
+
+    for number, record in records:
+        try:
+            grid = parse(record)
+            validate(grid)
+        except RECORD_ERRORS as error:
+            text = ','.join(record) if fmt == 'csv' else record.strip()
+            on_error(number, text, str(error) or type(error).__name__)
+            continue
+        yield grid
@@ -10,7 +10,7 @@ from psiutils.utilities import window_resize
 
 from sudoku import logger
 from sudoku.constants import APP_TITLE
-from sudoku.config import read_config
+from sudoku.config import read_config, refresh_config
 import sudoku.text as txt
 
 FIELDS = {
@@ -153,7 +153,9 @@ class ConfigFrame():
 
         for field in FIELDS:
             self.config.config[field] = getattr(self, field).get()
-        return self.config.save()
+        result = self.config.save()
+        refresh_config()
+        return result
 
     def _config_changes(self) -> dict:
         stored = self.config.config
@@ -1,11 +1,9 @@
 
 """MainFrame for Sudoku."""
 
-import contextlib
 import tkinter as tk
 from tkinter import ttk, messagebox
 from pathlib import Path
-import random
 
 from psiutils.constants import PAD
 from psiutils.buttons import ButtonFrame
@@ -16,26 +14,15 @@ from sudoku.config import read_config
 
 from sudoku.main_menu import MainMenu
 
-from sudoku.grid import Grid, Block, Frame
-from sudoku.canvas import Canvas, COLOURS
+from sudoku.game import Game
+from sudoku.grid import Grid
+from sudoku.journal import GameJournal
+from sudoku.prefetch import PuzzlePrefetcher
+from sudoku.renderer import Cell, GridRenderer
 
 FRAME_TITLE = APP_TITLE
-
-
-TOTAL_LEFT, TOTAL_TOP = 3, 3
-TOTAL_WIDTH, TOTAL_HEIGHT = 50, 50
-TOTAL_TEXT_LEFT, TOTAL_TEXT_TOP = 25, 25
-TOTAL_FONT = ("Arial", 24)
-
-SUGGESTION_LEFT, SUGGESTION_TOP = 60, 60
-SUGGESTION_WIDTH, SUGGESTION_HEIGHT = 50, 50
-SUGGESTION_TEXT_LEFT, SUGGESTION_TEXT_TOP = 25, 25
-SUGGESTION_FONT = ("Arial", 36)
-
-SOLUTION_LEFT, SOLUTION_TOP = 75, 45
-SOLUTION_WIDTH, SOLUTION_HEIGHT = 50, 50
-SOLUTION_TEXT_LEFT, SOLUTION_TEXT_TOP = 25, 25
-SOLUTION_FONT = ("Arial", 36)
+PREFETCH_POLL_MS = 50
+BOARD_SIZE = 480
 
 
 class MainFrame():
@@ -44,19 +31,29 @@ class MainFrame():
         self.root = root
         self.config = read_config()
 
-        self.block = None
-        self.canvases = {}
-        self.r2l_index, self.l2r_index = 0, 0
-        self.left_to_right = True
+        # Everything made for the current grid is held by the game
+        self.game: Game | None = None
         self.buttons = {}
-        self.selected_cell = None
+
+        # Puzzles are generated ahead on a worker thread and handed over
+        # to the Tk thread by _poll_prefetch
+        self.prefetch = PuzzlePrefetcher(self.config.prefetch_depth).start()
+        self.next_grid = None
+
+        # Every move is journalled so that a game survives a crash
+        self.journal = GameJournal()
 
         # tk variables
 
         # Trace
 
         self._show()
-        self._create_grid()
+        restored = self.journal.restore()
+        if restored:
+            self._start_game(*restored)
+        else:
+            self._create_grid()
+        self._poll_prefetch()
         self.root.update_idletasks()  # Refresh UI without full redraw
         self.root.resizable(False, False)
 
@@ -76,7 +73,6 @@ class MainFrame():
 
         root.rowconfigure(0, weight=1)
         root.columnconfigure(0, weight=1)
-        self.root.after(100, self._create_grid)
 
         self.main_frame = self._main_frame(root)
         self.main_frame.grid(row=0, column=0, sticky=tk.NSEW)
@@ -97,6 +93,17 @@ class MainFrame():
         frame.rowconfigure(0, weight=1)
         frame.columnconfigure(0, weight=1)
 
+        # The whole grid is drawn with items on this one canvas
+        self.board = tk.Canvas(
+            frame,
+            background='#fff',
+            highlightthickness=0,
+            width=BOARD_SIZE,
+            height=BOARD_SIZE)
+        self.board.grid(row=0, column=0, sticky=tk.NSEW, padx=PAD, pady=PAD)
+        self.renderer = GridRenderer(self.board)
+        self.board.bind('<Button-1>', self._cell_selected)
+        self.board.bind('<Configure>', self.renderer.redraw)
         return frame
 
     def _numeric_frame(self, master: tk.Frame):
@@ -121,176 +128,44 @@ class MainFrame():
         return frame
 
     def _create_grid(self, *args) -> None:
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-
-        self.grid = Grid()
-
-        self.left_to_right = True
-        self.r2l_index, self.l2r_index = 0, 0
-        for index, block in enumerate(self.grid.blocks):
-            # TODO this assumes one block per grid!!!
-            self.block = block
-            block_frame = self._create_block(block)
-
-            row, column = index // 3, index % 3
-            block_frame.grid(row=row, column=column,
-                             sticky=tk.NSEW, padx=PAD, pady=PAD)
-
-    def _create_block(self, block: Block) -> ttk.Frame:
-        tk_frame = ttk.Frame(self.main_frame)
-        for item in range(3):
-            tk_frame.rowconfigure(item, weight=1, uniform="cell")
-            tk_frame.columnconfigure(item, weight=1, uniform="cell")
-        size = min(self.main_frame.winfo_width(),
-                   self.main_frame.winfo_height()) // 3
-
-        self.canvases = self._create_canvases(tk_frame, size)
-
-        self._create_frames(block)
-        return tk_frame
-
-    def _create_frames(self, block: Block) -> None:
-        canvases = dict(enumerate(self.canvases.values()))
-        index = 0
-        available_colours = list(COLOURS)
-        for frame in block.frames.values():
-            colours = random.choice(available_colours)
-            available_colours.remove(colours)
-
-            for cell_index in range(len(frame.cells)):
-                canvas = self._setup_cell_canvas(
-                    canvases[index], frame, colours)
-                canvas.frame = frame
-                frame.canvases.append(canvas)
-
-                if cell_index == 0:
-                    self._create_total_text(canvas, frame.total)
-
-                if frame.suggestions[cell_index]:
-                    suggestion = frame.suggestions[cell_index]
-                    self._create_suggestion_canvas(canvas, suggestion)
-
-                index = self._get_next_cell_position(frame, cell_index)
-
-    def _setup_cell_canvas(
-            self,
-            canvas: tk.Canvas,
-            frame: Frame,
-            colours: tuple) -> tk.Canvas:
-        canvas.value = frame
-        canvas.colours = colours
-        canvas['bg'] = canvas.background
-        return canvas
-
-    def _create_total_text(self, canvas: tk.Canvas, total: int):
-        inner = tk.Canvas(
-            canvas, width=TOTAL_WIDTH, height=TOTAL_HEIGHT,
-            bg=canvas.selected, borderwidth=0,
-            highlightthickness=0)
-        canvas.create_window(
-            TOTAL_LEFT, TOTAL_TOP, window=inner, anchor=tk.NW)
-        canvas.inner = inner.create_text(
-            TOTAL_TEXT_LEFT, TOTAL_TEXT_TOP, text=total,
-            font=TOTAL_FONT, fill="black")
-
-    def _create_suggestion_canvas(self, canvas: tk.Canvas, suggestion: int):
-        inner = tk.Canvas(
-            canvas,
-            width=SUGGESTION_WIDTH, height=SUGGESTION_HEIGHT,
-            bg=canvas.background, borderwidth=0,
-            highlightthickness=0)
-        canvas.create_window(
-            SUGGESTION_LEFT, SUGGESTION_TOP,
-            window=inner, anchor=tk.NW)
-        canvas.inner = inner.create_text(
-            SUGGESTION_TEXT_LEFT, SUGGESTION_TEXT_TOP,
-            text=suggestion,
-            font=SUGGESTION_FONT, fill="grey")
-        canvas.suggestion = suggestion
-
-    def _get_next_cell_position(self, frame: Frame, cell_index: int) -> int:
-        """Return the index of the next cell to be allocated."""
-        if self.left_to_right:
-            return self._left_to_right_assignment(frame, cell_index)
-        return self._right_to_left_assignment()
-
-    def _left_to_right_assignment(self, frame: Frame, cell_index: int) -> int:
-        cells = len(frame.cells)
-        if (self.l2r_index in (2, 5)
-                and cells > 1 and cell_index >= cells - 2):
-            # End of row → switch direction
-            self.r2l_index = self.l2r_index + 3
-            self.left_to_right = False
-            return self.r2l_index
-
-        self.l2r_index += 1
-        return self.l2r_index
-
-    def _right_to_left_assignment(self) -> int:
-        self.l2r_index += 1
-        self.r2l_index -= 1
-
-        if self.r2l_index in (2, 5):
-            self.left_to_right = True
-            self.l2r_index += 1
-            return self.l2r_index
-
-        return self.r2l_index
-
-    def _create_canvases(self, frame: tk.Frame, size: int) -> dict:
-        canvases = {}
-        for index in range(9):
-            # pylint: disable=no-member)
-            cell_canvas = self._create_cell(frame, size)
-            row, column = index // 3, index % 3
-            cell_canvas.grid(
-                row=row,
-                column=column,
-                padx=0,
-                pady=0,
-                ipadx=0,
-                ipady=0,
-                sticky="nsew")
-            canvases[cell_canvas.id] = cell_canvas
-        return canvases
-
-    def _create_cell(self, frame: tk.Frame, size: int) -> Canvas:
-        cell = Canvas(
-            frame,
-            borderwidth=1,
-            background='#fff',
-            highlightthickness=2,
-            width=size,
-            height=size
-        )
-        cell.bind('<Button-1>', self._cell_selected)
+        grid = self._next_grid()
+        self.journal.start(grid)
+        self._start_game(grid)
 
-        # Force the canvas to remain square
-        def resize(event, canvas=cell):
-            side = min(event.width, event.height)
-            canvas.config(width=side, height=side)
+    def _start_game(self, grid: Grid, values: list[int] | None = None) -> None:
+        self._end_game()
+        self.game = Game(grid, self.renderer, values)
 
-        cell.bind("<Configure>", resize)
-        return cell
+    def _end_game(self) -> None:
+        if self.game is not None:
+            self.game.close()
+            self.game = None
 
-    def _cell_selected(self, event) -> None:
-        # if suggestion ...
-        self._reset_backgrounds()
-
-        canvas = self.canvases[event.widget.id]
-        if canvas.suggestion:
-            return
-        canvas['bg'] = canvas.selected
-        if hasattr(canvas, "inner_canvas"):
-            canvas.inner_canvas['bg'] = canvas.selected
-        self.selected_cell = canvas
+    def _next_grid(self) -> Grid:
+        """Return a prefetched grid, or generate one if none is ready."""
+        # pylint: disable=no-member)
+        grid, self.next_grid = self.next_grid, None
+        if grid is None:
+            grid = self.prefetch.get_nowait()
+        default_blocks = read_config().default_blocks
+        if grid is None or grid.block_qty != default_blocks:
+            self.prefetch.drain()
+            grid = Grid(default_blocks)
+        return grid
+
+    def _poll_prefetch(self) -> None:
+        """Take a ready grid from the worker onto the Tk thread."""
+        if self.next_grid is None:
+            self.next_grid = self.prefetch.get_nowait()
+        self.root.after(PREFETCH_POLL_MS, self._poll_prefetch)
 
-    def _reset_backgrounds(self) -> None:
-        for canvas in self.canvases.values():
-            canvas['bg'] = canvas.background
-            if hasattr(canvas, "inner_canvas"):
-                canvas.inner_canvas['bg'] = canvas.background
+    def _cell_selected(self, event) -> None:
+        cell = self.renderer.cell_at(
+            int(self.board.canvasx(event.x)),
+            int(self.board.canvasy(event.y)))
+        if cell is None or cell.suggestion:
+            cell = None
+        self.game.select(cell)
 
     def _create_root(self, *args) -> None:
         self.main_frame.height = self.main_frame.winfo_width()
@@ -307,48 +182,25 @@ class MainFrame():
         button = event.widget
         if "disabled" in button.state():
             return
-        if self.selected_cell:
-            self._create_solution_canvas(button['text'])
+        if self.game.selected:
+            self._set_solution(self.game.selected, int(button['text']))
             self._check_complete()
 
-    def _create_solution_canvas(self, solution: int):
-        self.selected_cell.solution = solution
-        if solution == 0:
-            if hasattr(self.selected_cell, "inner_canvas"):
-                self.selected_cell.inner_canvas.destroy()
-                del self.selected_cell.inner_canvas
-            return
-
-        with contextlib.suppress(AttributeError):
-            self.selected_cell.inner_canvas.destroy()
-
-        inner = tk.Canvas(
-            self.selected_cell,
-            width=SOLUTION_WIDTH, height=SOLUTION_HEIGHT,
-            bg=self.selected_cell.selected, borderwidth=0,
-            highlightthickness=0)
-        self.selected_cell.create_window(
-            SOLUTION_LEFT, SOLUTION_TOP,
-            window=inner, anchor=tk.NW)
-        self.selected_cell.inner_canvas = inner
-        self.selected_cell.inner = inner.create_text(
-            SOLUTION_TEXT_LEFT, SOLUTION_TEXT_TOP,
-            text=solution,
-            font=SOLUTION_FONT, fill="black")
+    def _set_solution(self, cell: Cell, digit: int) -> None:
+        self.game.set_solution(cell, digit)
+        self.journal.record(cell.index, digit)
 
     def _clear_grid(self, *args) -> None:
-        self._reset_backgrounds()
-        for canvas in self.canvases.values():
-            if canvas.suggestion:
-                continue
-            self.selected_cell = canvas
-            self.selected_cell.solution = 0
-            self._create_solution_canvas(0)
-        # self.selected_cell = None
+        self.game.select(None)
+        for cell in self.game.cells:
+            if cell.solution:
+                self._set_solution(cell, 0)
 
     def _check_complete(self, *args) -> None:
         (correct, complete) = self._correct_complete()
         if complete:
+            if correct:
+                self.journal.clear()
             self._display_check(correct, complete)
 
     def _check_grid(self, *args) -> None:
@@ -365,25 +217,13 @@ class MainFrame():
             messagebox.showerror('', 'Wrong')
 
     def _correct_complete(self) -> tuple:
-        correct = True
-        complete = True
-        for frame in self.block.frames.values():
-            cells = []
-            for canvas in frame.canvases:
-                if canvas.solution:
-                    cells.append(canvas.solution)
-                if canvas.suggestion:
-                    cells.append(canvas.suggestion)
-            if (cells and
-                    not all(v in frame.cells for v in cells)
-                    or len(set(cells)) != len(cells)):
-                correct = False
-            if len(cells) != len(frame.cells):
-                complete = False
-        return (correct, complete)
+        return (self.game.correct, self.game.complete)
 
     def _dismiss(self, *args) -> None:
         dlg = messagebox.askokcancel('', "OK to quit")
         if not dlg:
             return
+        self.prefetch.stop()
+        self._end_game()
+        self.journal.close()
         self.root.destroy()
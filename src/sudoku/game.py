@@ -0,0 +1,107 @@
+"""One game in progress: the grid, the cells that show it and the checks
+on what has been entered.
+
+The game owns everything made for its grid, and nothing else holds on to
+it but the main frame. close releases the board items, the cells and the
+grid at once, so a new game never leaves the old one behind.
+"""
+import random
+
+from sudoku.grid import Block, Grid, cage_positions
+from sudoku.killer import COL_OF, ROW_OF
+from sudoku.renderer import COLOURS, Cell, GridRenderer
+from sudoku.validation import Validation
+
+CELLS_PER_BLOCK = 9
+
+
+class Game():
+    """A grid drawn by a renderer, with the digits entered in it."""
+    def __init__(
+            self,
+            grid: Grid,
+            renderer: GridRenderer,
+            values: list[int] | None = None) -> None:
+        self.grid: Grid | None = grid
+        self.renderer = renderer
+        self.selected: Cell | None = None
+
+        self.cells: list[Cell] = []
+        for index, block in enumerate(grid.blocks):
+            self.cells.extend(
+                self._create_frames(block, index * CELLS_PER_BLOCK))
+        self.frame_cells: dict = {}
+        for cell in self.cells:
+            self.frame_cells.setdefault(cell.frame, []).append(cell)
+        self.validation = self._create_validation(
+            grid.block_qty * CELLS_PER_BLOCK, grid.linked)
+        renderer.draw(self.cells, grid.block_qty)
+
+        if values:
+            for cell in self.cells:
+                if values[cell.index] and not cell.suggestion:
+                    self.set_solution(cell, values[cell.index])
+
+    @staticmethod
+    def _create_frames(block: Block, offset: int) -> list[Cell]:
+        """Return the cells of a block, laid out by the placement walk."""
+        cells = []
+        positions = cage_positions(
+            tuple(len(frame.digits) for frame in block.frames))
+        available_colours = list(COLOURS)
+        for frame, frame_positions in zip(block.frames, positions):
+            colours = random.choice(available_colours)
+            available_colours.remove(colours)
+
+            for cell_index, position in enumerate(frame_positions):
+                cells.append(Cell(
+                    offset + position,
+                    frame,
+                    frame.suggestions[cell_index],
+                    colours,
+                    first=cell_index == 0))
+        return cells
+
+    def _create_validation(
+            self, size: int, linked: bool = False) -> Validation:
+        validation = Validation(size)
+        for frame, cells in self.frame_cells.items():
+            validation.add_unit((cell.index for cell in cells), frame.mask)
+            for cell in cells:
+                validation.set(cell.index, cell.suggestion or cell.solution)
+        if linked:
+            for line in range(9):
+                validation.add_unit(
+                    cell for cell in range(size) if ROW_OF[cell] == line)
+                validation.add_unit(
+                    cell for cell in range(size) if COL_OF[cell] == line)
+        return validation
+
+    @property
+    def correct(self) -> bool:
+        """Return True if no digit entered breaks a rule."""
+        return self.validation.correct
+
+    @property
+    def complete(self) -> bool:
+        """Return True if every cell has a digit."""
+        return self.validation.complete
+
+    def select(self, cell: Cell | None) -> None:
+        """Make cell (or no cell) the one that digits go into."""
+        self.renderer.select(cell)
+        self.selected = cell
+
+    def set_solution(self, cell: Cell, digit: int) -> None:
+        """Enter a digit in a cell (0 to blank it)."""
+        self.renderer.set_solution(cell, digit)
+        self.validation.set(cell.index, digit)
+
+    def close(self) -> None:
+        """Take the game off the board and let go of it."""
+        self.renderer.clear()
+        self.selected = None
+        self.cells = []
+        self.frame_cells = {}
+        self.validation = Validation(0)
+        self.grid = None
@@ -1,11 +1,19 @@
 """Generate and control a sudoku grid."""
+import logging
 import random
-import itertools
-from itertools import combinations
-import uuid
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from sudoku import logger
-from sudoku.config import read_config
+from sudoku import catalogue, instrumentation, killer
+from sudoku.cages import (
+    MASK_DIGITS, MASK_TOTAL, cage_combinations, digits_mask)
+from sudoku.clues import minimum_clues
+# Re-exported so that generation can be instrumented from here
+from sudoku.instrumentation import (  # noqa: F401
+    GenerationStats, disable_stats, enable_stats, generation_stats)
+
+if TYPE_CHECKING:
+    from psiconfig import TomlConfig
 
 FRAMES = {
     2: [(4, 5), (6, 3)],
@@ -13,16 +21,73 @@ FRAMES = {
     4: [(3, 2, 2, 2), (3, 3, 2, 1), (4, 2, 2, 1)],
     5: [(2, 2, 2, 2, 1)],
 }
+# Every shape, in a fixed order that the catalogue and archive rely on
+SHAPES: tuple[tuple[int, ...], ...] = tuple(
+    shape for elements in sorted(FRAMES) for shape in FRAMES[elements])
+SHAPE_INDEX = {shape: index for index, shape in enumerate(SHAPES)}
 SEPARATOR = '-'*50
 
+# A grid of this many blocks is a full sudoku: rows and columns link them
+LINKED_BLOCKS = 9
+
+# Bump whenever a change to generation alters the grid built from a seed
+GENERATOR_VERSION = 3
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def cage_positions(sizes: tuple[int, ...]) -> tuple[tuple[int, ...], ...]:
+    """Return the positions in a block (0-8, row-major) of the cells of
+    frames with the given sizes.
+
+    The cells snake along the rows, turning back at the end of a row, so
+    every frame is a connected cage. frame.digits and frame.suggestions
+    are in this order.
+    """
+    left_to_right, l2r_index, r2l_index = True, 0, 0
+    index = 0
+    cages = []
+    for size in sizes:
+        cage = []
+        for cell_index in range(size):
+            cage.append(index)
+            if left_to_right:
+                if l2r_index in (2, 5) and size > 1 and cell_index >= size - 2:
+                    # End of row → switch direction
+                    r2l_index = l2r_index + 3
+                    left_to_right = False
+                    index = r2l_index
+                else:
+                    l2r_index += 1
+                    index = l2r_index
+            else:
+                l2r_index += 1
+                r2l_index -= 1
+                if r2l_index in (2, 5):
+                    left_to_right = True
+                    l2r_index += 1
+                    index = l2r_index
+                else:
+                    index = r2l_index
+        cages.append(tuple(cage))
+    return tuple(cages)
+
 
 class Frame:
-    """A sudoku frame."""
-    def __init__(self, cells: tuple) -> None:
-        self._cells: list = cells
-        self.suggestions: dict = {}
-        self.uuid = uuid.uuid1()
-        self.canvases = []
+    """A sudoku frame.
+
+    The digits are held as a 9-bit mask with the total worked out once, so
+    a frame costs a few slots rather than a dict, a UUID and a list.
+    """
+    __slots__ = ('id', 'digits', 'mask', 'total', 'suggestions')
+
+    def __init__(self, cells: tuple, frame_id: int = 0) -> None:
+        self.id: int = frame_id
+        self.digits: tuple = tuple(cells)
+        self.mask: int = digits_mask(self.digits)
+        self.total: int = MASK_TOTAL[self.mask]
+        self.suggestions: tuple = (0,) * len(self.digits)
 
     def __repr__(self) -> str:
         return (f"Frame({self.total} "
@@ -32,103 +97,289 @@ class Frame:
     @property
     def cells(self) -> tuple:
         """Return a sorted tuple of cells."""
-        return tuple(sorted(self._cells))
+        return MASK_DIGITS[self.mask]
 
-    @property
-    def total(self) -> int:
-        """Return to sum of the cells in the frame."""
-        return sum(self.cells)
+    @classmethod
+    def from_dict(cls, data: dict, frame_id: int = 0) -> 'Frame':
+        """Return a frame built from the output of to_dict."""
+        frame = cls(tuple(data['cells']), frame_id)
+        frame.suggestions = tuple(data['suggestions'])
+        return frame
+
+    def to_dict(self) -> dict:
+        """Return the frame as a json-serialisable dict."""
+        return {
+            'total': self.total,
+            'cells': list(self.digits),
+            'suggestions': list(self.suggestions),
+        }
 
 
 class Block:
     """A sudoku block."""
-    def __init__(self, frames: dict = ()) -> None:
-        self.frames = frames
+    __slots__ = ('frames',)
+
+    def __init__(self, frames: tuple = ()) -> None:
+        self.frames: tuple[Frame, ...] = tuple(frames)
 
     def __repr__(self) -> str:
         return f"Block({[str(frame) for frame in self.frames]})"
 
+    def __iter__(self):
+        return iter(self.frames)
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Block':
+        """Return a block built from the output of to_dict."""
+        return cls(
+            Frame.from_dict(frame, index)
+            for index, frame in enumerate(data['frames']))
+
+    def to_dict(self) -> dict:
+        """Return the block as a json-serialisable dict."""
+        return {'frames': [frame.to_dict() for frame in self.frames]}
+
 
 class Grid:
-    """A sudoku grid."""
-    def __init__(self, block_qty: int = 0) -> None:
+    """A sudoku grid.
+
+    Each grid draws from its own random.Random, seeded from seed when one
+    is given, so grids can be built independently in any process. The
+    same seed, block_qty and GENERATOR_VERSION always give the same grid.
+
+    The config is only consulted for the default block_qty; pass one in
+    to keep tight loops away from the file system.
+
+    A grid of LINKED_BLOCKS blocks is a full killer sudoku: it is cut from
+    one 9x9 solution, the digits of every frame are in cell order and the
+    grid as a whole has a single solution. Other grids are independent
+    blocks.
+    """
+    def __init__(
+            self,
+            block_qty: int = 0,
+            seed: int | None = None,
+            config: 'TomlConfig | None' = None) -> None:
         # pylint: disable=no-member)
-        config = read_config()
         if not block_qty:
+            if config is None:
+                # Imported here so the model can load without psiconfig
+                # pylint: disable=import-outside-toplevel
+                from sudoku.config import read_config
+                config = read_config()
             block_qty = config.default_blocks
         self.block_qty = block_qty
+        self.seed = seed
+        self._rng = random.Random(seed)
         self.blocks = self._create()
 
-        logger.info(f"Grid created {str(self.blocks)}")
+        if instrumentation.current is not None:
+            instrumentation.current.count('grids')
+        logger.info("Grid created %s", self.blocks)
+
+    def __getstate__(self) -> dict:
+        # The generator state is not needed once the grid is built
+        state = self.__dict__.copy()
+        state.pop('_rng', None)
+        return state
+
+    @classmethod
+    def from_blocks(
+            cls, blocks: tuple, seed: int | None = None) -> 'Grid':
+        """Return a grid holding existing blocks without generating any."""
+        grid = cls.__new__(cls)
+        grid.block_qty = len(blocks)
+        grid.seed = seed
+        grid.blocks = tuple(blocks)
+        return grid
 
-    def _create(self) -> None:
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Grid':
+        """Return a grid built from the output of to_dict."""
+        return cls.from_blocks(
+            tuple(Block.from_dict(block) for block in data['blocks']),
+            data.get('seed'))
+
+    def encode(self) -> bytes:
+        """Return the grid in the binary encoding of sudoku.archive."""
+        # pylint: disable=import-outside-toplevel
+        from sudoku.archive import encode_grid
+        return encode_grid(self)
+
+    @classmethod
+    def decode(cls, data: bytes) -> 'Grid':
+        """Return a grid built from the output of encode."""
+        # pylint: disable=import-outside-toplevel
+        from sudoku.archive import decode_grid
+        return decode_grid(data)
+
+    @property
+    def linked(self) -> bool:
+        """Return True if rows and columns run across the blocks."""
+        return self.block_qty == LINKED_BLOCKS
+
+    def cages(self) -> tuple[killer.Cage, ...]:
+        """Return the cells (see sudoku.killer) and total of every frame."""
+        cages = []
+        for box, block in enumerate(self.blocks):
+            positions = cage_positions(
+                tuple(len(frame.digits) for frame in block.frames))
+            for frame, cells in zip(block.frames, positions):
+                cages.append((
+                    tuple(box * 9 + position for position in cells),
+                    frame.total))
+        return tuple(cages)
+
+    def givens(self) -> list[int]:
+        """Return the clue in every cell (see sudoku.killer), or 0."""
+        givens = [0] * killer.SIZE
+        for (cells, _), frame in zip(
+                self.cages(),
+                (frame for block in self.blocks for frame in block.frames)):
+            for cell, suggestion in zip(cells, frame.suggestions):
+                givens[cell] = suggestion
+        return givens
+
+    def to_dict(self) -> dict:
+        """Return the grid as a json-serialisable dict."""
+        return {
+            'block_qty': self.block_qty,
+            'seed': self.seed,
+            'blocks': [block.to_dict() for block in self.blocks],
+        }
+
+    def _create(self) -> tuple[Block, ...]:
+        if self.linked:
+            return self._create_linked()
+
+        stats = instrumentation.current
         blocks = []
         for _ in range(self.block_qty):
-            block = self._get_block()
-            self._build_block(block)
+            if stats is None:
+                block = self._get_block()
+            else:
+                with stats.phase('block_layout'):
+                    block = self._get_block()
+                stats.count('blocks')
+                stats.count('frames', len(block))
             blocks.append(block)
-            logger.info(f"Block created {block}")
+            logger.info("Block created %s", block)
         return tuple(blocks)
 
-    def _get_block(self) -> tuple:
-        elements = random.choice([2, 3, 4, 5])
-        frame_set = random.choice(FRAMES[elements])
-        numbers = list(range(1, 10))
-        frames = {}
-        for cells in frame_set:
-            frame_cells = []
-            for _ in range(cells):
-                number = random.choice(numbers)
-                frame_cells.append(number)
-                numbers.remove(number)
-            frame = Frame(tuple(frame_cells))
-            frames[frame.uuid] = frame
-        block = Block(frames)
-        return block
+    def _create_linked(self) -> tuple[Block, ...]:
+        stats = instrumentation.current
+        if stats is None:
+            solution = killer.fill(self._rng)
+        else:
+            with stats.phase('solution'):
+                solution = killer.fill(self._rng)
+
+        blocks = []
+        for box in range(LINKED_BLOCKS):
+            if stats is None:
+                block = self._get_linked_block(solution[box * 9:box * 9 + 9])
+            else:
+                with stats.phase('block_layout'):
+                    block = self._get_linked_block(
+                        solution[box * 9:box * 9 + 9])
+                stats.count('blocks')
+            # Clues that make each frame's digits unique within its block
+            self._build_block(block)
+            blocks.append(block)
+        self.blocks = tuple(blocks)
+
+        clues = self.givens()
+        cages = self.cages()
+        if stats is None:
+            givens = killer.unique_givens(cages, solution, clues, self._rng)
+        else:
+            with stats.phase('uniqueness'):
+                givens = killer.unique_givens(
+                    cages, solution, clues, self._rng)
+            stats.count('givens_added', sum(
+                1 for given, clue in zip(givens, clues) if given != clue))
+
+        frames = (frame for block in self.blocks for frame in block.frames)
+        for frame, (cells, _) in zip(frames, cages):
+            frame.suggestions = tuple(givens[cell] for cell in cells)
+        for block in self.blocks:
+            logger.info("Block created %s", block)
+        return self.blocks
+
+    def _get_linked_block(self, digits: tuple[int, ...]) -> Block:
+        elements = self._rng.choice([2, 3, 4, 5])
+        frame_set = self._rng.choice(FRAMES[elements])
+        return Block(
+            Frame(tuple(digits[position] for position in cells), index)
+            for index, cells in enumerate(cage_positions(frame_set)))
+
+    def _get_block(self) -> Block:
+        """Return a block drawn from the catalogue, with its clues."""
+        elements = self._rng.choice([2, 3, 4, 5])
+        frame_set = self._rng.choice(FRAMES[elements])
+        table = catalogue.load()
+        index = table.sample(SHAPE_INDEX[frame_set], self._rng)
+        clues = table.clues[index]
+        frames = []
+        for frame_id, mask in enumerate(table.masks(index)):
+            frame = Frame(MASK_DIGITS[mask], frame_id)
+            frame.suggestions = self._place_suggestions(
+                frame, MASK_DIGITS[mask & clues])
+            frames.append(frame)
+        return Block(frames)
 
     def _build_block(self, block: Block):
         numbers = list(range(1, 10))
-        for frame in block.frames.values():
+        for frame in block.frames:
             frame.suggestions = self._get_suggestion(frame, numbers)
             for cell in frame.cells:
                 if cell in numbers:
                     numbers.remove(cell)
-            logger.info(f"Frame built {frame}")
+            logger.info("Frame built %s", frame)
 
-    def _get_suggestion(self, frame: Frame, numbers: list[int]) -> dict:
+    def _get_suggestion(self, frame: Frame, numbers: list[int]) -> tuple:
         """Assign the suggestions to a cell."""
-        suggestions = self._generate_suggestion(frame, numbers)
+        stats = instrumentation.current
+        if stats is None:
+            suggestions = self._generate_suggestion(frame, numbers)
+            return self._place_suggestions(frame, suggestions)
+
+        stats.count('frames')
+        with stats.phase('clue_search'):
+            suggestions = self._generate_suggestion(frame, numbers)
+        with stats.phase('placement'):
+            return self._place_suggestions(frame, suggestions, stats)
+
+    def _place_suggestions(
+            self,
+            frame: Frame,
+            suggestions: list[int],
+            stats: GenerationStats | None = None) -> tuple:
+        if self.linked:
+            # Every digit has its own cell
+            return tuple(
+                digit if digit in suggestions else 0
+                for digit in frame.digits)
 
-        assigned = {index: 0 for index, cell in enumerate(frame.cells)}
+        assigned = [0] * len(frame.cells)
         for suggestion in suggestions:
-            cell = random.randint(0, len(frame.cells) - 1)
+            cell = self._rng.randint(0, len(frame.cells) - 1)
             while assigned[cell] > 0:
-                cell = random.randint(0, len(frame.cells) - 1)
+                if stats is not None:
+                    stats.count('placement_retries')
+                cell = self._rng.randint(0, len(frame.cells) - 1)
             assigned[cell] = suggestion
-        return assigned
+        return tuple(assigned)
 
     def _generate_suggestion(
             self, frame: Frame, numbers: list[int]) -> list[int]:
-        # if there is only one possible outcome return an empty list
-        possibles = self._possible_cells(
-            frame.total, len(frame.cells), [], numbers)
-        if len(possibles) == 1:
-            return []
-
-        # otherwise return a list of integers as suggestions
-        frame_suggestion = []
-        suggestions = self._frame_suggestions(frame)  # a list of suggestions
-        for suggestion in suggestions:  # each suggestion is a list of ints
-            for number in suggestion:
-                numbers.remove(number)
-            possibles = self._possible_cells(
-                frame.total, len(frame.cells), suggestion, numbers)
-            if len(possibles) == 1:
-                frame_suggestion = suggestion
-                break
-            numbers = numbers + suggestion
-
-        return frame_suggestion
+        # an empty list if there is only one possible outcome, otherwise
+        # the first smallest set of cells that makes the frame unique
+        clues = minimum_clues(frame.mask, digits_mask(numbers))
+        return list(MASK_DIGITS[clues])
 
     def _possible_cells(
             self, total: int,
@@ -137,18 +388,6 @@ class Grid:
             numbers: list[int]
             ) -> tuple:
         """Return the possible combinations to make the frame."""
-        possibles = []
-        for possible in combinations(numbers, cells-len(suggestions)):
-            possible = [_ for _ in possible] + suggestions
-            if (sum(possible) == total
-                    and all(v in possible for v in suggestions)):
-                possibles.append(possible)
-        return tuple(possibles)
-
-    def _frame_suggestions(self, frame: Frame) -> list[list[int]]:
-        suggestions = []
-        for range_ in range(1, len(frame.cells) + 1):
-            for combination in itertools.combinations(
-                    frame.cells, range_):
-                suggestions.append(list(combination))
-        return suggestions
+        allowed = digits_mask(numbers) | digits_mask(suggestions)
+        return cage_combinations(
+            total, cells, allowed, digits_mask(suggestions))
@@ -0,0 +1,92 @@
+"""Opt-in counters and phase timings for grid generation.
+
+Collection is off until enable_stats is called. While it is off the only
+cost on the hot paths is a test of `current` against None.
+"""
+import json
+import time
+from contextlib import contextmanager
+
+COUNTERS = (
+    'grids',
+    'blocks',
+    'frames',
+    'combinations',
+    'uniqueness_checks',
+    'clue_subsets',
+    'placement_retries',
+    'givens_added',
+)
+PHASES = (
+    'block_layout',
+    'clue_search',
+    'placement',
+    'solution',
+    'uniqueness',
+)
+
+current: 'GenerationStats | None' = None
+
+
+class GenerationStats():
+    """Counts of the work done while generating and time spent per phase.
+
+    combinations, uniqueness_checks and clue_subsets count work actually
+    carried out; answers served from the memoised cage index and clue
+    searches are not counted again.
+    """
+    def __init__(self) -> None:
+        self.counters: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self.timings: dict[str, float] = dict.fromkeys(PHASES, 0.0)
+
+    def __repr__(self) -> str:
+        return f'GenerationStats({self.as_dict()})'
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add value to a counter."""
+        self.counters[name] += value
+
+    @contextmanager
+    def phase(self, name: str):
+        """Add the time spent in the with block to a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+
+    def reset(self) -> None:
+        """Set every counter and timing back to zero."""
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.timings = dict.fromkeys(PHASES, 0.0)
+
+    def as_dict(self) -> dict:
+        """Return the counters and timings (in seconds)."""
+        return {'counters': dict(self.counters),
+                'timings': dict(self.timings)}
+
+    def to_json(self, **kwargs) -> str:
+        """Return the counters and timings as json."""
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+def enable_stats() -> GenerationStats:
+    """Start collecting, keeping any stats already collected."""
+    # pylint: disable=global-statement
+    global current
+    if current is None:
+        current = GenerationStats()
+    return current
+
+
+def disable_stats() -> GenerationStats | None:
+    """Stop collecting and return what was collected."""
+    # pylint: disable=global-statement
+    global current
+    stats, current = current, None
+    return stats
+
+
+def generation_stats() -> GenerationStats | None:
+    """Return the stats being collected, or None when collection is off."""
+    return current
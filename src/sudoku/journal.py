@@ -0,0 +1,162 @@
+"""Crash-safe record of the game in progress.
+
+The game is kept as a snapshot (the grid and the digits entered so far)
+and a log of the moves made since. Each move is one short line appended
+to the log. Every so often the moves are folded into a fresh snapshot,
+written to a temporary file and renamed over the old one, which also
+switches to a new, empty log. Replaying a move only sets a cell, so a
+move that is both in a snapshot and in a log is harmless.
+"""
+import contextlib
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+
+from sudoku.constants import USER_DATA_DIR
+from sudoku.formats import RECORD_ERRORS, validate
+from sudoku.grid import Grid
+
+JOURNAL_DIRECTORY = 'journal'
+SNAPSHOT_FILE = 'snapshot.json'
+COMPACT_EVERY = 500
+
+logger = logging.getLogger(__name__)
+
+
+def _digit(value: int) -> int:
+    if not isinstance(value, int) or not 0 <= value <= 9:
+        raise ValueError(f'{value!r} is not a digit')
+    return value
+
+
+class GameJournal():
+    """An append-only journal of the moves in one game.
+
+    Cells are numbered as on the board: block * 9 + position.
+    """
+    def __init__(
+            self,
+            directory: str | Path | None = None,
+            compact_every: int = COMPACT_EVERY,
+            durable: bool = False) -> None:
+        if directory is None:
+            directory = Path(USER_DATA_DIR, JOURNAL_DIRECTORY)
+        self.directory = Path(directory)
+        self.compact_every = compact_every
+        self.durable = durable  # fsync each move, not just flush it
+        self.grid: Grid | None = None
+        self.values: list[int] = []
+        self.moves = 0
+        self._log = None
+        self._log_name = ''
+
+    @property
+    def snapshot_path(self) -> Path:
+        """Return the path of the snapshot."""
+        return Path(self.directory, SNAPSHOT_FILE)
+
+    def start(self, grid: Grid, values: list[int] | None = None) -> None:
+        """Begin journalling a game."""
+        self.grid = grid
+        self.values = list(values or [0] * (grid.block_qty * 9))
+        self.compact()
+
+    def record(self, cell: int, digit: int) -> None:
+        """Append a move: digit entered in cell (0 clears it)."""
+        if self._log is None:
+            return
+        self.values[cell] = digit
+        self._log.write(f'{cell} {digit}\n')
+        if self.durable:
+            os.fsync(self._log.fileno())
+        self.moves += 1
+        if self.moves >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """Fold the moves into a new snapshot and start a new log."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        old_log = self._log_name
+        self.close()
+
+        self._log_name = f'moves-{uuid.uuid4().hex[:12]}.log'
+        content = json.dumps({
+            'grid': self.grid.to_dict(),
+            'values': self.values,
+            'log': self._log_name,
+        }, separators=(',', ':'))
+        # pylint: disable=consider-using-with
+        self._log = open(
+            Path(self.directory, self._log_name), 'a',
+            encoding='utf8', buffering=1)
+        temp_path = self.snapshot_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf8') as f_json:
+            f_json.write(content)
+            f_json.flush()
+            os.fsync(f_json.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        self.moves = 0
+
+        if old_log:
+            with contextlib.suppress(FileNotFoundError):
+                Path(self.directory, old_log).unlink()
+
+    def restore(self) -> tuple[Grid, list[int]] | None:
+        """Return the journalled grid and the digits entered, or None if
+        there is no game to resume, and carry on journalling it."""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf8') as f_json:
+                data = json.load(f_json)
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return None
+
+        try:
+            grid = Grid.from_dict(data['grid'])
+            validate(grid)
+            values = [_digit(value) for value in data['values']]
+            if len(values) != grid.block_qty * 9:
+                raise ValueError('Values do not fit the grid')
+            self._log_name = Path(str(data['log'])).name
+        except RECORD_ERRORS as error:
+            logger.warning('Discarded unreadable snapshot: %s', error)
+            return None
+
+        with contextlib.suppress(FileNotFoundError):
+            with open(Path(self.directory, self._log_name), 'r',
+                      encoding='utf8') as f_log:
+                for line in f_log:
+                    if not line.endswith('\n'):
+                        break  # torn by a crash mid-write
+                    try:
+                        cell, digit = (int(field) for field in line.split())
+                        if not 0 <= cell < len(values):
+                            raise IndexError(f'No cell {cell}')
+                        values[cell] = _digit(digit)
+                    except (ValueError, IndexError) as error:
+                        logger.warning('Stopped replay at %r: %s',
+                                       line, error)
+                        break
+
+        self.start(grid, values)
+        return grid, self.values
+
+    def clear(self) -> None:
+        """Forget the game, e.g. once it is solved."""
+        self.close()
+        paths = [self.snapshot_path]
+        if self._log_name:
+            paths.append(Path(self.directory, self._log_name))
+        for path in paths:
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+        self.grid = None
+        self.values = []
+        self._log_name = ''
+
+    def close(self) -> None:
+        """Close the log."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
@@ -0,0 +1,170 @@
+"""Fill and solve full 9x9 killer grids.
+
+Cells are numbered box * 9 + position, with boxes and the positions in a
+box both in row-major order, to match the blocks of a grid. Rows,
+columns, boxes and cages hold the digits they have used as 9-bit masks
+(see sudoku.cages), and the search always branches on the empty cell
+with the fewest candidates.
+"""
+import random
+from functools import lru_cache
+
+from sudoku.cages import ALL_DIGITS, MASK_DIGITS, MASK_SIZE, cage_candidates
+
+SIZE = 81
+
+# Row, column and box of every cell
+ROW_OF = tuple((cell // 27) * 3 + (cell % 9) // 3 for cell in range(SIZE))
+COL_OF = tuple((cell // 9) % 3 * 3 + cell % 3 for cell in range(SIZE))
+BOX_OF = tuple(cell // 9 for cell in range(SIZE))
+
+# A cage is its cells and their total
+Cage = tuple[tuple[int, ...], int]
+
+
+@lru_cache(maxsize=None)
+def _cage_allowed(total: int, size: int, used: int) -> int:
+    """Return the digits that can still go in a cage."""
+    if not size:
+        return 0
+    return cage_candidates(total, size, ALL_DIGITS & ~used)
+
+
+class _Search():
+    def __init__(
+            self,
+            cages: tuple[Cage, ...],
+            limit: int,
+            rng: random.Random | None = None) -> None:
+        self.limit = limit
+        self.rng = rng
+        self.values = [0] * SIZE
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+        self.cage_of = [-1] * SIZE
+        self.cage_total = [total for _, total in cages]
+        self.cage_left = [len(cells) for cells, _ in cages]
+        self.cage_used = [0] * len(cages)
+        for index, (cells, _) in enumerate(cages):
+            for cell in cells:
+                self.cage_of[cell] = index
+        self.solutions: list[tuple[int, ...]] = []
+
+    def candidates(self, cell: int) -> int:
+        allowed = ALL_DIGITS & ~(
+            self.rows[ROW_OF[cell]]
+            | self.cols[COL_OF[cell]]
+            | self.boxes[BOX_OF[cell]])
+        cage = self.cage_of[cell]
+        if cage >= 0:
+            allowed &= _cage_allowed(
+                self.cage_total[cage],
+                self.cage_left[cage],
+                self.cage_used[cage])
+        return allowed
+
+    def place(self, cell: int, digit: int) -> None:
+        bit = 1 << (digit - 1)
+        self.values[cell] = digit
+        self.rows[ROW_OF[cell]] |= bit
+        self.cols[COL_OF[cell]] |= bit
+        self.boxes[BOX_OF[cell]] |= bit
+        cage = self.cage_of[cell]
+        if cage >= 0:
+            self.cage_total[cage] -= digit
+            self.cage_left[cage] -= 1
+            self.cage_used[cage] |= bit
+
+    def remove(self, cell: int, digit: int) -> None:
+        bit = 1 << (digit - 1)
+        self.values[cell] = 0
+        self.rows[ROW_OF[cell]] &= ~bit
+        self.cols[COL_OF[cell]] &= ~bit
+        self.boxes[BOX_OF[cell]] &= ~bit
+        cage = self.cage_of[cell]
+        if cage >= 0:
+            self.cage_total[cage] += digit
+            self.cage_left[cage] += 1
+            self.cage_used[cage] &= ~bit
+
+    def give(self, givens: list[int]) -> bool:
+        """Place the givens, returning False if they clash."""
+        for cell, digit in enumerate(givens):
+            if digit:
+                if not self.candidates(cell) >> (digit - 1) & 1:
+                    return False
+                self.place(cell, digit)
+        return True
+
+    def run(self, empty: list[int]) -> None:
+        if not empty:
+            self.solutions.append(tuple(self.values))
+            return
+
+        best, best_candidates, best_count = 0, 0, 10
+        for position, cell in enumerate(empty):
+            candidates = self.candidates(cell)
+            count = MASK_SIZE[candidates]
+            if count < best_count:
+                best, best_candidates, best_count = (
+                    position, candidates, count)
+                if count <= 1:
+                    break
+        if not best_count:
+            return
+
+        cell = empty[best]
+        rest = empty[:best] + empty[best + 1:]
+        digits = MASK_DIGITS[best_candidates]
+        if self.rng is not None:
+            digits = self.rng.sample(digits, len(digits))
+        for digit in digits:
+            self.place(cell, digit)
+            self.run(rest)
+            self.remove(cell, digit)
+            if len(self.solutions) >= self.limit:
+                return
+
+
+def solutions(
+        cages: tuple[Cage, ...],
+        givens: list[int] | None = None,
+        limit: int = 2) -> list[tuple[int, ...]]:
+    """Return up to limit solutions of a killer grid."""
+    givens = givens or [0] * SIZE
+    search = _Search(cages, limit)
+    if not search.give(givens):
+        return []
+    search.run([cell for cell in range(SIZE) if not givens[cell]])
+    return search.solutions
+
+
+def fill(rng: random.Random) -> tuple[int, ...]:
+    """Return a random complete sudoku solution."""
+    search = _Search((), 1, rng)
+    search.run(list(range(SIZE)))
+    return search.solutions[0]
+
+
+def unique_givens(
+        cages: tuple[Cage, ...],
+        solution: tuple[int, ...],
+        givens: list[int],
+        rng: random.Random) -> list[int]:
+    """Return givens, with cells of solution added until it is the only
+    solution.
+
+    Each round reveals a cell where another solution disagrees with the
+    intended one.
+    """
+    givens = list(givens)
+    while True:
+        found = solutions(cages, givens, 2)
+        if len(found) < 2:
+            return givens
+        other = found[0] if found[0] != solution else found[1]
+        cells = [cell for cell in range(SIZE)
+                 if other[cell] != solution[cell]]
+        cell = rng.choice(cells)
+        givens[cell] = solution[cell]
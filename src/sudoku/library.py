@@ -0,0 +1,329 @@
+"""Indexed store of puzzles in a SQLite database.
+
+Puzzles are kept one row each, as the json of Grid.to_dict, alongside
+the columns they are looked up by. Inserts are batched into
+transactions and reads are paged on the primary key, so the library
+stays quick with millions of puzzles.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from sudoku.constants import LIBRARY_FILE, USER_DATA_DIR, USER_DATA_FILE
+from sudoku.formats import RECORD_ERRORS, validate
+from sudoku.grid import GENERATOR_VERSION, Grid
+
+BATCH_SIZE = 1000
+PAGE_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    id INTEGER PRIMARY KEY,
+    block_qty INTEGER NOT NULL,
+    clue_count INTEGER NOT NULL,
+    difficulty REAL,
+    signature TEXT NOT NULL,
+    seed TEXT,
+    version INTEGER NOT NULL,
+    seen_at REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS puzzles_block_qty
+    ON puzzles (block_qty, difficulty);
+CREATE INDEX IF NOT EXISTS puzzles_clue_count ON puzzles (clue_count);
+CREATE INDEX IF NOT EXISTS puzzles_difficulty ON puzzles (difficulty);
+CREATE INDEX IF NOT EXISTS puzzles_signature ON puzzles (signature);
+CREATE INDEX IF NOT EXISTS puzzles_unseen
+    ON puzzles (block_qty, difficulty) WHERE seen_at IS NULL;
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def cage_signature(grid: Grid) -> str:
+    """Return a hash of the cage layout and totals of a grid.
+
+    Clues are left out, so puzzles that differ only in their clues share
+    a signature.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for block in grid.blocks:
+        digest.update(bytes(
+            value for frame in block.frames
+            for value in (len(frame.digits), frame.total)))
+        digest.update(b'|')
+    return digest.hexdigest()
+
+
+def clue_count(grid: Grid) -> int:
+    """Return the number of clues shown in a grid."""
+    return sum(
+        1 for block in grid.blocks for frame in block.frames
+        for clue in frame.suggestions if clue)
+
+
+def _grids(content: list, path: str | Path) -> Iterator[Grid]:
+    """Yield the grids in a list, logging and skipping bad items."""
+    for index, item in enumerate(content):
+        if not isinstance(item, dict) or 'blocks' not in item:
+            continue
+        try:
+            grid = Grid.from_dict(item)
+            validate(grid)
+        except RECORD_ERRORS as error:
+            logger.warning('Skipped puzzle %d in %s: %s', index, path, error)
+            continue
+        yield grid
+
+
+class PuzzleLibrary():
+    """A SQLite library of puzzles.
+
+    Use as a context manager, or call close when done.
+    """
+    def __init__(self, path: str | Path | None = None) -> None:
+        if path is None:
+            path = Path(USER_DATA_DIR, LIBRARY_FILE)
+        self.path = Path(path)
+        if str(path) != ':memory:':
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> 'PuzzleLibrary':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database."""
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM puzzles').fetchone()[0]
+
+    @staticmethod
+    def _row(grid: Grid, difficulty: float | None) -> tuple:
+        return (
+            grid.block_qty,
+            clue_count(grid),
+            difficulty,
+            cage_signature(grid),
+            # Seeds can be unsigned 64-bit, beyond SQLite's INTEGER
+            None if grid.seed is None else str(grid.seed),
+            GENERATOR_VERSION,
+            json.dumps(grid.to_dict(), separators=(',', ':')),
+        )
+
+    def add(self, grid: Grid, difficulty: float | None = None) -> int:
+        """Add a puzzle and return its id."""
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO puzzles (block_qty, clue_count, difficulty, '
+                'signature, seed, version, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                self._row(grid, difficulty))
+        return cursor.lastrowid
+
+    def add_many(
+            self,
+            grids: Iterable[Grid | tuple[Grid, float | None]],
+            batch_size: int = BATCH_SIZE) -> int:
+        """Add puzzles, batch_size to a transaction, and return how many
+        were added.
+
+        Each item is a grid or a (grid, difficulty) pair.
+        """
+        added = 0
+        batch = []
+        for item in grids:
+            if isinstance(item, tuple):
+                grid, difficulty = item
+            else:
+                grid, difficulty = item, None
+            batch.append(self._row(grid, difficulty))
+            if len(batch) >= batch_size:
+                added += self._insert(batch)
+                batch = []
+        if batch:
+            added += self._insert(batch)
+        return added
+
+    def _insert(self, rows: list[tuple]) -> int:
+        with self.connection:
+            self.connection.executemany(
+                'INSERT INTO puzzles (block_qty, clue_count, difficulty, '
+                'signature, seed, version, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows)
+        return len(rows)
+
+    def get(self, puzzle_id: int) -> Grid | None:
+        """Return the puzzle with the id, or None."""
+        row = self.connection.execute(
+            'SELECT data FROM puzzles WHERE id = ?', (puzzle_id,)).fetchone()
+        return Grid.from_dict(json.loads(row[0])) if row else None
+
+    @staticmethod
+    def _where(
+            block_qty: int | None,
+            min_difficulty: float | None,
+            max_difficulty: float | None,
+            unseen: bool,
+            unrated: bool = False) -> tuple[list[str], list]:
+        clauses, params = [], []
+        if block_qty is not None:
+            clauses.append('block_qty = ?')
+            params.append(block_qty)
+        if min_difficulty is not None:
+            clauses.append('difficulty >= ?')
+            params.append(min_difficulty)
+        if max_difficulty is not None:
+            clauses.append('difficulty <= ?')
+            params.append(max_difficulty)
+        if unseen:
+            clauses.append('seen_at IS NULL')
+        if unrated:
+            clauses.append('difficulty IS NULL')
+        return clauses, params
+
+    def page(
+            self,
+            block_qty: int | None = None,
+            min_difficulty: float | None = None,
+            max_difficulty: float | None = None,
+            unseen: bool = False,
+            after_id: int = 0,
+            limit: int = PAGE_SIZE,
+            unrated: bool = False) -> list[tuple[int, Grid]]:
+        """Return up to limit (id, grid) pairs with ids above after_id.
+
+        Pass the last id of one page as after_id to get the next.
+        """
+        clauses, params = self._where(
+            block_qty, min_difficulty, max_difficulty, unseen, unrated)
+        clauses.append('id > ?')
+        rows = self.connection.execute(
+            f'SELECT id, data FROM puzzles WHERE {" AND ".join(clauses)} '
+            'ORDER BY id LIMIT ?',
+            (*params, after_id, limit))
+        return [(row[0], Grid.from_dict(json.loads(row[1]))) for row in rows]
+
+    def count(
+            self,
+            block_qty: int | None = None,
+            min_difficulty: float | None = None,
+            max_difficulty: float | None = None,
+            unseen: bool = False) -> int:
+        """Return the number of puzzles that match."""
+        clauses, params = self._where(
+            block_qty, min_difficulty, max_difficulty, unseen)
+        where = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+        return self.connection.execute(
+            f'SELECT COUNT(*) FROM puzzles {where}', params).fetchone()[0]
+
+    @staticmethod
+    def _choose_unseen(
+            clauses: list[str],
+            params: list,
+            rated_only: bool) -> tuple[str, list]:
+        # Rated and unrated puzzles are looked up apart, as one order
+        # over both would sort every match rather than walk an index
+        where = ' AND '.join(clauses)
+        rated = (
+            f'(SELECT id FROM puzzles WHERE {where} '
+            'AND difficulty IS NOT NULL ORDER BY difficulty, id LIMIT 1)')
+        if rated_only:
+            return rated, params
+        unrated = (
+            f'(SELECT id FROM puzzles WHERE {where} '
+            'AND difficulty IS NULL ORDER BY id LIMIT 1)')
+        return f'COALESCE({rated}, {unrated})', params * 2
+
+    def next_unseen(
+            self,
+            block_qty: int | None = None,
+            min_difficulty: float | None = None,
+            max_difficulty: float | None = None,
+            mark: bool = True) -> tuple[int, Grid] | None:
+        """Return the easiest (id, grid) not yet seen that matches,
+        marking it seen unless mark is False.
+
+        Unrated puzzles come after every rated one. Choosing and marking
+        are one statement, so two readers never get the same puzzle.
+        """
+        clauses, params = self._where(
+            block_qty, min_difficulty, max_difficulty, unseen=True)
+        choose, params = self._choose_unseen(
+            clauses, params,
+            rated_only=min_difficulty is not None
+            or max_difficulty is not None)
+        if mark:
+            with self.connection:
+                row = self.connection.execute(
+                    'UPDATE puzzles SET seen_at = ? '
+                    f'WHERE id = {choose} RETURNING id, data',
+                    (time.time(), *params)).fetchone()
+        else:
+            row = self.connection.execute(
+                f'SELECT id, data FROM puzzles WHERE id = {choose}',
+                params).fetchone()
+        if row is None:
+            return None
+        return row[0], Grid.from_dict(json.loads(row[1]))
+
+    def mark_seen(self, puzzle_id: int, seen: bool = True) -> None:
+        """Record that a puzzle has been played (or not)."""
+        with self.connection:
+            self.connection.execute(
+                'UPDATE puzzles SET seen_at = ? WHERE id = ?',
+                (time.time() if seen else None, puzzle_id))
+
+    def set_difficulty(self, puzzle_id: int, difficulty: float) -> None:
+        """Set the difficulty of a puzzle."""
+        with self.connection:
+            self.connection.execute(
+                'UPDATE puzzles SET difficulty = ? WHERE id = ?',
+                (difficulty, puzzle_id))
+
+    def set_difficulties(
+            self, difficulties: Iterable[tuple[int, float]]) -> None:
+        """Set the difficulty of many puzzles from (id, difficulty) pairs
+        in one transaction."""
+        with self.connection:
+            self.connection.executemany(
+                'UPDATE puzzles SET difficulty = ? WHERE id = ?',
+                ((difficulty, puzzle_id)
+                 for puzzle_id, difficulty in difficulties))
+
+    def import_json(self, path: str | Path | None = None) -> int:
+        """Add the puzzles held in a data.json file and return how many
+        were added.
+
+        The file may hold a list of grids, or a dict with the grids under
+        'puzzles' or as its values. Anything else in it is skipped.
+        """
+        if path is None:
+            path = Path(USER_DATA_DIR, USER_DATA_FILE)
+        try:
+            with open(path, 'r', encoding='utf8') as f_json:
+                content = json.load(f_json)
+        except FileNotFoundError:
+            return 0
+        except json.decoder.JSONDecodeError:
+            logger.error('Invalid json in %s.', path)
+            return 0
+
+        if isinstance(content, dict):
+            content = content.get('puzzles', list(content.values()))
+        if not isinstance(content, list):
+            return 0
+        return self.add_many(_grids(content, path))
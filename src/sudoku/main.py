@@ -1,14 +1,34 @@
 """Main module for Sudoku."""
+import builtins
 
-from psiutils.icecream_init import ic_init
-
+from sudoku import logger
 from sudoku.root import Root
 
-ic_init()
+
+def _ic(*args):
+    """Stand in for icecream's ic() until it is first called."""
+    # icecream is slow to import, so it is only set up on first use
+    # pylint: disable=import-outside-toplevel
+    from psiutils.icecream_init import ic_init
+    ic_init()
+    ic = getattr(builtins, 'ic', _ic)
+    if ic is not _ic:
+        return ic(*args)
+    builtins.ic = _passthrough
+    return _passthrough(*args)
+
+
+def _passthrough(*args):
+    if not args:
+        return None
+    return args[0] if len(args) == 1 else args
 
 
 def main():
     """Main method for application."""
+    if not hasattr(builtins, 'ic'):
+        builtins.ic = _ic
+    logger.info('Sudoku started')
     Root()
 
 
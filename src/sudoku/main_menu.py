@@ -2,7 +2,6 @@
 
 import tkinter as tk
 from tkinter import messagebox
-import webbrowser
 
 from psiutils.menus import Menu, MenuItem
 
@@ -11,8 +10,6 @@ from sudoku._version import __version__
 from sudoku.config import config
 import sudoku.text as txt
 
-from sudoku.forms.frm_config import ConfigFrame
-
 SPACES = ' '*20
 
 
@@ -41,6 +38,8 @@ class MainMenu():
 
     def _show_config_frame(self):
         """Display the config frame."""
+        # pylint: disable=import-outside-toplevel
+        from sudoku.forms.frm_config import ConfigFrame
         dlg = ConfigFrame(self)
         self.root.wait_window(dlg.root)
 
@@ -53,6 +52,8 @@ class MainMenu():
         ]
 
     def _show_help(self):
+        # pylint: disable=import-outside-toplevel
+        import webbrowser
         webbrowser.open(HELP_URI)
 
     def _show_data_directory(self):
@@ -1,7 +1,5 @@
 """Module caller for Sudoku."""
 
-from sudoku.forms.frm_config import ConfigFrame
-
 
 class ModuleCaller():
     """
@@ -76,5 +74,7 @@ class ModuleCaller():
         Creates an instance of ConfigFrame and waits for its window to close
         before continuing.
         """
+        # pylint: disable=import-outside-toplevel
+        from sudoku.forms.frm_config import ConfigFrame
         dlg = ConfigFrame(self)
         self.root.wait_window(dlg.root)
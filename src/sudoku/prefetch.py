@@ -0,0 +1,70 @@
+"""Generate puzzles ahead of time on a background thread."""
+import queue
+import threading
+from collections.abc import Callable
+
+from sudoku.constants import PREFETCH_DEPTH
+from sudoku.grid import Grid
+
+PUT_TIMEOUT = 0.1
+
+
+class PuzzlePrefetcher():
+    """A bounded queue of ready grids kept full by a worker thread.
+
+    The worker blocks while the queue is full and carries on as soon as
+    a grid is taken, so the queue refills as it drains. get_nowait never
+    blocks, which makes it safe to call from the Tk main loop.
+    """
+    def __init__(
+            self,
+            depth: int = PREFETCH_DEPTH,
+            factory: Callable[[], Grid] = Grid) -> None:
+        self.depth = max(1, depth)
+        self.factory = factory
+        self.queue: queue.Queue = queue.Queue(maxsize=self.depth)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> 'PuzzlePrefetcher':
+        """Start filling the queue."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._fill, name='puzzle-prefetch', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = 1.0) -> None:
+        """Stop the worker and wait for it to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_nowait(self) -> Grid | None:
+        """Return a ready grid, or None if none is ready yet."""
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def drain(self) -> None:
+        """Discard the grids that are ready, e.g. after a config change."""
+        while self.get_nowait() is not None:
+            pass
+
+    @property
+    def ready(self) -> int:
+        """Return the number of grids waiting in the queue."""
+        return self.queue.qsize()
+
+    def _fill(self) -> None:
+        while not self._stop.is_set():
+            grid = self.factory()
+            while not self._stop.is_set():
+                try:
+                    self.queue.put(grid, timeout=PUT_TIMEOUT)
+                    break
+                except queue.Full:
+                    continue
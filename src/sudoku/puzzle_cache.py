@@ -0,0 +1,122 @@
+"""On-disk cache of generated puzzles, addressed by seed."""
+import contextlib
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from sudoku.constants import USER_DATA_DIR
+from sudoku.grid import GENERATOR_VERSION, Grid
+
+CACHE_DIRECTORY = 'puzzle_cache'
+MAX_BYTES = 64 * 1024 * 1024
+# Eviction trims the cache to this fraction of max_bytes
+EVICT_TO = 0.9
+
+
+def cache_key(seed: int, block_qty: int) -> str:
+    """Return the cache key of the grid generated from seed."""
+    text = f'{GENERATOR_VERSION}:{block_qty}:{seed}'
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class PuzzleCache():
+    """A size-bounded store of grids keyed by (seed, block_qty, version).
+
+    Each grid is one json file named after its key. Reads refresh the
+    file's modification time, and when the cache grows past max_bytes
+    the least recently used files are deleted.
+    """
+    def __init__(
+            self,
+            directory: str | Path | None = None,
+            max_bytes: int = MAX_BYTES) -> None:
+        if directory is None:
+            directory = Path(USER_DATA_DIR, CACHE_DIRECTORY)
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+
+    def _path(self, key: str) -> Path:
+        return Path(self.directory, key[:2], f'{key}.json')
+
+    @property
+    def size(self) -> int:
+        """Return the number of bytes held in the cache."""
+        if self._size is None:
+            self._size = sum(path.stat().st_size for path in self._files())
+        return self._size
+
+    def _files(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+        return list(self.directory.glob('*/*.json'))
+
+    def get(self, seed: int, block_qty: int) -> Grid | None:
+        """Return the cached grid or None if it is not held."""
+        path = self._path(cache_key(seed, block_qty))
+        try:
+            with open(path, 'r', encoding='utf8') as f_json:
+                data = json.load(f_json)
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            self.misses += 1
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        self.hits += 1
+        return Grid.from_dict(data)
+
+    def put(self, grid: Grid) -> None:
+        """Store a grid generated from its seed."""
+        if grid.seed is None:
+            raise ValueError('Only seeded grids can be cached')
+        path = self._path(cache_key(grid.seed, grid.block_qty))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = json.dumps(grid.to_dict(), separators=(',', ':'))
+
+        size = self.size
+        with contextlib.suppress(FileNotFoundError):
+            size -= path.stat().st_size
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf8') as f_json:
+            f_json.write(content)
+        os.replace(temp_path, path)
+        self._size = size + path.stat().st_size
+
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def get_or_create(self, seed: int, block_qty: int) -> Grid:
+        """Return the grid for seed, generating and storing it if needed."""
+        grid = self.get(seed, block_qty)
+        if grid is None:
+            grid = Grid(block_qty, seed=seed)
+            self.put(grid)
+        return grid
+
+    def clear(self) -> None:
+        """Delete every cached grid."""
+        for path in self._files():
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+        self._size = 0
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._files():
+            with contextlib.suppress(FileNotFoundError):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        size = sum(entry[1] for entry in entries)
+        target = self.max_bytes * EVICT_TO
+        for _, file_size, path in entries:
+            if size <= target:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+            size -= file_size
+        self._size = size
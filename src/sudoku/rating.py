@@ -0,0 +1,423 @@
+"""Rate how hard a puzzle is by solving it the way a person would.
+
+The solver only makes logical steps, always taking the easiest technique
+that makes progress, and the rating is the hardest technique it needed
+and the number of steps it took. A puzzle that logic alone cannot
+finish is rated as needing a guess.
+
+Generated puzzles all need much the same techniques, so a tier is also
+earned by effort: the steps beyond naked singles, per block.
+
+Blocks of an independent grid are solved frame by frame, as digit sets.
+Linked grids are solved cell by cell, where rows, columns and the sums
+of cages that cross them also apply (see sudoku.killer for the cell
+numbering).
+"""
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+from sudoku import killer
+from sudoku.cages import (
+    ALL_DIGITS, MASK_DIGITS, MASK_SIZE, cage_masks, digits_mask)
+from sudoku.grid import Block, Grid
+
+# Techniques, easiest first, with their weights
+TECHNIQUES = {
+    'clue': 0,
+    'naked_single': 1,
+    'hidden_single': 2,
+    'unique_combination': 2,
+    'cage_sum': 3,
+    'innies_outies': 4,
+    'guess': 9,
+}
+TIERS = (
+    (2, 'easy'),
+    (3, 'medium'),
+    (4, 'hard'),
+    (9, 'fiendish'),
+)
+# The most effort of an easy and of a medium puzzle, which split generated
+# puzzles roughly into thirds. The steps of a linked grid place cells
+# rather than fix frames, so it has bands of its own.
+EFFORT_BANDS = (2.0, 3.0)
+LINKED_EFFORT_BANDS = (3.1, 3.6)
+CHUNK_SIZE = 64
+
+
+class Rating():
+    """The techniques a puzzle needed and how often each was used."""
+    __slots__ = ('counts', 'solved', 'blocks', 'linked')
+
+    def __init__(self, blocks: int = 1, linked: bool = False) -> None:
+        self.counts: dict[str, int] = dict.fromkeys(TECHNIQUES, 0)
+        self.solved = True
+        self.blocks = blocks
+        self.linked = linked
+
+    def __repr__(self) -> str:
+        return (f'Rating({self.tier} hardest {self.hardest} '
+                f'steps {self.steps})')
+
+    def use(self, technique: str) -> None:
+        """Record one step taken with technique."""
+        self.counts[technique] += 1
+
+    def merge(self, other: 'Rating') -> None:
+        """Add the steps of another part of the same puzzle."""
+        for technique, count in other.counts.items():
+            self.counts[technique] += count
+        self.solved = self.solved and other.solved
+
+    @property
+    def hardest(self) -> str:
+        """Return the hardest technique used."""
+        used = [name for name, count in self.counts.items() if count]
+        return max(used, key=TECHNIQUES.__getitem__, default='clue')
+
+    @property
+    def steps(self) -> int:
+        """Return the number of steps taken, not counting clues."""
+        return sum(count for name, count in self.counts.items()
+                   if name != 'clue')
+
+    @property
+    def effort(self) -> float:
+        """Return the steps beyond naked singles taken per block."""
+        return (self.steps - self.counts['naked_single']) / self.blocks
+
+    @property
+    def score(self) -> int:
+        """Return a score that sorts by hardest technique, then steps."""
+        return TECHNIQUES[self.hardest] * 1000 + min(self.steps, 999)
+
+    @property
+    def tier(self) -> str:
+        """Return the name of the difficulty tier."""
+        weight = TECHNIQUES[self.hardest]
+        level = next(index for index, (limit, _) in enumerate(TIERS)
+                     if weight <= limit)
+        bands = LINKED_EFFORT_BANDS if self.linked else EFFORT_BANDS
+        level = max(level, sum(self.effort > band for band in bands))
+        return TIERS[level][1]
+
+    def to_dict(self) -> dict:
+        """Return the rating as a json-serialisable dict."""
+        return {
+            'score': self.score,
+            'tier': self.tier,
+            'hardest': self.hardest,
+            'steps': self.steps,
+            'solved': self.solved,
+        }
+
+
+def rate(grid: Grid) -> Rating:
+    """Return the rating of a grid."""
+    if grid.linked:
+        return _LinkedSolver(grid).solve()
+    rating = Rating(grid.block_qty)
+    for block in grid.blocks:
+        rating.merge(_BlockSolver(block).solve())
+    return rating
+
+
+def _rate_chunk(grids: list[Grid]) -> list[Rating]:
+    return [rate(grid) for grid in grids]
+
+
+def rate_many(
+        grids: Iterable[Grid],
+        workers: int | None = None,
+        chunk_size: int = CHUNK_SIZE) -> Iterator[Rating]:
+    """Yield the rating of every grid, in order.
+
+    Work is spread over a pool of worker processes (all cores when
+    workers is None); with a single worker the grids are rated in this
+    process.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for grid in grids:
+            yield rate(grid)
+        return
+
+    def chunks() -> Iterator[list[Grid]]:
+        chunk = []
+        for grid in grids:
+            chunk.append(grid)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for ratings in executor.map(_rate_chunk, chunks()):
+            yield from ratings
+
+
+class _BlockSolver():
+    """Find the digit set of every frame of an independent block."""
+    def __init__(self, block: Block) -> None:
+        self.frames = block.frames
+        self.sizes = [len(frame.digits) for frame in self.frames]
+        self.candidates = [ALL_DIGITS] * len(self.frames)
+        self.fixed = [0] * len(self.frames)
+        self.rating = Rating()
+        for index, frame in enumerate(self.frames):
+            clues = digits_mask(clue for clue in frame.suggestions if clue)
+            if clues:
+                self.rating.use('clue')
+                self._fix(index, clues)
+
+    def _fix(self, index: int, digits: int) -> None:
+        self.fixed[index] |= digits
+        for other in range(len(self.frames)):
+            if other != index:
+                self.candidates[other] &= ~digits
+
+    def _solved(self) -> bool:
+        return all(MASK_SIZE[fixed] == size
+                   for fixed, size in zip(self.fixed, self.sizes))
+
+    def solve(self) -> Rating:
+        steps = (self._naked_single, self._hidden_single,
+                 self._unique_combination, self._cage_sum)
+        while not self._solved():
+            if not any(step() for step in steps):
+                self.rating.use('guess')
+                self.rating.solved = False
+                break
+        return self.rating
+
+    def _naked_single(self) -> bool:
+        # A frame with only as many candidates as cells
+        for index, size in enumerate(self.sizes):
+            candidates = self.candidates[index]
+            if (MASK_SIZE[self.fixed[index]] < size
+                    and MASK_SIZE[candidates] == size):
+                self._fix(index, candidates)
+                self.rating.use('naked_single')
+                return True
+        return False
+
+    def _hidden_single(self) -> bool:
+        # A digit that only one frame can hold
+        placed = 0
+        for fixed in self.fixed:
+            placed |= fixed
+        for digit in MASK_DIGITS[ALL_DIGITS & ~placed]:
+            bit = 1 << (digit - 1)
+            frames = [index for index, candidates
+                      in enumerate(self.candidates) if candidates & bit]
+            if len(frames) == 1:
+                self._fix(frames[0], bit)
+                self.rating.use('hidden_single')
+                return True
+        return False
+
+    def _combinations(self, index: int) -> tuple[int, ...]:
+        return cage_masks(
+            self.frames[index].total, self.sizes[index],
+            self.candidates[index], self.fixed[index])
+
+    def _unique_combination(self) -> bool:
+        for index, size in enumerate(self.sizes):
+            if MASK_SIZE[self.fixed[index]] == size:
+                continue
+            combinations = self._combinations(index)
+            if len(combinations) == 1:
+                self.candidates[index] = combinations[0]
+                self._fix(index, combinations[0])
+                self.rating.use('unique_combination')
+                return True
+        return False
+
+    def _cage_sum(self) -> bool:
+        # Drop the digits that are in no combination of a frame
+        progress = False
+        for index, size in enumerate(self.sizes):
+            if MASK_SIZE[self.fixed[index]] == size:
+                continue
+            allowed = 0
+            for mask in self._combinations(index):
+                allowed |= mask
+            if allowed != self.candidates[index]:
+                self.candidates[index] = allowed
+                progress = True
+        if progress:
+            self.rating.use('cage_sum')
+        return progress
+
+
+# Rows, columns and boxes of a linked grid as lists of cells
+UNITS = tuple(
+    tuple(cell for cell in range(killer.SIZE) if unit_of[cell] == index)
+    for unit_of in (killer.ROW_OF, killer.COL_OF, killer.BOX_OF)
+    for index in range(9))
+PEERS = tuple(
+    frozenset(peer for unit in UNITS if cell in unit for peer in unit)
+    - {cell}
+    for cell in range(killer.SIZE))
+# Runs of one or two whole rows or columns, for innies and outies
+REGIONS = tuple(
+    frozenset(cell for cell in range(killer.SIZE)
+              if line <= unit_of[cell] < line + width)
+    for unit_of in (killer.ROW_OF, killer.COL_OF)
+    for width in (1, 2)
+    for line in range(10 - width))
+
+
+class _LinkedSolver():
+    """Find the digit in every cell of a linked grid."""
+    def __init__(self, grid: Grid) -> None:
+        self.cages = grid.cages()
+        self.cage_of = [0] * killer.SIZE
+        for index, (cells, _) in enumerate(self.cages):
+            for cell in cells:
+                self.cage_of[cell] = index
+        self.regions = self._regions()
+        self.candidates = [ALL_DIGITS] * killer.SIZE
+        self.values = [0] * killer.SIZE
+        self.rating = Rating(grid.block_qty, linked=True)
+        for cell, digit in enumerate(grid.givens()):
+            if digit:
+                self.rating.use('clue')
+                self._place(cell, digit)
+
+    def _regions(self) -> list[tuple]:
+        """Return the innies, their sum, the outies and their sum of
+        every region that cages cross."""
+        regions = []
+        for region in REGIONS:
+            inside, innies, outies, crossing = 0, [], [], 0
+            for cells, total in self.cages:
+                within = [cell for cell in cells if cell in region]
+                if len(within) == len(cells):
+                    inside += total
+                elif within:
+                    innies.extend(within)
+                    outies.extend(cell for cell in cells
+                                  if cell not in region)
+                    crossing += total
+            if innies:
+                innie_sum = 45 * len(region) // 9 - inside
+                regions.append((tuple(innies), innie_sum, tuple(outies),
+                                crossing - innie_sum))
+        return regions
+
+    def _place(self, cell: int, digit: int) -> None:
+        bit = 1 << (digit - 1)
+        self.values[cell] = digit
+        self.candidates[cell] = bit
+        for peer in PEERS[cell]:
+            self.candidates[peer] &= ~bit
+        for peer in self.cages[self.cage_of[cell]][0]:
+            if peer != cell:
+                self.candidates[peer] &= ~bit
+
+    def solve(self) -> Rating:
+        steps = (self._naked_single, self._hidden_single,
+                 self._unique_combination, self._cage_sum,
+                 self._innies_outies)
+        while not all(self.values):
+            if not any(step() for step in steps):
+                self.rating.use('guess')
+                self.rating.solved = False
+                break
+        return self.rating
+
+    def _naked_single(self) -> bool:
+        progress = False
+        for cell, value in enumerate(self.values):
+            if not value and MASK_SIZE[self.candidates[cell]] == 1:
+                self._place(cell, MASK_DIGITS[self.candidates[cell]][0])
+                self.rating.use('naked_single')
+                progress = True
+        return progress
+
+    def _hidden_single(self) -> bool:
+        progress = False
+        for unit in UNITS:
+            placed, seen, repeated = 0, 0, 0
+            for cell in unit:
+                if self.values[cell]:
+                    placed |= 1 << (self.values[cell] - 1)
+                else:
+                    repeated |= seen & self.candidates[cell]
+                    seen |= self.candidates[cell]
+            # Digits open to exactly one cell of the unit
+            for digit in MASK_DIGITS[seen & ~repeated & ~placed]:
+                bit = 1 << (digit - 1)
+                for cell in unit:
+                    if not self.values[cell] and self.candidates[cell] & bit:
+                        self._place(cell, digit)
+                        self.rating.use('hidden_single')
+                        progress = True
+                        break
+        return progress
+
+    def _cage_combinations(
+            self,
+            cells: tuple[int, ...],
+            total: int) -> tuple[int, tuple[int, ...]]:
+        """Return the digits placed in a cage and the combinations still
+        open to it."""
+        placed, open_digits = 0, 0
+        for cell in cells:
+            if self.values[cell]:
+                placed |= 1 << (self.values[cell] - 1)
+            else:
+                open_digits |= self.candidates[cell]
+        return placed, cage_masks(
+            total, len(cells), open_digits | placed, placed)
+
+    def _restrict(self, cells: tuple[int, ...], allowed: int) -> bool:
+        progress = False
+        for cell in cells:
+            if not self.values[cell] and self.candidates[cell] & ~allowed:
+                self.candidates[cell] &= allowed
+                progress = True
+        return progress
+
+    def _unique_combination(self) -> bool:
+        for cells, total in self.cages:
+            placed, combinations = self._cage_combinations(cells, total)
+            if (len(combinations) == 1
+                    and self._restrict(cells, combinations[0] & ~placed)):
+                self.rating.use('unique_combination')
+                return True
+        return False
+
+    def _cage_sum(self) -> bool:
+        progress = False
+        for cells, total in self.cages:
+            placed, combinations = self._cage_combinations(cells, total)
+            allowed = 0
+            for mask in combinations:
+                allowed |= mask
+            progress |= self._restrict(cells, allowed & ~placed)
+        if progress:
+            self.rating.use('cage_sum')
+        return progress
+
+    def _innies_outies(self) -> bool:
+        # A region's cells sum to 45 per line, so the cells of the cages
+        # that cross its edge have a known sum on each side
+        for innies, innie_sum, outies, outie_sum in self.regions:
+            for cells, cells_sum in ((innies, innie_sum),
+                                     (outies, outie_sum)):
+                unknown = [cell for cell in cells if not self.values[cell]]
+                if len(unknown) != 1:
+                    continue
+                digit = cells_sum - sum(self.values[cell] for cell in cells)
+                if 1 <= digit <= 9 and self.candidates[unknown[0]] >> (
+                        digit - 1) & 1:
+                    self._place(unknown[0], digit)
+                    self.rating.use('innies_outies')
+                    return True
+        return False
+
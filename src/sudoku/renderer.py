@@ -0,0 +1,197 @@
+"""Draw a whole sudoku grid on a single canvas.
+
+Every cell is a handful of canvas items (a rectangle, the frame total,
+the suggestion and the solution) rather than nested canvas widgets, so a
+new game only deletes and creates items, and selecting or filling in a
+cell reconfigures just the items that change.
+"""
+import tkinter as tk
+
+from sudoku.grid import Frame
+
+COLOURS = [
+    ("#AEC6CF", "#5B9BD5"),  # blue
+    ("#FFB347", "#F58220"),  # orange
+    ("#B39EB5", "#8E44AD"),  # purple
+    ("#77DD77", "#27AE60"),  # green
+    ("#FF6961", "#E74C3C"),  # red
+    ("#FDFD96", "#F1C40F"),  # yellow
+]
+
+BLOCKS_PER_ROW = 3
+CELLS_PER_ROW = 3
+MARGIN = 4
+BLOCK_GAP = 6
+OUTLINE = '#fff'
+OUTLINE_WIDTH = 2
+
+# Sizes relative to the cell side
+TOTAL_BOX = 0.3
+TOTAL_FONT = 0.15
+DIGIT_FONT = 0.35
+TOTAL_COLOUR = 'black'
+SUGGESTION_COLOUR = 'grey'
+SOLUTION_COLOUR = 'black'
+FONT_FAMILY = 'Arial'
+
+
+class Cell():
+    """One cell of the board and the canvas items that draw it."""
+    __slots__ = ('index', 'frame', 'first', 'suggestion', 'solution',
+                 'colours', 'rect', 'text')
+
+    def __init__(
+            self,
+            index: int,
+            frame: Frame,
+            suggestion: int,
+            colours: tuple,
+            first: bool = False) -> None:
+        self.index = index
+        self.frame = frame
+        self.first = first  # the frame's total is shown in this cell
+        self.suggestion = suggestion
+        self.solution = 0
+        self.colours = colours
+        self.rect = None
+        self.text = None
+
+    def __repr__(self) -> str:
+        return (f'Cell({self.index} suggestion {self.suggestion} '
+                f'solution {self.solution})')
+
+    @property
+    def background(self) -> str:
+        """Return the unselected colour."""
+        return self.colours[0]
+
+    @property
+    def selected(self) -> str:
+        """Return the selected colour."""
+        return self.colours[1]
+
+
+class GridRenderer():
+    """Draws cells on a canvas and maps clicks back to them.
+
+    Cell index b * 9 + p is position p (row-major) of block b, and blocks
+    are laid out BLOCKS_PER_ROW to a row.
+    """
+    def __init__(self, canvas: tk.Canvas) -> None:
+        self.canvas = canvas
+        self.cells: list[Cell | None] = []
+        self.block_qty = 0
+        self.size = 0
+        self.selected: Cell | None = None
+
+    def draw(self, cells: list[Cell], block_qty: int) -> None:
+        """Replace whatever is drawn with cells."""
+        self.clear()
+        self.block_qty = block_qty
+        self.cells = [None] * (block_qty * CELLS_PER_ROW ** 2)
+        for cell in cells:
+            self.cells[cell.index] = cell
+        self.redraw()
+
+    def redraw(self, *args) -> None:
+        """Draw the cells again at a size that fits the canvas."""
+        self.canvas.delete('all')
+        if not self.block_qty:
+            return
+        self.size = self._cell_size()
+        for cell in self.cells:
+            if cell is not None:
+                self._draw_cell(cell)
+
+    def clear(self) -> None:
+        """Delete every item and forget the cells."""
+        self.canvas.delete('all')
+        for cell in self.cells:
+            if cell is not None:
+                cell.rect = cell.text = None
+        self.cells = []
+        self.block_qty = 0
+        self.selected = None
+
+    def _block_shape(self) -> tuple[int, int]:
+        rows = -(-self.block_qty // BLOCKS_PER_ROW)
+        columns = min(self.block_qty, BLOCKS_PER_ROW)
+        return rows, columns
+
+    def _cell_size(self) -> int:
+        rows, columns = self._block_shape()
+        width = max(self.canvas.winfo_width(), int(self.canvas['width']))
+        height = max(self.canvas.winfo_height(), int(self.canvas['height']))
+        side_x = (width - 2 * MARGIN - (columns - 1) * BLOCK_GAP) // (
+            columns * CELLS_PER_ROW)
+        side_y = (height - 2 * MARGIN - (rows - 1) * BLOCK_GAP) // (
+            rows * CELLS_PER_ROW)
+        return max(1, min(side_x, side_y))
+
+    def _origin(self, index: int) -> tuple[int, int]:
+        block, position = divmod(index, CELLS_PER_ROW ** 2)
+        block_row, block_column = divmod(block, BLOCKS_PER_ROW)
+        row, column = divmod(position, CELLS_PER_ROW)
+        x = (MARGIN + block_column * BLOCK_GAP
+             + (block_column * CELLS_PER_ROW + column) * self.size)
+        y = (MARGIN + block_row * BLOCK_GAP
+             + (block_row * CELLS_PER_ROW + row) * self.size)
+        return x, y
+
+    def _draw_cell(self, cell: Cell) -> None:
+        canvas, size = self.canvas, self.size
+        x, y = self._origin(cell.index)
+        fill = cell.selected if cell is self.selected else cell.background
+        cell.rect = canvas.create_rectangle(
+            x, y, x + size, y + size,
+            fill=fill, outline=OUTLINE, width=OUTLINE_WIDTH)
+
+        if cell.first:
+            box = int(size * TOTAL_BOX)
+            canvas.create_rectangle(
+                x + 3, y + 3, x + 3 + box, y + 3 + box,
+                fill=cell.selected, width=0)
+            canvas.create_text(
+                x + 3 + box // 2, y + 3 + box // 2,
+                text=cell.frame.total, fill=TOTAL_COLOUR,
+                font=(FONT_FAMILY, -max(1, int(size * TOTAL_FONT))))
+
+        digit = cell.suggestion or cell.solution
+        colour = SUGGESTION_COLOUR if cell.suggestion else SOLUTION_COLOUR
+        cell.text = canvas.create_text(
+            x + size // 2, y + size // 2 + int(size * 0.05),
+            text=digit or '', fill=colour,
+            font=(FONT_FAMILY, -max(1, int(size * DIGIT_FONT))))
+
+    def cell_at(self, x: int, y: int) -> Cell | None:
+        """Return the cell under the canvas point (x, y), if any."""
+        if not self.size:
+            return None
+        rows, columns = self._block_shape()
+        block_span = CELLS_PER_ROW * self.size + BLOCK_GAP
+        block_column, offset_x = divmod(x - MARGIN, block_span)
+        block_row, offset_y = divmod(y - MARGIN, block_span)
+        if not (0 <= block_column < columns and 0 <= block_row < rows):
+            return None
+        column, row = offset_x // self.size, offset_y // self.size
+        if column >= CELLS_PER_ROW or row >= CELLS_PER_ROW:
+            return None  # in the gap between blocks
+        block = block_row * BLOCKS_PER_ROW + block_column
+        index = block * CELLS_PER_ROW ** 2 + row * CELLS_PER_ROW + column
+        if index >= len(self.cells):
+            return None
+        return self.cells[index]
+
+    def select(self, cell: Cell | None) -> None:
+        """Highlight cell, and only cell."""
+        previous, self.selected = self.selected, cell
+        if previous is not None and previous.rect is not None:
+            self.canvas.itemconfigure(previous.rect, fill=previous.background)
+        if cell is not None and cell.rect is not None:
+            self.canvas.itemconfigure(cell.rect, fill=cell.selected)
+
+    def set_solution(self, cell: Cell, solution: int) -> None:
+        """Show the digit entered in a cell (0 to blank it)."""
+        cell.solution = solution
+        if cell.text is not None:
+            self.canvas.itemconfigure(cell.text, text=solution or '')
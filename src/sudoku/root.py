@@ -9,10 +9,10 @@ import tkinter as tk
 from psiutils.widgets import get_styles
 from psiutils.utilities import display_icon
 
-from constants import ICON_FILE
-from module_caller import ModuleCaller
+from sudoku.constants import ICON_FILE
+from sudoku.module_caller import ModuleCaller
 
-from forms.frm_main import MainFrame
+from sudoku.forms.frm_main import MainFrame
 
 
 class Root():
@@ -0,0 +1,448 @@
+"""A local HTTP/JSON puzzle service, built on asyncio and the standard
+library alone.
+
+    GET  /generate?blocks=N   a new puzzle: {"grid": ...}
+    POST /check               {"grid", "values"} -> correct, complete
+    POST /hint                {"grid", "values"} -> a cell and its digit
+    POST /solve               {"grid"} -> the digit in every cell
+    GET  /stats               request counts, latencies and throughput
+
+Cells are numbered as on the board, block * 9 + position, and values
+holds the digit entered in each (0 for none). Puzzles are generated in
+a process pool and served from a buffer per block count that the pool
+keeps topped up; when a buffer is full its fillers wait, so generation
+never runs further ahead than the buffer. At most max_concurrency
+requests are handled at once and at most max_waiting more may queue for
+a slot; beyond that the service answers 503 at once rather than let the
+queue grow.
+
+Run it with:
+
+    sudoku serve --port 8080
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from sudoku import killer
+from sudoku.cages import MASK_DIGITS
+from sudoku.constants import DEFAULT_BLOCKS
+from sudoku.formats import RECORD_ERRORS, validate
+from sudoku.grid import LINKED_BLOCKS, Grid
+from sudoku.solver import solve
+from sudoku.validation import Validation
+
+logger = logging.getLogger(__name__)
+
+HOST = '127.0.0.1'
+PORT = 8080
+BUFFER_SIZE = 8
+MAX_CONCURRENCY = 64
+MAX_WAITING = 256
+MAX_BODY = 1 << 20
+LATENCY_WINDOW = 1000
+MAX_BLOCKS = LINKED_BLOCKS
+
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 413: 'Payload Too Large',
+    500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+
+class HttpError(Exception):
+    """A request that is answered with an error status."""
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def new_grid(block_qty: int) -> Grid:
+    """Return a new grid with a seed of its own (run in a worker)."""
+    return Grid(block_qty, seed=random.SystemRandom().getrandbits(64))
+
+
+def board_solution(grid: Grid) -> list[int] | None:
+    """Return the digit in every cell of the solution, or None if there
+    is none.
+
+    In a grid of independent blocks the digits of a frame may go in any
+    order, so clues keep their cells and the rest follow in order.
+    """
+    if grid.linked:
+        solutions = killer.solutions(grid.cages(), grid.givens(), 1)
+        return list(solutions[0]) if solutions else None
+    solution = solve(grid)
+    if solution is None:
+        return None
+    values = [0] * (grid.block_qty * 9)
+    frames = (frame for block in grid.blocks for frame in block.frames)
+    masks = (mask for block in solution for mask in block)
+    for (cells, _), frame, mask in zip(grid.cages(), frames, masks):
+        rest = iter(digit for digit in MASK_DIGITS[mask]
+                    if digit not in frame.suggestions)
+        for cell, clue in zip(cells, frame.suggestions):
+            values[cell] = clue or next(rest)
+    return values
+
+
+def check(grid: Grid, values: list[int]) -> dict:
+    """Return whether the digits entered break a rule and fill the grid."""
+    validation = Validation(grid.block_qty * 9)
+    frames = (frame for block in grid.blocks for frame in block.frames)
+    for (cells, _), frame in zip(grid.cages(), frames):
+        validation.add_unit(cells, frame.mask)
+        for cell, clue in zip(cells, frame.suggestions):
+            validation.set(cell, clue or values[cell])
+    if grid.linked:
+        for line in range(9):
+            validation.add_unit(
+                cell for cell in range(killer.SIZE)
+                if killer.ROW_OF[cell] == line)
+            validation.add_unit(
+                cell for cell in range(killer.SIZE)
+                if killer.COL_OF[cell] == line)
+    return {
+        'correct': validation.correct,
+        'complete': validation.complete,
+        'conflicts': validation.conflicts,
+    }
+
+
+def hint(grid: Grid, values: list[int]) -> dict | None:
+    """Return a cell that is empty or wrong and the digit it should hold,
+    or None if the grid is solved."""
+    if grid.linked:
+        solution = board_solution(grid) or []
+        givens = grid.givens()
+        for cell, digit in enumerate(solution):
+            if values[cell] != digit and not givens[cell]:
+                return {'cell': cell, 'digit': digit}
+        return None
+
+    frames = (frame for block in grid.blocks for frame in block.frames)
+    for (cells, _), frame in zip(grid.cages(), frames):
+        entered = [values[cell] for cell in cells]
+        # The digits of a frame are its solution in any order, so any
+        # digit it lacks will do
+        missing = [
+            digit for digit in frame.digits
+            if digit not in entered and digit not in frame.suggestions]
+        for cell, clue, value in zip(cells, frame.suggestions, entered):
+            if clue:
+                continue
+            if missing and (not value or value not in frame.digits
+                            or value in frame.suggestions
+                            or entered.count(value) > 1):
+                return {'cell': cell, 'digit': missing[0]}
+    return None
+
+
+class ServiceStats():
+    """Request counts and a window of recent latencies per endpoint."""
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self.started = time.monotonic()
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.rejected = 0
+        self._latencies: dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=window))
+
+    def record(self, endpoint: str, seconds: float, status: int) -> None:
+        """Count a request that took seconds to answer."""
+        self.requests[endpoint] += 1
+        if status >= 400:
+            self.errors[endpoint] += 1
+        self._latencies[endpoint].append(seconds)
+
+    def to_dict(self) -> dict:
+        """Return the stats as a json-serialisable dict."""
+        uptime = time.monotonic() - self.started
+        total = sum(self.requests.values())
+        endpoints = {}
+        for endpoint, count in self.requests.items():
+            latencies = sorted(self._latencies[endpoint])
+            endpoints[endpoint] = {
+                'requests': count,
+                'errors': self.errors[endpoint],
+                'mean_ms': 1000 * sum(latencies) / len(latencies),
+                'p50_ms': 1000 * latencies[len(latencies) // 2],
+                'p95_ms': 1000 * latencies[int(len(latencies) * 0.95)],
+                'max_ms': 1000 * latencies[-1],
+            }
+        return {
+            'uptime': uptime,
+            'requests': total,
+            'per_second': total / uptime if uptime else 0.0,
+            'rejected': self.rejected,
+            'endpoints': endpoints,
+        }
+
+
+class PuzzleService():
+    """The HTTP service, with its worker pool and puzzle buffers.
+
+    Use as an async context manager, or call start and then close.
+    """
+    def __init__(
+            self,
+            workers: int | None = None,
+            buffer_size: int = BUFFER_SIZE,
+            max_concurrency: int = MAX_CONCURRENCY,
+            max_waiting: int = MAX_WAITING,
+            block_qty: int = DEFAULT_BLOCKS) -> None:
+        self.workers = workers
+        self.buffer_size = max(1, buffer_size)
+        self.max_waiting = max_waiting
+        self.block_qty = block_qty
+        self.stats = ServiceStats()
+        self.buffers: dict[int, asyncio.Queue] = {}
+        self.server: asyncio.Server | None = None
+        self._slots = asyncio.Semaphore(max(1, max_concurrency))
+        self._waiting = 0
+        self._pool: ProcessPoolExecutor | None = None
+        self._fillers: list[asyncio.Task] = []
+
+    async def __aenter__(self) -> 'PuzzleService':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    @property
+    def port(self) -> int:
+        """Return the port the service is listening on."""
+        return self.server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = HOST, port: int = PORT) -> None:
+        """Start the pool, begin filling the default buffer and listen."""
+        self.workers = self.workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._buffer(self.block_qty)
+        self.server = await asyncio.start_server(self._connection, host, port)
+
+    async def close(self) -> None:
+        """Stop listening and filling, and shut the pool down."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in self._fillers:
+            task.cancel()
+        await asyncio.gather(*self._fillers, return_exceptions=True)
+        self._fillers = []
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _buffer(self, block_qty: int) -> asyncio.Queue:
+        """Return the buffer of grids of block_qty blocks, starting its
+        fillers on first use."""
+        if block_qty not in self.buffers:
+            self.buffers[block_qty] = asyncio.Queue(maxsize=self.buffer_size)
+            fillers = min(self.buffer_size, self.workers)
+            self._fillers.extend(
+                asyncio.create_task(self._fill(block_qty))
+                for _ in range(fillers))
+        return self.buffers[block_qty]
+
+    async def _fill(self, block_qty: int) -> None:
+        loop = asyncio.get_running_loop()
+        buffer = self.buffers[block_qty]
+        while True:
+            try:
+                grid = await loop.run_in_executor(
+                    self._pool, new_grid, block_qty)
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception('Generating a grid of %d blocks failed',
+                                 block_qty)
+                await asyncio.sleep(1)
+                continue
+            await buffer.put(grid)
+
+    async def _connection(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, body, keep_alive = request
+                status, payload = await self._respond(method, target, body)
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HttpError as error:
+            self._write_response(
+                writer, error.status, {'error': str(error)}, False)
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(
+            reader: asyncio.StreamReader) -> tuple | None:
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError as error:
+            raise HttpError(400, 'Malformed request line') from error
+
+        headers = {}
+        while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError as error:
+            raise HttpError(400, 'Malformed Content-Length') from error
+        if not 0 <= length <= MAX_BODY:
+            raise HttpError(413, 'Request body too large')
+        body = await reader.readexactly(length) if length else b''
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' and (
+            version == 'HTTP/1.1' or connection == 'keep-alive')
+        return method, target, body, keep_alive
+
+    @staticmethod
+    def _write_response(
+            writer: asyncio.StreamWriter,
+            status: int,
+            payload: dict,
+            keep_alive: bool) -> None:
+        content = json.dumps(payload, separators=(',', ':')).encode()
+        head = (
+            f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+            'Content-Type: application/json\r\n'
+            f'Content-Length: {len(content)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n')
+        if status == 503:
+            head += 'Retry-After: 1\r\n'
+        writer.write(head.encode('latin-1') + b'\r\n' + content)
+
+    async def _respond(
+            self, method: str, target: str, body: bytes) -> tuple[int, dict]:
+        start = time.perf_counter()
+        url = urlsplit(target)
+        endpoint = url.path.strip('/')
+        if self._slots.locked() and self._waiting >= self.max_waiting:
+            self.stats.rejected += 1
+            return 503, {'error': 'Busy, try again'}
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            payload = await self._route(
+                method, endpoint, parse_qs(url.query), body)
+            status = 200
+        except HttpError as error:
+            status, payload = error.status, {'error': str(error)}
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception('Answering %s %s failed', method, target)
+            status, payload = 500, {'error': 'Internal error'}
+        finally:
+            self._slots.release()
+        if endpoint in ROUTES:
+            self.stats.record(endpoint, time.perf_counter() - start, status)
+        return status, payload
+
+    async def _route(
+            self, method: str, endpoint: str, query: dict,
+            body: bytes) -> dict:
+        if endpoint not in ROUTES:
+            raise HttpError(404, f'No endpoint /{endpoint}')
+        if method != ROUTES[endpoint]:
+            raise HttpError(405, f'Use {ROUTES[endpoint]} for /{endpoint}')
+
+        if endpoint == 'generate':
+            return await self._generate(query)
+        if endpoint == 'stats':
+            return self._stats()
+
+        grid, values = _parse_puzzle(body)
+        if endpoint == 'check':
+            return check(grid, values)
+        loop = asyncio.get_running_loop()
+        if endpoint == 'hint':
+            return {'hint': await loop.run_in_executor(
+                self._pool, hint, grid, values)}
+        solution = await loop.run_in_executor(self._pool, board_solution, grid)
+        return {'solution': solution}
+
+    async def _generate(self, query: dict) -> dict:
+        try:
+            block_qty = int(query.get('blocks', [self.block_qty])[0])
+        except ValueError as error:
+            raise HttpError(400, 'blocks must be a number') from error
+        if not 1 <= block_qty <= MAX_BLOCKS:
+            raise HttpError(400, f'blocks must be 1 to {MAX_BLOCKS}')
+        grid = await self._buffer(block_qty).get()
+        return {'grid': grid.to_dict()}
+
+    def _stats(self) -> dict:
+        stats = self.stats.to_dict()
+        stats['buffers'] = {
+            str(block_qty): buffer.qsize()
+            for block_qty, buffer in sorted(self.buffers.items())}
+        stats['waiting'] = self._waiting
+        return stats
+
+
+ROUTES = {
+    'generate': 'GET',
+    'check': 'POST',
+    'hint': 'POST',
+    'solve': 'POST',
+    'stats': 'GET',
+}
+
+
+def _parse_puzzle(body: bytes) -> tuple[Grid, list[int]]:
+    """Return the grid and values in a request body."""
+    try:
+        data = json.loads(body)
+        grid = Grid.from_dict(data['grid'])
+    except RECORD_ERRORS as error:
+        raise HttpError(400, 'Body must hold a grid') from error
+    if not 1 <= grid.block_qty <= MAX_BLOCKS:
+        raise HttpError(400, f'A grid has 1 to {MAX_BLOCKS} blocks')
+    try:
+        validate(grid)
+    except RECORD_ERRORS as error:
+        raise HttpError(400, f'Not a valid grid: {error}') from error
+
+    size = grid.block_qty * 9
+    values = data.get('values', [0] * size)
+    if (not isinstance(values, list) or len(values) != size
+            or not all(isinstance(value, int) and 0 <= value <= 9
+                       for value in values)):
+        raise HttpError(400, f'values must be {size} digits from 0 to 9')
+    return grid, values
+
+
+async def serve(
+        host: str = HOST,
+        port: int = PORT,
+        **kwargs) -> None:
+    """Run a service until cancelled."""
+    async with PuzzleService(**kwargs) as service:
+        await service.start(host, port)
+        logger.info('Serving on http://%s:%d', host, service.port)
+        await service.server.serve_forever()
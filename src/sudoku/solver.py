@@ -0,0 +1,131 @@
+"""Count and find the solutions of a puzzle.
+
+Solving a block is an exact cover problem: every frame must take one of
+the digit sets its total allows (see sudoku.cages), containing its
+clues, and together the sets must use each digit 1-9 exactly once.
+The search always branches on the frame with the fewest sets left, as
+in Algorithm X, with the digits held as 9-bit masks.
+
+The blocks of a grid are independent, so a grid's solution count is the
+product of its blocks' counts. Linked grids are solved cell by cell
+instead (see sudoku.killer).
+"""
+from sudoku import killer
+from sudoku.cages import ALL_DIGITS, cage_masks, digits_mask
+from sudoku.grid import Block, Grid
+
+
+def frame_options(block: Block) -> list[tuple[int, ...]]:
+    """Return the digit masks each frame in the block could take."""
+    return [
+        cage_masks(
+            frame.total,
+            len(frame.digits),
+            ALL_DIGITS,
+            digits_mask(clue for clue in frame.suggestions if clue))
+        for frame in block.frames
+    ]
+
+
+def _search(
+        options: list[tuple[int, ...]],
+        remaining: tuple[int, ...],
+        used: int,
+        assignment: list[int],
+        solutions: list[tuple[int, ...]],
+        limit: int) -> None:
+    if not remaining:
+        solutions.append(tuple(assignment))
+        return
+
+    best, best_masks = -1, None
+    for index in remaining:
+        masks = [mask for mask in options[index] if not mask & used]
+        if not masks:
+            return
+        if best_masks is None or len(masks) < len(best_masks):
+            best, best_masks = index, masks
+            if len(masks) == 1:
+                break
+
+    rest = tuple(index for index in remaining if index != best)
+    for mask in best_masks:
+        assignment[best] = mask
+        _search(options, rest, used | mask, assignment, solutions, limit)
+        if len(solutions) >= limit:
+            return
+
+
+def block_solutions(block: Block, limit: int = 2) -> list[tuple[int, ...]]:
+    """Return up to limit solutions of a block.
+
+    Each solution is a tuple with the digit mask of every frame.
+    """
+    return _solutions(frame_options(block), limit)
+
+
+def cage_solutions(
+        cages: list[tuple[int, int, int]],
+        limit: int = 2) -> list[tuple[int, ...]]:
+    """Return up to limit solutions of a block given only as the total,
+    size and clue mask of every frame, as block_solutions does."""
+    return _solutions(
+        [cage_masks(total, size, ALL_DIGITS, clues)
+         for total, size, clues in cages], limit)
+
+
+def _solutions(
+        options: list[tuple[int, ...]],
+        limit: int) -> list[tuple[int, ...]]:
+    solutions = []
+    _search(options, tuple(range(len(options))), 0,
+            [0] * len(options), solutions, limit)
+    return solutions
+
+
+def _blocks(puzzle: Grid | Block) -> tuple[Block, ...]:
+    if isinstance(puzzle, Block):
+        return (puzzle,)
+    return puzzle.blocks
+
+
+def count_solutions(puzzle: Grid | Block, limit: int = 2) -> int:
+    """Return the number of solutions of a grid or block, up to limit."""
+    if isinstance(puzzle, Grid) and puzzle.linked:
+        return len(killer.solutions(puzzle.cages(), puzzle.givens(), limit))
+    count = 1
+    for block in _blocks(puzzle):
+        count = min(limit, count * len(block_solutions(block, limit)))
+        if not count:
+            break
+    return count
+
+
+def is_unique(puzzle: Grid | Block) -> bool:
+    """Return True if the grid or block has exactly one solution."""
+    return count_solutions(puzzle, 2) == 1
+
+
+def solve(puzzle: Grid | Block) -> tuple[tuple[int, ...], ...] | None:
+    """Return a solution of every block, or None if there is none."""
+    if isinstance(puzzle, Grid) and puzzle.linked:
+        return _solve_linked(puzzle)
+    solution = []
+    for block in _blocks(puzzle):
+        solutions = block_solutions(block, 1)
+        if not solutions:
+            return None
+        solution.append(solutions[0])
+    return tuple(solution)
+
+
+def _solve_linked(grid: Grid) -> tuple[tuple[int, ...], ...] | None:
+    cages = grid.cages()
+    solutions = killer.solutions(cages, grid.givens(), 1)
+    if not solutions:
+        return None
+    masks = iter(
+        digits_mask(solutions[0][cell] for cell in cells)
+        for cells, _ in cages)
+    return tuple(
+        tuple(next(masks) for _ in block.frames) for block in grid.blocks)
@@ -0,0 +1,84 @@
+"""Running correct/complete state of a board being filled in.
+
+A board is a number of cells, grouped into units (cages, and later rows
+and columns) that may each hold a digit only once and only from the
+digits the unit allows. Every entry updates the digit counts of the
+units it belongs to, so correct and complete are always known without
+scanning the board.
+"""
+from collections.abc import Iterable
+
+from sudoku.cages import ALL_DIGITS
+
+
+class Validation():
+    """Counts of the digits entered in each unit and the conflicts they
+    cause.
+
+    A digit is a conflict once for each time it appears in a unit that
+    does not allow it, and once for each repeat in a unit that does.
+    """
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.values = [0] * size
+        self.filled = 0
+        self.conflicts = 0
+        self._cell_units: list[list[int]] = [[] for _ in range(size)]
+        self._allowed: list[int] = []
+        self._counts: list[list[int]] = []
+        self._masks: list[int] = []
+
+    def add_unit(self, cells: Iterable[int], allowed: int = ALL_DIGITS) -> int:
+        """Add a unit over cells that may hold the digits in the mask
+        allowed, and return its index."""
+        unit = len(self._allowed)
+        self._allowed.append(allowed)
+        self._counts.append([0] * 10)
+        self._masks.append(0)
+        for cell in cells:
+            self._cell_units[cell].append(unit)
+            if self.values[cell]:
+                self._add(unit, self.values[cell], 1)
+        return unit
+
+    def set(self, cell: int, digit: int) -> None:
+        """Enter digit in cell (0 to clear it)."""
+        previous = self.values[cell]
+        if previous == digit:
+            return
+        self.values[cell] = digit
+        self.filled += bool(digit) - bool(previous)
+        for unit in self._cell_units[cell]:
+            if previous:
+                self._add(unit, previous, -1)
+            if digit:
+                self._add(unit, digit, 1)
+
+    def _add(self, unit: int, digit: int, step: int) -> None:
+        counts = self._counts[unit]
+        before = counts[digit]
+        counts[digit] = before + step
+        if not counts[digit]:
+            self._masks[unit] &= ~(1 << (digit - 1))
+        elif not before:
+            self._masks[unit] |= 1 << (digit - 1)
+        if not self._allowed[unit] >> (digit - 1) & 1:
+            self.conflicts += step
+        elif step > 0 and before:
+            self.conflicts += 1
+        elif step < 0 and before > 1:
+            self.conflicts -= 1
+
+    def unit_mask(self, unit: int) -> int:
+        """Return the mask of the digits entered in unit."""
+        return self._masks[unit]
+
+    @property
+    def correct(self) -> bool:
+        """Return True if nothing entered so far is wrong."""
+        return not self.conflicts
+
+    @property
+    def complete(self) -> bool:
+        """Return True if every cell has a digit."""
+        return self.filled == self.size
@@ -0,0 +1,161 @@
+"""Generate blocks in bulk with NumPy.
+
+This path needs numpy, an optional dependency (pip install sudoku[fast]).
+Every step works on whole arrays of blocks: shapes and digit
+permutations are sampled in one call each, frame masks and totals come
+from bit operations and table lookups, and the first smallest clue set
+of every frame is found at once from lookup arrays. The result is a
+structured array, and Block objects are only built for the rows that
+are read.
+
+Blocks are laid out as in sudoku.archive: the digits run through the
+frames in order and a clue is shown in its own cell. They come from
+NumPy's generator, so a seed does not give the blocks Grid would.
+"""
+from collections.abc import Iterator
+from functools import lru_cache
+
+import numpy as np
+
+from sudoku.cages import ALL_DIGITS, MASK_SIZE, MASK_TOTAL, MAX_TOTAL
+from sudoku.clues import clue_subsets
+from sudoku.grid import FRAMES, SHAPES, Block, Frame, Grid
+
+MAX_FRAMES = max(len(shape) for shape in SHAPES)
+MAX_SUBSETS = 2 ** max(max(shape) for shape in SHAPES)
+
+BLOCK_DTYPE = np.dtype([
+    ('shape', np.uint8),
+    ('digits', np.uint8, (9,)),
+    ('masks', np.uint16, (MAX_FRAMES,)),
+    ('totals', np.uint8, (MAX_FRAMES,)),
+    ('clues', np.uint16),
+    ('clue_count', np.uint8),
+])
+
+TOTALS = np.array(MASK_TOTAL, dtype=np.int16)
+SIZES = np.array(MASK_SIZE, dtype=np.int8)
+# The frame (or -1) of each of the nine cells, per shape
+SEGMENTS = np.array([
+    [frame for frame, size in enumerate(shape) for _ in range(size)]
+    for shape in SHAPES], dtype=np.int8)
+# As in Grid._get_block: a number of frames, then one of its shapes
+SHAPE_WEIGHTS = np.array([
+    1 / len(FRAMES) / len(FRAMES[len(shape)]) for shape in SHAPES])
+
+
+@lru_cache(maxsize=None)
+def combination_counts() -> np.ndarray:
+    """Return the number of digit sets with each (total, size) that only
+    use the digits of a mask, indexed [total, size, mask]."""
+    counts = np.zeros((MAX_TOTAL + 1, 10, ALL_DIGITS + 1), dtype=np.uint8)
+    masks = np.arange(ALL_DIGITS + 1)
+    for subset in range(ALL_DIGITS + 1):
+        # Every mask that holds the subset
+        holders = masks[masks & subset == subset]
+        counts[MASK_TOTAL[subset], MASK_SIZE[subset], holders] += 1
+    return counts
+
+
+@lru_cache(maxsize=None)
+def subset_table() -> np.ndarray:
+    """Return the subsets of every mask in clue search order, padded with
+    -1, indexed [mask, n]."""
+    table = np.full((ALL_DIGITS + 1, MAX_SUBSETS), -1, dtype=np.int16)
+    for mask in range(1, ALL_DIGITS + 1):
+        if MASK_SIZE[mask] <= max(max(shape) for shape in SHAPES):
+            subsets = clue_subsets(mask)
+            table[mask, :len(subsets)] = subsets
+    return table
+
+
+def minimum_clues(masks: np.ndarray, available: np.ndarray) -> np.ndarray:
+    """Return the first smallest clue mask of every frame, as
+    sudoku.clues.minimum_clues does one at a time."""
+    masks = masks.astype(np.int16)
+    candidates = subset_table()[masks]
+    valid = candidates >= 0
+    clues = np.where(valid, candidates, 0)
+    # The clues leave (total, size) to be made from what they do not use
+    counts = combination_counts()[
+        (TOTALS[masks][:, None] - TOTALS[clues]),
+        (SIZES[masks][:, None] - SIZES[clues]),
+        available.astype(np.int16)[:, None] & ~clues]
+    first = np.argmax(valid & (counts == 1), axis=1)
+    return candidates[np.arange(len(masks)), first].astype(np.uint16)
+
+
+def generate_blocks(
+        count: int,
+        seed: int | None = None) -> 'BlockArray':
+    """Return count new blocks."""
+    rng = np.random.default_rng(seed)
+    data = np.zeros(count, dtype=BLOCK_DTYPE)
+    shapes = rng.choice(len(SHAPES), size=count, p=SHAPE_WEIGHTS)
+    digits = rng.permuted(
+        np.tile(np.arange(1, 10, dtype=np.uint8), (count, 1)), axis=1)
+    data['shape'] = shapes
+    data['digits'] = digits
+
+    bits = np.left_shift(1, digits.astype(np.uint16) - 1).astype(np.uint16)
+    segments = SEGMENTS[shapes]
+    used = np.zeros(count, dtype=np.uint16)
+    clues = np.zeros(count, dtype=np.uint16)
+    for frame in range(MAX_FRAMES):
+        in_frame = segments == frame
+        masks = np.bitwise_or.reduce(
+            np.where(in_frame, bits, 0), axis=1).astype(np.uint16)
+        data['masks'][:, frame] = masks
+        data['totals'][:, frame] = TOTALS[masks]
+
+        # Clues for the frames that exist, shown where their digits are
+        present = masks > 0
+        frame_clues = np.zeros(count, dtype=np.uint16)
+        frame_clues[present] = minimum_clues(
+            masks[present], ALL_DIGITS & ~used[present])
+        shown = in_frame & (bits & frame_clues[:, None] > 0)
+        clues |= np.bitwise_or.reduce(
+            np.where(shown, np.left_shift(1, np.arange(9)), 0),
+            axis=1).astype(np.uint16)
+        used |= masks
+
+    data['clues'] = clues
+    data['clue_count'] = SIZES[clues]
+    return BlockArray(data)
+
+
+class BlockArray():
+    """Blocks held as rows of a structured array (see BLOCK_DTYPE)."""
+    def __init__(self, data: np.ndarray) -> None:
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> Block:
+        return self.block(self.data[index])
+
+    def __iter__(self) -> Iterator[Block]:
+        for row in self.data:
+            yield self.block(row)
+
+    @staticmethod
+    def block(row: np.void) -> Block:
+        """Return the Block held in a row."""
+        digits = [int(digit) for digit in row['digits']]
+        clues = int(row['clues'])
+        frames, start = [], 0
+        for index, size in enumerate(SHAPES[row['shape']]):
+            frame = Frame(tuple(digits[start:start + size]), index)
+            frame.suggestions = tuple(
+                digit if clues >> (start + cell) & 1 else 0
+                for cell, digit in enumerate(frame.digits))
+            frames.append(frame)
+            start += size
+        return Block(frames)
+
+    def grids(self, block_qty: int = 1) -> Iterator[Grid]:
+        """Yield independent grids of block_qty blocks from the rows."""
+        for start in range(0, len(self.data) - block_qty + 1, block_qty):
+            yield Grid.from_blocks(tuple(
+                self[index] for index in range(start, start + block_qty)))
@@ -0,0 +1,26 @@
+class FakeCanvas():
+    """Records canvas items instead of drawing them."""
+    def __init__(self, size: int = 300) -> None:
+        self.size = size
+        self.items = {}
+
+    def __getitem__(self, key):
+        return self.size
+
+    def winfo_width(self) -> int:
+        return self.size
+
+    def winfo_height(self) -> int:
+        return self.size
+
+    def _create(self, *args, **kwargs) -> int:
+        self.items[len(self.items) + 1] = kwargs
+        return len(self.items)
+
+    create_rectangle = create_text = _create
+
+    def itemconfigure(self, item: int, **kwargs) -> None:
+        self.items[item].update(kwargs)
+
+    def delete(self, *args) -> None:
+        self.items = {}
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from sudoku.archive import (
+    PuzzleArchive, decode_block, encode_block, write_archive)
+from sudoku.grid import Grid
+
+
+def _frames(grid: Grid) -> list[tuple]:
+    return [(frame.mask, frame.total, sorted(frame.suggestions))
+            for block in grid.blocks for frame in block.frames]
+
+
+def test_block_round_trip() -> None:
+    for seed in range(200):
+        block = Grid(1, seed=seed).blocks[0]
+        value = encode_block(block)
+        assert value < 2 ** 32
+        decoded = decode_block(value)
+        assert [frame.mask for frame in decoded] == [
+            frame.mask for frame in block]
+        for frame in decoded:
+            assert all(clue in (0, digit) for clue, digit in zip(
+                frame.suggestions, frame.digits))
+        assert encode_block(decoded) == value
+
+
+def test_grid_round_trip() -> None:
+    grid = Grid(3, seed=8)
+    data = grid.encode()
+    assert len(data) == 12
+    assert _frames(Grid.decode(data)) == _frames(grid)
+
+    linked = Grid(9, seed=8)
+    decoded = Grid.decode(linked.encode())
+    assert decoded.linked
+    assert decoded.givens() == linked.givens()
+    assert decoded.cages() == linked.cages()
+
+
+def test_bad_block() -> None:
+    with pytest.raises(ValueError):
+        decode_block(0xF0000000)
+
+
+def test_archive(tmp_path) -> None:
+    path = tmp_path / 'puzzles.sdka'
+    grids = [Grid(2, seed=seed) for seed in range(50)]
+    assert write_archive(path, grids, 2) == 50
+    assert path.stat().st_size == 32 + 50 * 8
+
+    with PuzzleArchive(path) as archive:
+        assert len(archive) == 50
+        assert _frames(archive[17]) == _frames(grids[17])
+        assert _frames(archive[-1]) == _frames(grids[-1])
+        assert archive.random(random.Random(1)).block_qty == 2
+        with pytest.raises(IndexError):
+            archive[50]
+
+    with pytest.raises(ValueError):
+        write_archive(path, [Grid(1, seed=1)], 2)
+    path.write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        PuzzleArchive(path)
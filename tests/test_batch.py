@@ -0,0 +1,23 @@
+from sudoku.batch import generate_many, puzzle_seed
+from sudoku.grid import Grid
+
+
+def test_generate_many_in_process() -> None:
+    results = list(generate_many(5, block_qty=2, seed=3, workers=1))
+    assert [index for index, _ in results] == list(range(5))
+    for index, grid in results:
+        assert grid.block_qty == 2
+        assert grid.seed == puzzle_seed(3, index)
+
+
+def test_generate_many_workers_match() -> None:
+    serial = dict(generate_many(10, block_qty=1, seed=11, workers=1))
+    parallel = dict(generate_many(
+        10, block_qty=1, seed=11, workers=2, chunk_size=3))
+    assert sorted(parallel) == list(range(10))
+    for index, grid in serial.items():
+        assert repr(parallel[index].blocks) == repr(grid.blocks)
+
+
+def test_seeded_grid_repeats() -> None:
+    assert repr(Grid(1, seed=42).blocks) == repr(Grid(1, seed=42).blocks)
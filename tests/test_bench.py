@@ -0,0 +1,24 @@
+import importlib.util
+from pathlib import Path
+
+BENCH_PATH = Path(Path(__file__).parent.parent, 'benchmarks', 'bench.py')
+
+
+def _bench():
+    spec = importlib.util.spec_from_file_location('bench', BENCH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_cases_run() -> None:
+    bench = _bench()
+    for factory in bench.CASES.values():
+        factory()()
+
+
+def test_baseline_covers_cases() -> None:
+    bench = _bench()
+    assert bench.BASELINE_PATH.is_file()
+    baseline = bench.json.loads(bench.BASELINE_PATH.read_text())
+    assert set(baseline) == set(bench.CASES)
@@ -0,0 +1,34 @@
+from itertools import combinations
+
+from sudoku.cages import (
+    cage_combinations, cage_masks, digits_mask, is_unique, mask_digits)
+
+
+def _brute_force(total, size, allowed, forced):
+    return tuple(
+        possible for possible in combinations(allowed, size)
+        if sum(possible) == total and all(v in possible for v in forced))
+
+
+def test_matches_brute_force() -> None:
+    allowed = [1, 2, 4, 5, 7, 8, 9]
+    for forced in ([], [4], [2, 9]):
+        for size in range(1, 6):
+            for total in range(1, 46):
+                expected = _brute_force(total, size, allowed, forced)
+                assert cage_combinations(
+                    total, size,
+                    digits_mask(allowed),
+                    digits_mask(forced)) == expected
+
+
+def test_masks() -> None:
+    assert digits_mask([1, 9]) == 0b100000001
+    assert mask_digits(0b100000001) == (1, 9)
+    assert cage_masks(3, 2) == (0b11,)
+
+
+def test_unique() -> None:
+    assert is_unique(17, 2)
+    assert not is_unique(10, 2)
+    assert is_unique(10, 2, forced=digits_mask([3]))
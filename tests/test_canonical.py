@@ -0,0 +1,77 @@
+import json
+
+from sudoku.canonical import (
+    BloomFilter, ExactFilter, canonical_block, fingerprint, seen_filter,
+    unique)
+from sudoku.cli import main
+from sudoku.grid import Block, Frame, Grid
+
+
+def _shuffled(block: Block) -> Block:
+    frames = []
+    for index, frame in enumerate(reversed(block.frames)):
+        copy = Frame(tuple(reversed(frame.digits)), index)
+        copy.suggestions = tuple(reversed(frame.suggestions))
+        frames.append(copy)
+    return Block(frames)
+
+
+def test_fingerprint_ignores_order() -> None:
+    grid = Grid(3, seed=4)
+    shuffled = Grid.from_blocks(tuple(
+        _shuffled(block) for block in grid.blocks))
+    assert canonical_block(shuffled.blocks[0]) == canonical_block(
+        grid.blocks[0])
+    assert fingerprint(shuffled) == fingerprint(grid)
+    assert fingerprint(grid.blocks[1]) == fingerprint(shuffled.blocks[1])
+    assert len(fingerprint(grid)) == 16
+
+
+def test_fingerprint_tells_puzzles_apart() -> None:
+    grid = Grid(2, seed=4)
+    assert fingerprint(grid) != fingerprint(Grid(2, seed=5))
+
+    # The same cages with a clue taken away
+    block = grid.blocks[0]
+    frame = next(frame for frame in block.frames if any(frame.suggestions))
+    copy = Frame(frame.digits, frame.id)
+    copy.suggestions = (0,) * len(frame.digits)
+    changed = Block(copy if item is frame else item for item in block.frames)
+    assert fingerprint(changed) != fingerprint(block)
+
+    linked = Grid(9, seed=1)
+    assert fingerprint(Grid.from_dict(linked.to_dict())) == fingerprint(
+        linked)
+    assert fingerprint(linked) != fingerprint(Grid(9, seed=2))
+
+
+def test_filters() -> None:
+    keys = [fingerprint(Grid(1, seed=seed)) for seed in range(300)]
+    bloom = BloomFilter(300)
+    exact = ExactFilter()
+    for key in keys:
+        bloom.add(key)
+        exact.add(key)
+    assert all(key in bloom for key in keys)
+    assert all(key in exact for key in keys)
+    assert not exact.add(keys[0])
+    assert not bloom.add(keys[0])
+    assert isinstance(seen_filter(10), ExactFilter)
+    assert isinstance(seen_filter(10 ** 7), BloomFilter)
+
+
+def test_unique_drops_repeats() -> None:
+    grids = [Grid(2, seed=seed) for seed in (1, 2, 1, 3, 2)]
+    assert [grid.seed for grid in unique(grids)] == [1, 2, 3]
+    assert len(list(unique(grids, seen=BloomFilter(5)))) == 3
+
+
+def test_generate_unique(tmp_path) -> None:
+    output = tmp_path / 'puzzles.jsonl'
+    status = main([
+        'generate', '--count', '20', '--blocks', '1', '--seed', '5',
+        '--jobs', '1', '--unique', '--output', str(output)])
+    assert status == 0
+    grids = [Grid.from_dict(json.loads(line))
+             for line in output.read_text().splitlines()]
+    assert len({fingerprint(grid) for grid in grids}) == len(grids)
@@ -0,0 +1,42 @@
+import math
+
+from sudoku.catalogue import Catalogue, build, load
+from sudoku.grid import SHAPES, Grid
+from sudoku.solver import is_unique
+
+
+def test_holds_every_block() -> None:
+    catalogue = load()
+    assert len(catalogue) == 42840
+    start = 0
+    for shape, (first, count) in zip(SHAPES, catalogue.ranges):
+        assert first == start
+        assert count == math.factorial(9) // math.prod(
+            math.factorial(size) for size in shape)
+        start += count
+
+
+def test_entries_match_their_shape() -> None:
+    catalogue = load()
+    for shape_index, (first, count) in enumerate(catalogue.ranges):
+        for index in range(first, first + count, 97):
+            masks = catalogue.masks(index)
+            assert tuple(mask.bit_count() for mask in masks) == (
+                SHAPES[shape_index])
+            assert catalogue.layouts[index] >> 28 == shape_index
+
+
+def test_round_trip() -> None:
+    shapes = SHAPES[:2]
+    catalogue = build(shapes)
+    copy = Catalogue.from_bytes(catalogue.to_bytes(), len(shapes))
+    assert copy.layouts == catalogue.layouts
+    assert copy.clues == catalogue.clues
+    assert copy.scores == catalogue.scores
+    assert copy.ranges == catalogue.ranges
+
+
+def test_sampled_grids_are_unique() -> None:
+    for seed in range(20):
+        grid = Grid(4, seed=seed)
+        assert is_unique(grid)
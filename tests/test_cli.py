@@ -0,0 +1,36 @@
+import json
+import os
+import subprocess
+import sys
+
+from sudoku.cli import main
+
+
+def test_generate_jsonl(tmp_path, capsys) -> None:
+    output = tmp_path / 'puzzles.jsonl'
+    status = main([
+        'generate', '--count', '4', '--blocks', '2', '--seed', '5',
+        '--jobs', '1', '--verify', '--output', str(output)])
+    assert status == 0
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record['index'] for record in records] == [0, 1, 2, 3]
+    assert all(len(record['blocks']) == 2 for record in records)
+    assert '4 puzzles in' in capsys.readouterr().err
+
+
+def test_generate_has_no_gui_imports() -> None:
+    code = (
+        'import sys\n'
+        'from sudoku.cli import main\n'
+        'main(["generate", "--count", "2", "--seed", "1", "--jobs", "1"])\n'
+        'gui = [name for name in sys.modules\n'
+        '       if name.startswith(("psiutils", "sudoku.forms", "sudoku.root"))]\n'
+        'assert not gui, gui\n'
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True, text=True, env=env, check=False)
+    assert result.returncode == 0, result.stderr
+    assert len(result.stdout.splitlines()) == 2
@@ -0,0 +1,32 @@
+from sudoku.cages import ALL_DIGITS, digits_mask
+from sudoku.clues import (
+    clue_subsets, is_sufficient, minimal_clue_sets, minimum_clues)
+
+
+def test_clue_subsets_order() -> None:
+    cage = digits_mask([2, 5, 7])
+    assert clue_subsets(cage)[:4] == (
+        0, digits_mask([2]), digits_mask([5]), digits_mask([7]))
+    assert clue_subsets(cage)[-1] == cage
+
+
+def test_unique_cage_needs_no_clues() -> None:
+    cage = digits_mask([8, 9])
+    assert minimum_clues(cage, ALL_DIGITS) == 0
+    assert minimal_clue_sets(cage, ALL_DIGITS) == (0,)
+
+
+def test_minimal_clue_sets() -> None:
+    cage = digits_mask([1, 4, 6, 8])
+    available = digits_mask([1, 2, 3, 4, 5, 6, 8])
+    minimal = minimal_clue_sets(cage, available)
+    assert minimal[0] == minimum_clues(cage, available)
+    for clues in minimal:
+        assert is_sufficient(cage, available, clues)
+        for other in minimal:
+            assert other == clues or other & clues != other
+        # removing any clue breaks uniqueness
+        for digit in range(9):
+            if clues & (1 << digit):
+                assert not is_sufficient(
+                    cage, available, clues & ~(1 << digit))
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from sudoku.config import read_config
+from sudoku.config import read_config, refresh_config, save_config
 
 
 def test_config_no_directory(mocker):
@@ -36,3 +36,32 @@ def test_config_save(mocker):
     # config = read_config()
 
     # assert config.default_blocks == 6
+
+
+def test_config_cached(mocker, tmp_path):
+    # pylint: disable=no-member)
+    path = Path(tmp_path, 'config.toml')
+    mocker.patch('sudoku.config.CONFIG_PATH', path)
+
+    config = read_config()
+    assert read_config() is config
+
+    config.update('default_blocks', 4)
+    config.save()
+    reloaded = read_config()
+    assert reloaded is not config
+    assert reloaded.default_blocks == 4
+    assert read_config() is reloaded
+
+    assert refresh_config() is not reloaded
+
+
+def test_save_config_refreshes(mocker, tmp_path):
+    # pylint: disable=no-member)
+    mocker.patch('sudoku.config.CONFIG_PATH', Path(tmp_path, 'config.toml'))
+
+    config = read_config()
+    config.update('default_blocks', 3)
+    saved = save_config(config)
+    assert saved.default_blocks == 3
+    assert read_config() is saved
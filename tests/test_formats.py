@@ -0,0 +1,148 @@
+import io
+import json
+
+import pytest
+
+from sudoku.cli import main
+from sudoku.formats import (
+    FORMATS, MAX_COMPACT_BLOCKS, ROW_MAJOR, from_compact, read_grids,
+    to_compact, to_jsonl, write_grids)
+from sudoku.grid import Grid
+from sudoku.library import PuzzleLibrary
+from sudoku.service import board_solution
+
+# A killer sudoku as other tools write it: row by row, with the cages
+# labelled in the order they are first met
+KILLER = (
+    'AABCCCDDDEEBFFCGHHIIJFFFGKKLLLMMMNNNLLLMMMOPPQQQRRROSSTTTUUUVVVWXXYYUZ'
+    'ZVWaabbcZZd:7,11,29,13,13,16,14,8,9,5,10,28,34,10,7,15,17,11,13,12,23,'
+    '22,6,15,12,15,12,4,6,8:.13.9..42..................3.4....7...24.1......'
+    '......8...245..........4.........')
+KILLER_SOLUTION = (
+    '613895742948217653725643819364589271582471396179362485831924567'
+    '296758134457136928')
+
+
+def _grids() -> list[Grid]:
+    return [Grid(block_qty, seed=seed)
+            for block_qty in (1, 3, 9) for seed in range(3)]
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_round_trip(fmt: str) -> None:
+    grids = _grids()
+    output = io.StringIO()
+    assert write_grids(iter(grids), output, fmt) == len(grids)
+
+    output.seek(0)
+    for grid, read in zip(grids, read_grids(output, fmt), strict=True):
+        expected = grid.to_dict()
+        if fmt == 'compact':
+            expected['seed'] = None
+        assert read.to_dict() == expected
+
+
+def test_compact_notation() -> None:
+    grid = Grid(2, seed=1)
+    text = to_compact(grid)
+    cage_map, totals, givens = text.split(':')
+    assert len(cage_map) == len(givens) == 18
+    assert len(totals.split(',')) == sum(
+        len(block.frames) for block in grid.blocks)
+    assert from_compact(text).cages() == grid.cages()
+
+
+def test_row_major_killer() -> None:
+    grid = from_compact(KILLER)
+    assert grid.linked
+    solution = [digit for _, digit in sorted(
+        zip(ROW_MAJOR, board_solution(grid)))]
+    assert ''.join(map(str, solution)) == KILLER_SOLUTION
+
+    # Written back row by row, with the same cages and givens
+    cage_map, totals, givens = to_compact(grid).split(':')
+    their_map, their_totals, their_givens = KILLER.split(':')
+    assert givens == their_givens
+    labels = dict(zip(cage_map, their_map))
+    assert len(labels) == len(set(labels.values())) == len(
+        totals.split(','))
+    assert ''.join(labels[label] for label in cage_map) == their_map
+    assert sorted(totals.split(',')) == sorted(their_totals.split(','))
+
+
+def test_bad_records_are_reported() -> None:
+    good = to_compact(Grid(1, seed=1))
+    lines = [
+        good,
+        'AAAA:10',                      # not a whole block
+        good.replace('A', '?', 1),      # unknown cage
+        good.split(':')[0] + ':1,1,1,1,1:',  # impossible totals
+        good,
+    ]
+    errors = []
+    grids = list(read_grids(
+        lines, 'compact', lambda *error: errors.append(error)))
+    assert len(grids) == 2
+    assert [line for line, _, _ in errors] == [2, 3, 4]
+
+    errors = []
+    grid = Grid(1, seed=2).to_dict()
+    grid['blocks'][0]['frames'][0]['cells'][0] = 10
+    lines = ['{"blocks": 1}', '{', str(grid).replace("'", '"')]
+    assert not list(read_grids(
+        lines, 'jsonl', lambda *error: errors.append(error)))
+    assert len(errors) == 3
+
+
+def test_linked_lines_are_checked() -> None:
+    grid = Grid(9, seed=1)
+    data = grid.to_dict()
+    # Two digits swapped within a cage keep its total and its block
+    frame = next(
+        frame for block in data['blocks'] for frame in block['frames']
+        if frame['suggestions'].count(0) >= 2)
+    first, second = [
+        index for index, clue in enumerate(frame['suggestions'])
+        if not clue][:2]
+    cells = frame['cells']
+    cells[first], cells[second] = cells[second], cells[first]
+    lines = [to_jsonl(grid), json.dumps(data)]
+    errors = []
+    grids = list(read_grids(
+        lines, 'jsonl', lambda *error: errors.append(error)))
+    assert len(grids) == 1
+    assert errors[0][0] == 2 and 'repeats' in errors[0][2]
+
+
+def test_compact_limit() -> None:
+    errors = []
+    grids = [Grid(1, seed=1), Grid(MAX_COMPACT_BLOCKS + 8, seed=1)]
+    output = io.StringIO()
+    written = write_grids(
+        grids, output, 'compact', lambda *error: errors.append(error))
+    assert written == 1 and len(output.getvalue().splitlines()) == 1
+    assert errors[0][0] == 2
+
+    status = main(['generate', '--blocks', str(MAX_COMPACT_BLOCKS + 1),
+                   '--format', 'compact', '--jobs', '1'])
+    assert status == 2
+
+
+def test_convert(tmp_path, capsys) -> None:
+    source = tmp_path / 'puzzles.jsonl'
+    with open(source, 'w', encoding='utf8') as f_out:
+        write_grids(_grids(), f_out, 'jsonl')
+        f_out.write('not json\n')
+
+    csv_path = tmp_path / 'puzzles.csv'
+    assert main(['convert', str(source), str(csv_path)]) == 1
+    assert '*** Line 10' in capsys.readouterr().err
+
+    library = tmp_path / 'library.sqlite'
+    assert main(['convert', str(csv_path), str(library)]) == 0
+    with PuzzleLibrary(library) as puzzles:
+        assert puzzles.count() == len(_grids())
+
+    text = tmp_path / 'puzzles.txt'
+    assert main(['convert', str(library), str(text)]) == 0
+    assert len(text.read_text().splitlines()) == len(_grids())
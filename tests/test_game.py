@@ -0,0 +1,94 @@
+import gc
+import tkinter as tk
+import tracemalloc
+import weakref
+
+import pytest
+
+from sudoku.game import Game
+from sudoku.grid import Grid
+from sudoku.renderer import GridRenderer
+from tests.fakes import FakeCanvas
+
+GAMES = 1000
+# A game of four blocks is about 10 KiB, so keeping one in forty alive
+# would fail this
+GROWTH_LIMIT = 256 * 1024
+
+
+@pytest.fixture(params=['fake', 'tk'])
+def canvas(request):
+    if request.param == 'fake':
+        yield FakeCanvas()
+        return
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip('no display')
+    yield tk.Canvas(root, width=300, height=300)
+    root.destroy()
+
+
+def test_moves_are_checked() -> None:
+    grid = Grid(1, seed=3)
+    game = Game(grid, GridRenderer(FakeCanvas()))
+    empty = [cell for cell in game.cells if not cell.suggestion]
+    assert game.correct and not game.complete
+
+    digits = dict(zip(
+        (cell.index for cell in game.cells),
+        (digit for block in grid.blocks for frame in block.frames
+         for digit in frame.digits)))
+    for cell in empty:
+        game.set_solution(cell, digits[cell.index])
+    assert game.complete
+
+    values = [0] * 9
+    for cell in empty:
+        values[cell.index] = cell.solution
+    restored = Game(grid, GridRenderer(FakeCanvas()), values)
+    assert [cell.solution for cell in restored.cells] == [
+        cell.solution for cell in game.cells]
+
+
+def test_close_releases_the_game() -> None:
+    renderer = GridRenderer(FakeCanvas())
+    grid = Grid(4, seed=1)
+    grid_ref = weakref.ref(grid)
+    game = Game(grid, renderer)
+    game.select(game.cells[0])
+    del grid
+
+    gc.disable()
+    try:
+        game.close()
+        assert grid_ref() is None
+        assert not renderer.cells and renderer.selected is None
+    finally:
+        gc.enable()
+
+
+def test_new_games_do_not_grow(canvas) -> None:
+    renderer = GridRenderer(canvas)
+    game = None
+
+    def new_game(seed: int) -> None:
+        nonlocal game
+        if game is not None:
+            game.close()
+        game = Game(Grid(4, seed=seed), renderer)
+        game.select(game.cells[-1])
+
+    for seed in range(50):
+        new_game(seed)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        for seed in range(GAMES):
+            new_game(seed)
+        gc.collect()
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert end - start < GROWTH_LIMIT
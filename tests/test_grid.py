@@ -1,4 +1,4 @@
-from sudoku.grid import Grid
+from sudoku.grid import Grid, Frame
 from sudoku.config import read_config
 
 config = read_config()
@@ -7,4 +7,31 @@ config = read_config()
 def test_defaults() -> None:
     # pylint: disable=no-member)
     grid = Grid()
-    assert grid.blocks == config.default_blocks
+    assert len(grid.blocks) == config.default_blocks
+
+
+def test_frame() -> None:
+    frame = Frame((9, 2, 5), 1)
+    assert frame.cells == (2, 5, 9)
+    assert frame.total == 16
+    assert frame.mask == 0b100010010
+    assert frame.id == 1
+    assert not hasattr(frame, '__dict__')
+
+
+def test_block_frames() -> None:
+    grid = Grid(block_qty=2)
+    for block in grid.blocks:
+        assert isinstance(block.frames, tuple)
+        assert sorted(
+            cell for frame in block for cell in frame.cells
+            ) == list(range(1, 10))
+        for frame in block:
+            assert len(frame.suggestions) == len(frame.cells)
+
+
+def test_injected_config(mocker) -> None:
+    read = mocker.patch('sudoku.config.read_config')
+    grid = Grid(config=config)
+    assert len(grid.blocks) == config.default_blocks
+    read.assert_not_called()
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+# Cold import budgets in milliseconds
+MODEL_BUDGET = 200
+APP_BUDGET = 800
+
+
+def _import(module: str, check: str = '') -> int:
+    """Import module in a fresh interpreter and return its cumulative
+    import time in milliseconds."""
+    code = f'import {module}\n{check}'
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, env=env, check=False)
+    assert result.returncode == 0, result.stderr
+
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) // 1000
+    raise AssertionError(f'{module} not found in -X importtime output')
+
+
+def test_model_import() -> None:
+    check = (
+        'import sys\n'
+        'gui = [name for name in sys.modules\n'
+        '       if name.startswith(("tkinter", "psiutils", "psiconfig"))]\n'
+        'assert not gui, gui\n'
+    )
+    assert _import('sudoku.grid', check) < MODEL_BUDGET
+
+
+def test_app_import() -> None:
+    check = (
+        'import sys\n'
+        'lazy = [name for name in ("icecream", "webbrowser",\n'
+        '                          "sudoku.forms.frm_config")\n'
+        '        if name in sys.modules]\n'
+        'assert not lazy, lazy\n'
+    )
+    assert _import('sudoku.main', check) < APP_BUDGET
@@ -0,0 +1,39 @@
+import json
+
+from sudoku.cages import cage_masks
+from sudoku.clues import minimal_clue_sets, minimum_clues
+from sudoku.grid import Grid, disable_stats, enable_stats, generation_stats
+
+
+def test_disabled_by_default() -> None:
+    assert generation_stats() is None
+    Grid(1, seed=1)
+    assert generation_stats() is None
+
+
+def test_collects_counters_and_timings() -> None:
+    for cache in (cage_masks, minimal_clue_sets, minimum_clues):
+        cache.cache_clear()
+    stats = enable_stats()
+    try:
+        Grid(4, seed=2)
+        # Blocks come from the catalogue; linked grids still search clues
+        Grid(9, seed=2)
+    finally:
+        assert disable_stats() is stats
+
+    counters = stats.as_dict()['counters']
+    assert counters['grids'] == 2
+    assert counters['blocks'] == 13
+    assert counters['frames'] >= 8 + 18
+    assert counters['combinations'] > 0
+    assert counters['uniqueness_checks'] > 0
+    assert counters['clue_subsets'] >= counters['uniqueness_checks']
+    assert all(value >= 0 for value in stats.timings.values())
+    assert stats.timings['block_layout'] > 0
+
+    data = json.loads(stats.to_json())
+    assert data['counters'] == counters
+
+    stats.reset()
+    assert not any(stats.counters.values())
@@ -0,0 +1,94 @@
+import json
+
+from sudoku.grid import Grid
+from sudoku.journal import GameJournal
+
+
+def test_restore(tmp_path) -> None:
+    grid = Grid(2, seed=4)
+    journal = GameJournal(tmp_path)
+    journal.start(grid)
+    journal.record(3, 7)
+    journal.record(12, 1)
+    journal.record(3, 0)
+    journal.record(5, 2)
+    # No close: as if the process had died
+
+    restored = GameJournal(tmp_path).restore()
+    assert restored is not None
+    restored_grid, values = restored
+    assert restored_grid.to_dict() == grid.to_dict()
+    assert values[3] == 0 and values[5] == 2 and values[12] == 1
+    assert len(values) == 18
+
+
+def test_compaction(tmp_path) -> None:
+    journal = GameJournal(tmp_path, compact_every=3)
+    journal.start(Grid(1, seed=1))
+    for cell in range(8):
+        journal.record(cell, cell + 1)
+    journal.close()
+    assert len(list(tmp_path.glob('moves-*.log'))) == 1
+
+    _, values = GameJournal(tmp_path).restore()
+    assert values == [1, 2, 3, 4, 5, 6, 7, 8, 0]
+
+
+def test_torn_write(tmp_path) -> None:
+    journal = GameJournal(tmp_path)
+    journal.start(Grid(1, seed=1))
+    journal.record(0, 4)
+    journal.close()
+    log = next(tmp_path.glob('moves-*.log'))
+    with open(log, 'a', encoding='utf8') as f_log:
+        f_log.write('1 ')
+
+    _, values = GameJournal(tmp_path).restore()
+    assert values[:2] == [4, 0]
+
+
+def test_clear(tmp_path) -> None:
+    journal = GameJournal(tmp_path)
+    assert journal.restore() is None
+    journal.start(Grid(1, seed=1))
+    journal.record(0, 4)
+    journal.clear()
+    journal.record(1, 4)
+    assert GameJournal(tmp_path).restore() is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_corrupt_snapshot(tmp_path) -> None:
+    journal = GameJournal(tmp_path)
+    journal.start(Grid(1, seed=1))
+    journal.close()
+    snapshot = journal.snapshot_path.read_text()
+    data = json.loads(snapshot)
+    broken_grid = json.loads(snapshot)
+    broken_grid['grid']['blocks'][0]['frames'][0]['cells'][0] = 10
+    for content in ({'grid': data['grid']}, dict(data, values=[0] * 3),
+                    dict(data, values=['x'] * 9), dict(data, grid=[]),
+                    broken_grid, []):
+        journal.snapshot_path.write_text(json.dumps(content))
+        assert GameJournal(tmp_path).restore() is None
+
+    # A new game replaces the bad snapshot
+    journal = GameJournal(tmp_path)
+    journal.start(Grid(1, seed=2))
+    journal.close()
+    assert GameJournal(tmp_path).restore()[0].seed == 2
+
+
+def test_bad_log_line(tmp_path) -> None:
+    for line in ('5\n', 'one 4\n', '9 4\n', '-1 4\n', '1 12\n', '1 2 3\n'):
+        journal = GameJournal(tmp_path)
+        journal.start(Grid(1, seed=1))
+        journal.record(0, 4)
+        journal.close()
+        log = next(tmp_path.glob('moves-*.log'))
+        with open(log, 'a', encoding='utf8') as f_log:
+            f_log.write(line)
+            f_log.write('2 6\n')
+
+        _, values = GameJournal(tmp_path).restore()
+        assert values == [4] + [0] * 8
@@ -0,0 +1,56 @@
+import random
+import time
+
+from sudoku import killer
+from sudoku.grid import Grid, cage_positions
+
+
+def _units(solution: tuple[int, ...]) -> list[list[int]]:
+    units = []
+    for index in range(9):
+        for unit_of in (killer.ROW_OF, killer.COL_OF, killer.BOX_OF):
+            units.append([solution[cell] for cell in range(killer.SIZE)
+                          if unit_of[cell] == index])
+    return units
+
+
+def test_fill() -> None:
+    solution = killer.fill(random.Random(1))
+    assert solution == killer.fill(random.Random(1))
+    for unit in _units(solution):
+        assert sorted(unit) == list(range(1, 10))
+
+
+def test_cage_positions() -> None:
+    assert cage_positions((3, 3, 3)) == ((0, 1, 2), (5, 4, 3), (6, 7, 8))
+    assert cage_positions((6, 3)) == ((0, 1, 2, 3, 4, 5), (8, 7, 6))
+    assert cage_positions((2, 2, 2, 2, 1)) == (
+        (0, 1), (2, 5), (4, 3), (6, 7), (8,))
+
+
+def test_linked_grid() -> None:
+    grid = Grid(9, seed=3)
+    (solution,) = killer.solutions(grid.cages(), grid.givens(), 2)
+    frames = [frame for block in grid.blocks for frame in block.frames]
+    for (cells, total), frame in zip(grid.cages(), frames):
+        assert tuple(solution[cell] for cell in cells) == frame.digits
+        assert total == frame.total
+    assert Grid.from_dict(grid.to_dict()).givens() == grid.givens()
+
+
+def test_unique_givens() -> None:
+    rng = random.Random(5)
+    solution = killer.fill(rng)
+    # Cages of single cells give their digit away; pairs do not
+    cages = tuple(((cell, cell + 1), solution[cell] + solution[cell + 1])
+                  for cell in range(0, 80, 2))
+    givens = killer.unique_givens(cages, solution, [0] * killer.SIZE, rng)
+    assert killer.solutions(cages, givens) == [solution]
+    assert all(given in (0, digit) for given, digit in zip(givens, solution))
+
+
+def test_linked_speed() -> None:
+    start = time.perf_counter()
+    for seed in range(20):
+        Grid(9, seed=seed)
+    assert (time.perf_counter() - start) / 20 < 0.05
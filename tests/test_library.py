@@ -0,0 +1,108 @@
+import json
+
+from sudoku.cli import main
+from sudoku.grid import Grid
+from sudoku.library import PuzzleLibrary, cage_signature, clue_count
+
+
+def _library(tmp_path) -> PuzzleLibrary:
+    library = PuzzleLibrary(tmp_path / 'library.sqlite')
+    library.add_many(
+        ((Grid(1, seed=seed), seed / 10) for seed in range(10)),
+        batch_size=3)
+    return library
+
+
+def test_add_and_get(tmp_path) -> None:
+    with _library(tmp_path) as library:
+        assert len(library) == 10
+        grid = Grid(2, seed=99)
+        puzzle_id = library.add(grid)
+        assert library.get(puzzle_id).to_dict() == grid.to_dict()
+        assert library.get(puzzle_id + 1) is None
+        assert library.count(block_qty=2) == 1
+
+
+def test_next_unseen(tmp_path) -> None:
+    with _library(tmp_path) as library:
+        assert library.count(min_difficulty=0.3, max_difficulty=0.5) == 3
+        first = library.next_unseen(1, 0.3, 0.5)
+        second = library.next_unseen(1, 0.3, 0.5)
+        assert first[1].seed == 3 and second[1].seed == 4
+        assert library.next_unseen(1, 0.3, 0.5, mark=False)[1].seed == 5
+        assert library.count(unseen=True) == 8
+
+        library.next_unseen(1, 0.3, 0.5)
+        assert library.next_unseen(1, 0.3, 0.5) is None
+        library.mark_seen(first[0], False)
+        assert library.next_unseen(1, 0.3, 0.5)[0] == first[0]
+
+
+def test_next_unseen_puts_unrated_last(tmp_path) -> None:
+    with PuzzleLibrary(tmp_path / 'library.sqlite') as library:
+        library.add_many([
+            (Grid(1, seed=0), None), (Grid(1, seed=1), 0.7),
+            (Grid(1, seed=2), None), (Grid(1, seed=3), 0.2)])
+        seeds = []
+        while puzzle := library.next_unseen():
+            seeds.append(puzzle[1].seed)
+        assert seeds == [3, 1, 0, 2]
+
+
+def test_next_unseen_uses_an_index(tmp_path) -> None:
+    with _library(tmp_path) as library:
+        for filters in ((None, None, None), (1, None, None), (1, 0.3, 0.5),
+                        (None, 0.2, None)):
+            clauses, params = library._where(*filters, unseen=True)
+            choose, params = library._choose_unseen(
+                clauses, params, rated_only=filters[1] is not None)
+            plan = library.connection.execute(
+                f'EXPLAIN QUERY PLAN SELECT id FROM puzzles '
+                f'WHERE id = {choose}', params).fetchall()
+            assert not any('TEMP B-TREE' in row[3] for row in plan), plan
+
+
+def test_page(tmp_path) -> None:
+    with _library(tmp_path) as library:
+        seeds, after_id = [], 0
+        while page := library.page(limit=4, after_id=after_id):
+            seeds.extend(grid.seed for _, grid in page)
+            after_id = page[-1][0]
+        assert seeds == list(range(10))
+
+
+def test_signature() -> None:
+    grid = Grid(1, seed=1)
+    other = Grid.from_dict(grid.to_dict())
+    for frame in other.blocks[0].frames:
+        frame.suggestions = (0,) * len(frame.digits)
+    assert cage_signature(other) == cage_signature(grid)
+    assert clue_count(other) == 0
+    assert cage_signature(Grid(1, seed=2)) != cage_signature(grid)
+
+
+def test_import_json(tmp_path) -> None:
+    path = tmp_path / 'data.json'
+    grids = [Grid(1, seed=seed).to_dict() for seed in range(3)]
+    path.write_text(json.dumps({'puzzles': grids, 'other': 1}))
+    with PuzzleLibrary(tmp_path / 'library.sqlite') as library:
+        assert library.import_json(path) == 3
+        assert library.import_json(tmp_path / 'missing.json') == 0
+        assert [grid.to_dict() for _, grid in library.page()] == grids
+
+    # Bad items are skipped one at a time
+    broken = [dict(grids[0], blocks=[{'frames': [{'cells': [10]}]}]),
+              dict(grids[1], blocks=[{}]), grids[2]]
+    path.write_text(json.dumps(broken))
+    with PuzzleLibrary(tmp_path / 'other.sqlite') as library:
+        assert library.import_json(path) == 1
+        assert library.page()[0][1].to_dict() == grids[2]
+
+
+def test_cli_library(tmp_path) -> None:
+    path = tmp_path / 'library.sqlite'
+    status = main(['generate', '--count', '5', '--blocks', '1', '--seed',
+                   '2', '--jobs', '1', '--library', str(path)])
+    assert status == 0
+    with PuzzleLibrary(path) as library:
+        assert library.count(block_qty=1) == 5
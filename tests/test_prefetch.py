@@ -0,0 +1,36 @@
+import time
+
+from sudoku.grid import Grid
+from sudoku.prefetch import PuzzlePrefetcher
+
+
+def _wait_for(prefetcher: PuzzlePrefetcher, ready: int) -> None:
+    deadline = time.monotonic() + 5
+    while prefetcher.ready < ready and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_fills_to_depth_and_refills() -> None:
+    prefetcher = PuzzlePrefetcher(2, lambda: Grid(1)).start()
+    try:
+        _wait_for(prefetcher, 2)
+        assert prefetcher.ready == 2
+
+        grid = prefetcher.get_nowait()
+        assert isinstance(grid, Grid)
+        _wait_for(prefetcher, 2)
+        assert prefetcher.ready == 2
+    finally:
+        prefetcher.stop()
+    assert prefetcher.ready <= 2
+
+
+def test_get_nowait_when_empty() -> None:
+    prefetcher = PuzzlePrefetcher(1, lambda: Grid(1))
+    assert prefetcher.get_nowait() is None
+
+    prefetcher.start()
+    _wait_for(prefetcher, 1)
+    prefetcher.stop()
+    prefetcher.drain()
+    assert prefetcher.get_nowait() is None
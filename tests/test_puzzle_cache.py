@@ -0,0 +1,26 @@
+from sudoku.grid import Grid
+from sudoku.puzzle_cache import PuzzleCache, cache_key
+
+
+def test_get_or_create(tmp_path) -> None:
+    cache = PuzzleCache(tmp_path)
+    first = cache.get_or_create(17, 2)
+    second = cache.get_or_create(17, 2)
+    assert cache.misses == 1
+    assert cache.hits == 1
+    assert second.to_dict() == first.to_dict()
+    assert first.to_dict() == Grid(2, seed=17).to_dict()
+
+
+def test_key() -> None:
+    assert cache_key(1, 1) == cache_key(1, 1)
+    assert cache_key(1, 1) != cache_key(1, 2)
+    assert cache_key(1, 1) != cache_key(2, 1)
+
+
+def test_eviction(tmp_path) -> None:
+    cache = PuzzleCache(tmp_path, max_bytes=2000)
+    for seed in range(20):
+        cache.get_or_create(seed, 1)
+    assert 0 < cache.size <= 2000
+    assert cache.size == PuzzleCache(tmp_path).size
@@ -0,0 +1,86 @@
+from sudoku import killer
+from sudoku.cli import main
+from sudoku.grid import Block, Frame, Grid
+from sudoku.library import PuzzleLibrary
+from sudoku.rating import Rating, rate, rate_many
+
+
+def _bare(grid: Grid) -> Grid:
+    """Remove every clue the linked grid can do without."""
+    frames = [frame for block in grid.blocks for frame in block.frames]
+    cages = grid.cages()
+    for frame in frames:
+        for index, clue in enumerate(frame.suggestions):
+            if not clue:
+                continue
+            kept = frame.suggestions
+            frame.suggestions = kept[:index] + (0,) + kept[index + 1:]
+            if len(killer.solutions(cages, grid.givens())) != 1:
+                frame.suggestions = kept
+    return grid
+
+
+def test_generated_grids() -> None:
+    for block_qty in (1, 3, 9):
+        for seed in range(5):
+            rating = rate(Grid(block_qty, seed=seed))
+            assert rating.solved
+            assert rating.steps > 0
+
+
+def test_generated_tiers() -> None:
+    for block_qty in (1, 4, 9):
+        tiers = {rate(Grid(block_qty, seed=seed)).tier
+                 for seed in range(20)}
+        assert len(tiers) > 1 and 'fiendish' not in tiers
+
+
+def test_block_techniques() -> None:
+    # No clues: {1,2} and {8,9} are the only pairs for 3 and 17
+    block = Block([Frame((1, 2), 0), Frame((8, 9), 1),
+                   Frame((3, 4, 5, 6, 7), 2)])
+    rating = rate(Grid.from_blocks((block,)))
+    assert rating.solved
+    assert rating.counts['unique_combination'] == 2
+    assert rating.counts['naked_single'] == 1
+
+    block = Block([Frame((1, 9), 0), Frame((2, 8), 1),
+                   Frame((3, 4, 5, 6, 7), 2)])
+    rating = rate(Grid.from_blocks((block,)))
+    assert not rating.solved
+    assert rating.tier == 'fiendish'
+
+
+def test_harder_linked_grids() -> None:
+    ratings = [rate(_bare(Grid(9, seed=seed))) for seed in range(5)]
+    assert any(rating.hardest in ('cage_sum', 'innies_outies')
+               for rating in ratings)
+    assert max(rating.score for rating in ratings) > min(
+        rating.score for rating in ratings)
+
+
+def test_rating_order() -> None:
+    easy, hard = Rating(), Rating()
+    easy.use('naked_single')
+    hard.use('cage_sum')
+    assert hard.score > easy.score
+    assert easy.to_dict()['tier'] == 'easy'
+    assert hard.to_dict()['hardest'] == 'cage_sum'
+
+
+def test_rate_many() -> None:
+    grids = [Grid(2, seed=seed) for seed in range(20)]
+    serial = [rating.score for rating in rate_many(grids, workers=1)]
+    pooled = [rating.score for rating in rate_many(
+        grids, workers=2, chunk_size=3)]
+    assert serial == pooled == [rate(grid).score for grid in grids]
+
+
+def test_cli_rate(tmp_path) -> None:
+    path = tmp_path / 'library.sqlite'
+    main(['generate', '--count', '6', '--blocks', '1', '--seed', '3',
+          '--jobs', '1', '--library', str(path)])
+    assert main(['rate', str(path), '--jobs', '1']) == 0
+    with PuzzleLibrary(path) as library:
+        assert library.count(max_difficulty=2999) == 6
+        assert not library.page(unrated=True)
@@ -0,0 +1,47 @@
+from sudoku.grid import Grid
+from sudoku.renderer import Cell, GridRenderer, COLOURS, MARGIN, BLOCK_GAP
+from tests.fakes import FakeCanvas
+
+
+def _renderer(block_qty: int = 1) -> tuple[GridRenderer, list[Cell]]:
+    grid = Grid(block_qty, seed=1)
+    cells = []
+    for block_index, block in enumerate(grid.blocks):
+        index = block_index * 9
+        for frame in block.frames:
+            for suggestion in frame.suggestions:
+                cells.append(Cell(index, frame, suggestion, COLOURS[0]))
+                index += 1
+    renderer = GridRenderer(FakeCanvas())
+    renderer.draw(cells, block_qty)
+    return renderer, cells
+
+
+def test_cell_at() -> None:
+    renderer, cells = _renderer(2)
+    size = renderer.size
+    assert renderer.cell_at(MARGIN + 1, MARGIN + 1) is cells[0]
+    assert renderer.cell_at(MARGIN + 2 * size + 1, MARGIN + size + 1) \
+        is cells[5]
+
+    second_block = MARGIN + 3 * size + BLOCK_GAP + 1
+    assert renderer.cell_at(second_block, MARGIN + 1) is cells[9]
+    assert renderer.cell_at(second_block - BLOCK_GAP, MARGIN + 1) is None
+    assert renderer.cell_at(0, 0) is None
+    assert renderer.cell_at(MARGIN + 1, MARGIN + 4 * size) is None
+
+
+def test_select_and_solution() -> None:
+    renderer, cells = _renderer()
+    canvas = renderer.canvas
+    renderer.select(cells[0])
+    assert canvas.items[cells[0].rect]['fill'] == cells[0].selected
+    renderer.select(cells[1])
+    assert canvas.items[cells[0].rect]['fill'] == cells[0].background
+    assert canvas.items[cells[1].rect]['fill'] == cells[1].selected
+
+    renderer.set_solution(cells[1], 7)
+    assert cells[1].solution == 7
+    assert canvas.items[cells[1].text]['text'] == 7
+    renderer.set_solution(cells[1], 0)
+    assert canvas.items[cells[1].text]['text'] == ''
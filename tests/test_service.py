@@ -0,0 +1,139 @@
+import asyncio
+import json
+
+from sudoku.grid import Grid
+from sudoku.service import PuzzleService, board_solution, check, hint
+
+
+async def _request(
+        port: int, method: str, path: str,
+        body: dict | None = None) -> tuple[int, dict]:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    content = json.dumps(body).encode() if body is not None else b''
+    writer.write(
+        f'{method} {path} HTTP/1.1\r\nHost: test\r\n'
+        f'Content-Length: {len(content)}\r\nConnection: close\r\n\r\n'
+        .encode() + content)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(payload)
+
+
+def _run(test, **kwargs) -> None:
+    async def main() -> None:
+        async with PuzzleService(
+                workers=1, buffer_size=2, **kwargs) as service:
+            await service.start(port=0)
+            await test(service)
+    asyncio.run(main())
+
+
+def test_solution_check_and_hint() -> None:
+    for grid in (Grid(3, seed=6), Grid(9, seed=6)):
+        solution = board_solution(grid)
+        result = check(grid, solution)
+        assert result['correct'] and result['complete']
+        assert hint(grid, solution) is None
+
+        values = list(solution)
+        values[next(cell for cell in range(len(values))
+                    if grid.givens()[cell] == 0)] = 0
+        assert not check(grid, values)['complete']
+        step = hint(grid, values)
+        values[step['cell']] = step['digit']
+        assert check(grid, values) == result
+
+    # A cell that repeats its frame's clue is wrong, not solved
+    grid = Grid(1, seed=0)
+    solution = board_solution(grid)
+    cells, frame = next(
+        (cells, frame) for (cells, _), frame in zip(
+            grid.cages(), grid.blocks[0].frames)
+        if any(frame.suggestions) and not all(frame.suggestions))
+    clue = next(clue for clue in frame.suggestions if clue)
+    cell = next(cell for cell, clue in zip(cells, frame.suggestions)
+                if not clue)
+    values = list(solution)
+    values[cell] = clue
+    assert not check(grid, values)['correct']
+    assert hint(grid, values) == {'cell': cell, 'digit': solution[cell]}
+
+
+def test_endpoints() -> None:
+    async def test(service: PuzzleService) -> None:
+        port = service.port
+        status, data = await _request(port, 'GET', '/generate?blocks=2')
+        assert status == 200
+        grid = Grid.from_dict(data['grid'])
+        assert grid.block_qty == 2
+
+        status, data = await _request(port, 'POST', '/solve', data)
+        assert status == 200
+        solution = data['solution']
+        body = {'grid': grid.to_dict(), 'values': solution}
+        status, data = await _request(port, 'POST', '/check', body)
+        assert data == {'correct': True, 'complete': True, 'conflicts': 0}
+
+        body['values'] = [0] * 18
+        status, data = await _request(port, 'POST', '/hint', body)
+        assert status == 200
+        assert data['hint']['digit'] in range(1, 10)
+
+        status, data = await _request(port, 'GET', '/stats')
+        assert data['requests'] == 4
+        assert data['endpoints']['generate']['requests'] == 1
+        assert data['buffers']['1'] >= 0
+    _run(test)
+
+
+def test_bad_requests() -> None:
+    async def test(service: PuzzleService) -> None:
+        port = service.port
+        assert (await _request(port, 'GET', '/nowhere'))[0] == 404
+        assert (await _request(port, 'GET', '/check'))[0] == 405
+        assert (await _request(port, 'GET', '/generate?blocks=99'))[0] == 400
+        status, data = await _request(port, 'POST', '/check', {'grid': 1})
+        assert status == 400 and 'error' in data
+        body = {'grid': Grid(1, seed=1).to_dict(), 'values': [0] * 3}
+        assert (await _request(port, 'POST', '/check', body))[0] == 400
+
+        # Parseable but malformed grids
+        for change in ('digit', 'cell'):
+            grid = Grid(1, seed=1).to_dict()
+            frame = grid['blocks'][0]['frames'][0]
+            if change == 'digit':
+                frame['cells'][0] = 10
+            else:
+                frame['cells'].append(frame['cells'][0])
+                frame['suggestions'].append(0)
+            for endpoint in ('/check', '/hint', '/solve'):
+                status, data = await _request(
+                    port, 'POST', endpoint, {'grid': grid})
+                assert status == 400 and 'error' in data
+    _run(test)
+
+
+def test_busy_requests_are_rejected() -> None:
+    async def test(service: PuzzleService) -> None:
+        async with service._slots:
+            status, _ = await _request(service.port, 'GET', '/stats')
+        assert status == 503
+        assert service.stats.rejected == 1
+        status, _ = await _request(service.port, 'GET', '/stats')
+        assert status == 200
+    _run(test, max_concurrency=1, max_waiting=0)
+
+
+def test_unexpected_errors_are_answered(monkeypatch) -> None:
+    def broken(*args) -> dict:
+        raise RuntimeError('broken')
+    monkeypatch.setattr('sudoku.service.check', broken)
+
+    async def test(service: PuzzleService) -> None:
+        body = {'grid': Grid(1, seed=1).to_dict()}
+        status, data = await _request(service.port, 'POST', '/check', body)
+        assert status == 500 and 'error' in data
+        assert service.stats.errors['check'] == 1
+    _run(test)
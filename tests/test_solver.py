@@ -0,0 +1,57 @@
+import time
+
+from sudoku.grid import Block, Frame, Grid
+from sudoku.solver import count_solutions, is_unique, solve
+
+
+def test_generated_grids_are_unique() -> None:
+    for seed in range(50):
+        grid = Grid(3, seed=seed)
+        assert count_solutions(grid) == 1
+        solution = solve(grid)
+        for block, masks in zip(grid.blocks, solution):
+            assert masks == tuple(frame.mask for frame in block.frames)
+
+
+def test_ambiguous_block() -> None:
+    block = Block([Frame((1, 9), 0), Frame((2, 8), 1),
+                   Frame((3, 4, 5, 6, 7), 2)])
+    assert count_solutions(block, limit=20) == 12
+    assert count_solutions(block) == 2
+    assert not is_unique(block)
+
+    block.frames[0].suggestions = (1, 0)
+    assert count_solutions(block, limit=20) == 3
+    block.frames[1].suggestions = (0, 8)
+    assert is_unique(block)
+
+
+def test_impossible_block() -> None:
+    block = Block([Frame((1, 2), 0), Frame((3, 4, 5, 6, 7, 8, 9), 1)])
+    block.frames[0].suggestions = (9, 0)
+    assert count_solutions(block) == 0
+    assert solve(block) is None
+
+
+def test_speed() -> None:
+    grid = Grid(9, seed=1)
+    start = time.perf_counter()
+    for _ in range(10):
+        count_solutions(grid)
+    assert (time.perf_counter() - start) / 90 < 0.001
+
+
+def test_linked_grids_are_unique() -> None:
+    for seed in range(10):
+        grid = Grid(9, seed=seed)
+        assert grid.linked
+        assert count_solutions(grid) == 1
+        solution = solve(grid)
+        for block, masks in zip(grid.blocks, solution):
+            assert masks == tuple(frame.mask for frame in block.frames)
+
+    # The same digit twice in a frame
+    frame = grid.blocks[0].frames[0]
+    frame.suggestions = (frame.digits[0],) * 2 + frame.suggestions[2:]
+    assert count_solutions(grid) == 0
+    assert solve(grid) is None
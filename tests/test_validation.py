@@ -0,0 +1,45 @@
+from sudoku.cages import digits_mask
+from sudoku.validation import Validation
+
+
+def _validation() -> Validation:
+    # Two cages: cells 0-1 hold {1, 2}, cells 2-4 hold {3, 4, 5}
+    validation = Validation(5)
+    validation.add_unit([0, 1], digits_mask([1, 2]))
+    validation.add_unit([2, 3, 4], digits_mask([3, 4, 5]))
+    return validation
+
+
+def test_complete() -> None:
+    validation = _validation()
+    assert validation.correct and not validation.complete
+    for cell, digit in enumerate([2, 1, 5, 3, 4]):
+        validation.set(cell, digit)
+    assert validation.correct and validation.complete
+    assert validation.unit_mask(0) == digits_mask([1, 2])
+
+    validation.set(4, 0)
+    assert validation.correct and not validation.complete
+    assert validation.unit_mask(1) == digits_mask([3, 5])
+
+
+def test_conflicts() -> None:
+    validation = _validation()
+    validation.set(0, 1)
+    validation.set(1, 1)
+    assert validation.conflicts == 1
+    validation.set(2, 9)
+    assert validation.conflicts == 2
+    validation.set(1, 2)
+    validation.set(2, 3)
+    assert validation.correct
+
+
+def test_linked_units() -> None:
+    validation = Validation(2)
+    validation.set(0, 4)
+    validation.set(1, 4)
+    validation.add_unit([0])
+    assert validation.correct
+    validation.add_unit([0, 1])
+    assert not validation.correct
@@ -0,0 +1,44 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+# pylint: disable=wrong-import-position
+from sudoku.archive import decode_block, encode_block  # noqa: E402
+from sudoku.cages import ALL_DIGITS  # noqa: E402
+from sudoku.clues import minimum_clues  # noqa: E402
+from sudoku.solver import is_unique  # noqa: E402
+from sudoku.vectorised import (  # noqa: E402
+    generate_blocks, minimum_clues as array_minimum_clues)
+
+
+def test_minimum_clues() -> None:
+    rng = np.random.default_rng(3)
+    masks = rng.integers(1, ALL_DIGITS + 1, 2000)
+    masks = masks[np.array([bin(mask).count('1') <= 6 for mask in masks])]
+    available = rng.integers(0, ALL_DIGITS + 1, len(masks)) | masks
+    expected = [minimum_clues(int(mask), int(digits))
+                for mask, digits in zip(masks, available)]
+    assert array_minimum_clues(masks, available).tolist() == expected
+
+
+def test_generate_blocks() -> None:
+    blocks = generate_blocks(500, seed=1)
+    assert len(blocks) == 500
+    assert (generate_blocks(500, seed=1).data == blocks.data).all()
+
+    for row, block in zip(blocks.data, blocks):
+        assert sorted(digit for frame in block for digit in frame.digits) \
+            == list(range(1, 10))
+        assert [frame.total for frame in block] == \
+            row['totals'][:len(block)].tolist()
+        assert sum(1 for frame in block for clue in frame.suggestions
+                   if clue) == row['clue_count']
+        # Clues are in place, as the archive stores them
+        assert decode_block(encode_block(block)).frames[0].digits == \
+            block.frames[0].digits
+
+
+def test_grids_are_unique() -> None:
+    grids = list(generate_blocks(300, seed=2).grids(3))
+    assert len(grids) == 100
+    assert all(is_unique(grid) for grid in grids)